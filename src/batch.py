@@ -0,0 +1,221 @@
+# Generates Shorts and posts for many accounts without the menu, and reports every item as a JSON line.
+#
+# Exit codes:
+#   0 - every item succeeded
+#   1 - some items failed
+#   2 - invalid arguments
+#   3 - every item failed
+import sys
+import json
+import time
+import argparse
+import threading
+import contextlib
+
+from utils import *
+from status import *
+from config import *
+from typing import List
+from limits import limit
+from constants import RENDER_PROFILES
+from jobs import find_account, get_tts
+from classes.Twitter import Twitter
+from classes.YouTube import YouTube
+from concurrent.futures import ThreadPoolExecutor
+
+EXIT_OK = 0
+EXIT_PARTIAL = 1
+EXIT_USAGE = 2
+EXIT_FAILED = 3
+
+class Batch:
+    """
+    Runs the items of a batch and writes one JSON line per item,
+    as soon as it has finished.
+    """
+    def __init__(self, output: any, upload: bool, profile: str) -> None:
+        """
+        Initializes the Batch.
+
+        Args:
+            output (any): File to write the JSON lines to
+            upload (bool): Upload the Shorts / publish the posts
+            profile (str): The render profile
+
+        Returns:
+            None
+        """
+        self._output = output
+        self._upload = upload
+        self._profile = profile
+        self._lock = threading.Lock()
+        self.results = []
+
+    def emit(self, result: dict) -> None:
+        """
+        Writes the JSON line of an item.
+
+        Args:
+            result (dict): The result of the item
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self.results.append(result)
+            self._output.write(json.dumps(result) + "\n")
+            self._output.flush()
+
+    def run_youtube(self, account_id: str, index: int) -> None:
+        """
+        Generates (and uploads) a Short.
+
+        Args:
+            account_id (str): The YouTube account UUID
+            index (int): Index of the Short for this account
+
+        Returns:
+            None
+        """
+        result = {"purpose": "youtube", "account_id": account_id, "index": index, "ok": False}
+        start = time.perf_counter()
+        youtube = None
+
+        try:
+            acc = find_account("youtube", account_id)
+            if acc is None:
+                raise ValueError(f"YouTube account {account_id} not found")
+
+            youtube = YouTube(acc["id"], acc["nickname"], acc["firefox_profile"], acc["niche"], acc["language"])
+
+            with limit(f"account:{account_id}"):
+                youtube.generate_video(get_tts(), profile=self._profile)
+
+                if not self._upload:
+                    # Not resumed (and published) by `resume.py --all` later
+                    youtube.job.skip_upload()
+                elif not youtube.upload_video():
+                    raise RuntimeError(youtube.job.record["error"]["reason"])
+
+            result["ok"] = True
+            result["url"] = getattr(youtube, "uploaded_video_url", None) if self._upload else None
+        except (Exception, SystemExit) as e:
+            result["error"] = str(e)
+
+        if youtube is not None and youtube.job is not None:
+            result["job_id"] = youtube.job.id
+            result["stages"] = youtube.job.get_timings()
+            # Uploaded jobs don't keep their artifacts
+            if not (self._upload and result["ok"]):
+                result["artifacts"] = {
+                    "video": getattr(youtube, "video_path", None),
+                    "tts": getattr(youtube, "tts_path", None),
+                    "subtitles": youtube.subtitles_path,
+                    "images": youtube.images
+                }
+
+        result["wall_time"] = round(time.perf_counter() - start, 3)
+        self.emit(result)
+
+    def run_twitter(self, account_id: str, count: int) -> None:
+        """
+        Generates (and posts) tweets, all in one browser session.
+
+        Args:
+            account_id (str): The Twitter account UUID
+            count (int): Amount of posts
+
+        Returns:
+            None
+        """
+        base = {"purpose": "twitter", "account_id": account_id}
+
+        try:
+            acc = find_account("twitter", account_id)
+            if acc is None:
+                raise ValueError(f"Twitter account {account_id} not found")
+
+            twitter = Twitter(acc["id"], acc["nickname"], acc["firefox_profile"], acc["topic"])
+
+            with limit(f"account:{account_id}"):
+                if not self._upload:
+                    for index in range(count):
+                        start = time.perf_counter()
+                        try:
+                            text = twitter.generate_post()
+                            self.emit({**base, "index": index, "ok": True, "text": text, "wall_time": round(time.perf_counter() - start, 3)})
+                        except Exception as e:
+                            self.emit({**base, "index": index, "ok": False, "error": str(e), "wall_time": round(time.perf_counter() - start, 3)})
+                    return
+
+                report = twitter.post_batch(count=count)
+        except (Exception, SystemExit) as e:
+            self.emit({**base, "index": None, "ok": False, "error": str(e)})
+            return
+
+        for post in report["posted"]:
+            self.emit({**base, "index": post["index"], "ok": True, "text": post["text"]})
+
+        for failure in report["failed"]:
+            self.emit({**base, "index": failure["index"], "ok": False, "text": failure["text"], "error": failure["error"]})
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate Shorts and posts for many accounts, reporting every item as a JSON line.")
+    parser.add_argument("--youtube", nargs="*", default=[], help="YouTube account UUIDs")
+    parser.add_argument("--twitter", nargs="*", default=[], help="Twitter account UUIDs")
+    parser.add_argument("--count", type=int, default=1, help="Shorts / posts per account")
+    parser.add_argument("--no-upload", action="store_true", help="Only generate, don't upload Shorts or publish posts")
+    parser.add_argument("--render-profile", default=None, choices=list(RENDER_PROFILES), help="Render profile of the Shorts, defaults to the configured profile")
+    parser.add_argument("--parallel", type=int, default=1, help="Items, that run at the same time (within the configured limits)")
+    parser.add_argument("--output", default=None, help="File to write the JSON lines to, defaults to stdout")
+    args = parser.parse_args()
+
+    if not args.youtube and not args.twitter:
+        parser.print_usage(sys.stderr)
+        print("error: pass --youtube and/or --twitter account UUIDs", file=sys.stderr)
+        sys.exit(EXIT_USAGE)
+
+    if args.count < 1 or args.parallel < 1:
+        print("error: --count and --parallel must be at least 1", file=sys.stderr)
+        sys.exit(EXIT_USAGE)
+
+    # Drafts are only published after they have been approved (see main.py and resume.py --promote)
+    if args.youtube and not args.no_upload and (args.render_profile or get_render_profile()) == "draft":
+        print("error: drafts can't be uploaded without approval, pass --no-upload or another --render-profile", file=sys.stderr)
+        sys.exit(EXIT_USAGE)
+
+    output = open(args.output, "a") if args.output else sys.stdout
+
+    # Keep stdout for the JSON lines, everything else goes to stderr
+    with contextlib.redirect_stdout(sys.stderr):
+        assert_folder_structure()
+
+        if args.youtube:
+            fetch_songs()
+
+        batch = Batch(output, not args.no_upload, args.render_profile)
+
+        with ThreadPoolExecutor(max_workers=args.parallel) as executor:
+            futures = [
+                executor.submit(batch.run_youtube, account_id, index)
+                for index in range(args.count) for account_id in args.youtube
+            ]
+            futures += [executor.submit(batch.run_twitter, account_id, args.count) for account_id in args.twitter]
+
+            for future in futures:
+                future.result()
+
+    if args.output:
+        output.close()
+
+    failed = len([result for result in batch.results if not result["ok"]])
+
+    if failed == 0:
+        sys.exit(EXIT_OK)
+    elif failed == len(batch.results):
+        sys.exit(EXIT_FAILED)
+
+    sys.exit(EXIT_PARTIAL)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+# Benchmarks rendering YouTube Shorts with synthetic assets, fully offline.
+import os
+import sys
+import json
+import math
+import time
+import wave
+import random
+import struct
+import argparse
+import platform
+import tempfile
+import multiprocessing
+
+from status import *
+from config import *
+from queue import Empty
+from typing import List
+from PIL import Image, ImageDraw
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows
+    resource = None
+
+# Image sizes, that AI image models typically return
+IMAGE_SIZES = [(1024, 1024), (1920, 1080), (1080, 1920), (768, 1344), (1344, 768)]
+
+CAPTION_WORDS = ["money", "printer", "go", "brrr", "shorts", "automation", "benchmark", "render", "fast", "frames"]
+
+def generate_images(directory: str, amount: int) -> List[str]:
+    """
+    Generates images with mixed aspect ratios.
+
+    Args:
+        directory (str): Directory to write the images to
+        amount (int): Amount of images
+
+    Returns:
+        paths (List[str]): Paths to the images
+    """
+    paths = []
+
+    for i in range(amount):
+        width, height = IMAGE_SIZES[i % len(IMAGE_SIZES)]
+        image = Image.new("RGB", (width, height), tuple(random.randint(0, 255) for _ in range(3)))
+        draw = ImageDraw.Draw(image)
+
+        # Add some shapes, so the encoder has something to do
+        for _ in range(50):
+            x, y = random.randint(0, width), random.randint(0, height)
+            r = random.randint(10, width // 4)
+            draw.ellipse((x - r, y - r, x + r, y + r), fill=tuple(random.randint(0, 255) for _ in range(3)))
+
+        path = os.path.join(directory, f"image_{i}.png")
+        image.save(path)
+        paths.append(path)
+
+    return paths
+
+def generate_wav(path: str, duration: float, frequency: float) -> str:
+    """
+    Generates a mono 44.1kHz WAV file with a sine tone.
+
+    Args:
+        path (str): Path to write the WAV to
+        duration (float): Duration in seconds
+        frequency (float): Frequency of the tone
+
+    Returns:
+        path (str): Path to the WAV
+    """
+    sample_rate = 44100
+
+    with wave.open(path, "wb") as file:
+        file.setnchannels(1)
+        file.setsampwidth(2)
+        file.setframerate(sample_rate)
+
+        samples = (
+            int(8000 * math.sin(2 * math.pi * frequency * i / sample_rate))
+            for i in range(int(duration * sample_rate))
+        )
+        file.writeframes(b"".join(struct.pack("<h", sample) for sample in samples))
+
+    return path
+
+def generate_srt(path: str, duration: float, caption_duration: float = 1.2) -> str:
+    """
+    Generates a SRT file with short captions, like the equalized AssemblyAI subtitles.
+
+    Args:
+        path (str): Path to write the SRT to
+        duration (float): Duration of the video
+        caption_duration (float): Duration of every caption
+
+    Returns:
+        path (str): Path to the SRT
+    """
+    timestamp = lambda t: f"{int(t // 3600):02}:{int(t % 3600 // 60):02}:{int(t % 60):02},{int(t * 1000 % 1000):03}"
+
+    with open(path, "w") as file:
+        index, start = 1, 0.0
+        while start < duration:
+            end = min(start + caption_duration, duration)
+            text = " ".join(random.sample(CAPTION_WORDS, 2))
+            file.write(f"{index}\n{timestamp(start)} --> {timestamp(end)}\n{text}\n\n")
+            index, start = index + 1, end
+
+    return path
+
+def generate_assets(directory: str, n_images: int, duration: float) -> dict:
+    """
+    Generates every input `combine()` needs.
+
+    Args:
+        directory (str): Directory to write the assets to
+        n_images (int): Amount of images
+        duration (float): Duration of the TTS
+
+    Returns:
+        assets (dict): Paths to the generated assets
+    """
+    return {
+        "images": generate_images(directory, n_images),
+        "tts_path": generate_wav(os.path.join(directory, "tts.wav"), duration, 220),
+        "song_path": generate_wav(os.path.join(directory, "song.wav"), duration + 10, 440),
+        "subtitles_path": generate_srt(os.path.join(directory, "subtitles.srt"), duration),
+    }
+
+def get_peak_rss() -> dict:
+    """
+    Gets the peak resident set size of this process and its (finished) children, in MB.
+
+    Returns:
+        rss (dict): Peak RSS of `self` and `children`
+    """
+    if resource is None:
+        return {"self": None, "children": None}
+
+    # Linux reports KB, macOS reports bytes
+    unit = 1024 * 1024 if platform.system() == "Darwin" else 1024
+
+    return {
+        "self": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / unit, 1),
+        "children": round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / unit, 1),
+    }
+
+def run_backend(queue: multiprocessing.Queue, backend: str, profile: str, assets: dict) -> None:
+    """
+    Renders the synthetic Short with a backend. Runs in its own process,
+    so that the peak RSS belongs to this backend only.
+
+    Args:
+        queue (multiprocessing.Queue): Queue to put the result in
+        backend (str): The render backend
+        profile (str): The render profile
+        assets (dict): The synthetic assets
+
+    Returns:
+        None
+    """
+    try:
+        from classes.YouTube import YouTube
+
+        class BenchmarkYouTube(YouTube):
+            """
+            YouTube without a browser, AssemblyAI or song selection.
+            """
+            def __init__(self) -> None:
+                self.images = assets["images"]
+                self.tts_path = assets["tts_path"]
+                self.song_path = assets["song_path"]
+                self.subtitles_path = assets["subtitles_path"]
+
+            def generate_subtitles(self, audio_path: str) -> str:
+                return assets["subtitles_path"]
+
+        youtube = BenchmarkYouTube()
+
+        start = time.perf_counter()
+        path = youtube.combine(profile, backend)
+        wall_time = time.perf_counter() - start
+
+        duration = assets["duration"]
+        size = os.path.getsize(path)
+        os.remove(path)
+
+        queue.put({
+            "backend": backend,
+            "backend_used": youtube.render_backend,
+            "profile": profile,
+            "ok": True,
+            "wall_time": round(wall_time, 3),
+            # Frames of a 30fps video rendered per second of wall time
+            "fps": round(duration * 30 / wall_time, 2),
+            "realtime_factor": round(duration / wall_time, 2),
+            "peak_rss_mb": get_peak_rss(),
+            "output_size_bytes": size,
+        })
+    except (Exception, SystemExit) as e:
+        queue.put({
+            "backend": backend,
+            "profile": profile,
+            "ok": False,
+            "error": str(e),
+        })
+
+def benchmark(backends: List[str], profile: str, n_images: int, duration: float) -> dict:
+    """
+    Benchmarks the given render backends.
+
+    Args:
+        backends (List[str]): The render backends
+        profile (str): The render profile
+        n_images (int): Amount of synthetic images
+        duration (float): Duration of the synthetic TTS
+
+    Returns:
+        report (dict): The benchmark report
+    """
+    assert_folder_structure()
+
+    # Spawn a fresh interpreter for every run, so nothing is shared between backends
+    context = multiprocessing.get_context("spawn")
+    results = []
+
+    with tempfile.TemporaryDirectory() as directory:
+        assets = generate_assets(directory, n_images, duration)
+        assets["duration"] = duration
+
+        for backend in backends:
+            info(f" => Benchmarking {backend} ({profile})...")
+
+            queue = context.Queue()
+            process = context.Process(target=run_backend, args=(queue, backend, profile, assets))
+            process.start()
+
+            # A crashed child (import error, segfault, OOM kill) never puts a result
+            result = None
+            while result is None:
+                try:
+                    result = queue.get(timeout=1)
+                except Empty:
+                    if not process.is_alive():
+                        try:
+                            result = queue.get(timeout=1)
+                        except Empty:
+                            break
+
+            process.join()
+
+            if result is None:
+                result = {
+                    "backend": backend,
+                    "profile": profile,
+                    "ok": False,
+                    "error": f"Render process exited with code {process.exitcode}",
+                }
+
+            results.append(result)
+
+            if result["ok"]:
+                success(f" => {backend}: {result['wall_time']}s, {result['fps']} fps")
+            else:
+                error(f" => {backend}: {result['error']}")
+
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "machine": {
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "cpu_count": os.cpu_count(),
+            "threads": get_threads(),
+        },
+        "inputs": {
+            "images": n_images,
+            "duration": duration,
+            "profile": profile,
+        },
+        "results": results,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark rendering of YouTube Shorts.")
+    parser.add_argument("--backends", default="moviepy,ffmpeg,vfr,parallel", help="Comma separated render backends")
+    parser.add_argument("--profile", default="publish", help="Render profile")
+    parser.add_argument("--images", type=int, default=8, help="Amount of synthetic images")
+    parser.add_argument("--duration", type=float, default=30, help="Duration of the synthetic TTS in seconds")
+    parser.add_argument("--output", help="File to write the JSON report to")
+    args = parser.parse_args()
+
+    report = benchmark(args.backends.split(","), args.profile, args.images, args.duration)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=4)
+
+    print(json.dumps(report, indent=4))
+
+    if not all(result["ok"] for result in report["results"]):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,665 @@
+import os
+import re
+import json
+import atexit
+import shutil
+import hashlib
+import platform
+import threading
+import subprocess
+
+from cache import *
+from status import *
+from config import *
+from constants import *
+from limits import get_limit
+from typing import Callable, List
+from selenium import webdriver
+from selenium.webdriver.firefox.service import Service
+from selenium.webdriver.firefox.options import Options
+from webdriver_manager.firefox import GeckoDriverManager
+from selenium.webdriver.remote.webelement import WebElement
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException, StaleElementReferenceException, WebDriverException
+
+# Matches progress like "Uploading 45% ..." (independent of the UI language)
+UPLOAD_PERCENTAGE_PATTERN = re.compile(r"\d+\s*%")
+
+# Matches the version in "geckodriver 0.34.0 (...)"
+GECKODRIVER_VERSION_PATTERN = re.compile(r"geckodriver\s+v?(\d+(?:\.\d+)+)")
+
+# Resolved geckodriver of this process, a failed lookup is not repeated
+_geckodriver_lock = threading.Lock()
+_geckodriver_path = None
+_geckodriver_resolved = False
+
+def wait_for(driver: webdriver.Firefox, condition: Callable, description: str, timeout: float = None) -> any:
+    """
+    Waits until a condition is met, instead of sleeping for a fixed amount of time.
+
+    Args:
+        driver (webdriver.Firefox): The browser
+        condition (Callable): An expected condition, called with the driver
+        description (str): What is being waited for, used in the timeout message
+        timeout (float): Seconds to wait, defaults to the configured browser timeout
+
+    Raises:
+        TimeoutException: If the condition isn't met in time
+
+    Returns:
+        result (any): The (truthy) value returned by the condition
+    """
+    timeout = timeout or get_browser_timeout()
+
+    try:
+        return WebDriverWait(driver, timeout, ignored_exceptions=[StaleElementReferenceException]).until(condition)
+    except TimeoutException:
+        raise TimeoutException(f"Timed out after {timeout}s waiting for {description} (at {driver.current_url})")
+
+def wait_for_element(driver: webdriver.Firefox, by: str, value: str, timeout: float = None) -> WebElement:
+    """
+    Waits until an element is present in the DOM.
+
+    Args:
+        driver (webdriver.Firefox): The browser
+        by (str): The locator strategy
+        value (str): The locator
+        timeout (float): Seconds to wait
+
+    Returns:
+        element (WebElement): The element
+    """
+    return wait_for(driver, EC.presence_of_element_located((by, value)), f"element {value}", timeout)
+
+def wait_for_elements(driver: webdriver.Firefox, by: str, value: str, min_count: int = 1, timeout: float = None) -> List[WebElement]:
+    """
+    Waits until at least `min_count` elements are present in the DOM.
+
+    Args:
+        driver (webdriver.Firefox): The browser
+        by (str): The locator strategy
+        value (str): The locator
+        min_count (int): Minimum amount of elements
+        timeout (float): Seconds to wait
+
+    Returns:
+        elements (List[WebElement]): The elements
+    """
+    def condition(d: webdriver.Firefox) -> List[WebElement]:
+        elements = d.find_elements(by, value)
+        return elements if len(elements) >= min_count else False
+
+    return wait_for(driver, condition, f"{min_count} element(s) {value}", timeout)
+
+def wait_for_clickable(driver: webdriver.Firefox, by: str, value: str, timeout: float = None) -> WebElement:
+    """
+    Waits until an element is visible and enabled.
+
+    Args:
+        driver (webdriver.Firefox): The browser
+        by (str): The locator strategy
+        value (str): The locator
+        timeout (float): Seconds to wait
+
+    Returns:
+        element (WebElement): The element
+    """
+    return wait_for(driver, EC.element_to_be_clickable((by, value)), f"clickable element {value}", timeout)
+
+def click(driver: webdriver.Firefox, by: str, value: str, timeout: float = None) -> WebElement:
+    """
+    Clicks an element, as soon as it is clickable.
+
+    Args:
+        driver (webdriver.Firefox): The browser
+        by (str): The locator strategy
+        value (str): The locator
+        timeout (float): Seconds to wait
+
+    Returns:
+        element (WebElement): The clicked element
+    """
+    element = wait_for_clickable(driver, by, value, timeout)
+    element.click()
+
+    return element
+
+def click_element(driver: webdriver.Firefox, element: WebElement, description: str, timeout: float = None) -> WebElement:
+    """
+    Clicks an already located element, as soon as it is clickable.
+
+    Args:
+        driver (webdriver.Firefox): The browser
+        element (WebElement): The element
+        description (str): What the element is, used in the timeout message
+        timeout (float): Seconds to wait
+
+    Returns:
+        element (WebElement): The clicked element
+    """
+    wait_for(driver, EC.element_to_be_clickable(element), f"clickable {description}", timeout)
+    element.click()
+
+    return element
+
+def wait_for_visible(driver: webdriver.Firefox, by: str, value: str, timeout: float = None) -> WebElement:
+    """
+    Waits until an element is present in the DOM and visible.
+
+    Args:
+        driver (webdriver.Firefox): The browser
+        by (str): The locator strategy
+        value (str): The locator
+        timeout (float): Seconds to wait
+
+    Returns:
+        element (WebElement): The element
+    """
+    return wait_for(driver, EC.visibility_of_element_located((by, value)), f"visible element {value}", timeout)
+
+def wait_for_invisible(driver: webdriver.Firefox, by: str, value: str, timeout: float = None) -> bool:
+    """
+    Waits until an element is hidden or removed from the DOM.
+
+    Args:
+        driver (webdriver.Firefox): The browser
+        by (str): The locator strategy
+        value (str): The locator
+        timeout (float): Seconds to wait
+
+    Returns:
+        invisible (bool): True
+    """
+    return wait_for(driver, EC.invisibility_of_element_located((by, value)), f"element {value} to disappear", timeout)
+
+def wait_for_url_contains(driver: webdriver.Firefox, fragment: str, timeout: float = None) -> bool:
+    """
+    Waits until the current URL contains a fragment (e.g. after a redirect).
+
+    Args:
+        driver (webdriver.Firefox): The browser
+        fragment (str): The URL fragment
+        timeout (float): Seconds to wait
+
+    Returns:
+        contains (bool): True
+    """
+    return wait_for(driver, EC.url_contains(fragment), f"URL containing {fragment}", timeout)
+
+def wait_for_upload(driver: webdriver.Firefox, by: str, value: str, timeout: float = None) -> str:
+    """
+    Watches an upload progress label until the upload is finished,
+    i.e. the label no longer shows a percentage.
+
+    Args:
+        driver (webdriver.Firefox): The browser
+        by (str): The locator strategy of the progress label
+        value (str): The locator of the progress label
+        timeout (float): Seconds to wait, defaults to the configured upload timeout
+
+    Returns:
+        status (str): The final text of the progress label
+    """
+    def condition(d: webdriver.Firefox) -> str:
+        labels = d.find_elements(by, value)
+        if not labels:
+            return False
+
+        status = labels[0].text.strip()
+        if not status or UPLOAD_PERCENTAGE_PATTERN.search(status):
+            return False
+
+        return status
+
+    return wait_for(driver, condition, "the upload to finish", timeout or get_upload_timeout())
+
+def file_sha256(path: str) -> str:
+    """
+    Computes the SHA-256 of a file.
+
+    Args:
+        path (str): Path to the file
+
+    Returns:
+        digest (str): The hex digest
+    """
+    digest = hashlib.sha256()
+
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+def get_geckodriver_binary_version(driver_path: str) -> str:
+    """
+    Runs `geckodriver --version`, which also makes sure the binary works.
+
+    Args:
+        driver_path (str): Path to geckodriver
+
+    Returns:
+        version (str): The version, or None if the binary doesn't run
+    """
+    try:
+        output = subprocess.run([driver_path, "--version"], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, timeout=10).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+    match = GECKODRIVER_VERSION_PATTERN.search(output)
+
+    return match.group(1) if match else None
+
+def get_pinned_geckodriver() -> str:
+    """
+    Gets the geckodriver pinned in the drivers cache, if it is intact.
+
+    Returns:
+        path (str): Path to the pinned geckodriver, or None
+    """
+    manifest_path = os.path.join(get_drivers_cache_path(), "geckodriver.json")
+
+    if not os.path.exists(manifest_path):
+        return None
+
+    with open(manifest_path, "r") as file:
+        manifest = json.load(file)
+
+    pinned_version = get_geckodriver_version()
+    if pinned_version and pinned_version.lstrip("v") != manifest["version"]:
+        return None
+
+    driver_path = manifest["path"]
+    if not os.path.isfile(driver_path) or file_sha256(driver_path) != manifest["sha256"]:
+        warning(f" => Pinned geckodriver at {driver_path} is missing or corrupt.")
+        return None
+
+    return driver_path
+
+def pin_geckodriver(source_path: str) -> str:
+    """
+    Copies a geckodriver into the drivers cache and records its version and checksum.
+
+    Args:
+        source_path (str): Path to the geckodriver to pin
+
+    Returns:
+        path (str): Path to the pinned geckodriver
+    """
+    version = get_geckodriver_binary_version(source_path)
+    if not version:
+        raise RuntimeError(f"{source_path} is not a working geckodriver")
+
+    binary = "geckodriver.exe" if platform.system() == "Windows" else "geckodriver"
+    driver_dir = os.path.join(get_drivers_cache_path(), "geckodriver", version)
+    driver_path = os.path.join(driver_dir, binary)
+
+    os.makedirs(driver_dir, exist_ok=True)
+    shutil.copy2(source_path, driver_path)
+    os.chmod(driver_path, 0o755)
+
+    with open(os.path.join(get_drivers_cache_path(), "geckodriver.json"), "w") as file:
+        json.dump({
+            "version": version,
+            "path": driver_path,
+            "sha256": file_sha256(driver_path)
+        }, file, indent=4)
+
+    if get_verbose():
+        success(f" => Pinned geckodriver {version} at {driver_path}")
+
+    return driver_path
+
+def resolve_geckodriver() -> str:
+    """
+    Resolves geckodriver once per process. Uses the pinned driver from the
+    drivers cache (no network access), otherwise downloads one with
+    GeckoDriverManager and pins it. If that fails (e.g. offline), falls back
+    to a geckodriver on the PATH. If there is none either, later launches
+    don't try to download one again.
+
+    Returns:
+        path (str): Path to geckodriver, or None to let Selenium find one
+    """
+    global _geckodriver_path, _geckodriver_resolved
+
+    with _geckodriver_lock:
+        if _geckodriver_path and os.path.isfile(_geckodriver_path):
+            return _geckodriver_path
+
+        if _geckodriver_resolved and _geckodriver_path is None:
+            return None
+
+        driver_path = get_pinned_geckodriver()
+
+        if not driver_path:
+            try:
+                driver_path = pin_geckodriver(GeckoDriverManager(version=get_geckodriver_version()).install())
+            except Exception as e:
+                warning(f" => Could not install geckodriver: {str(e)}")
+                driver_path = shutil.which("geckodriver")
+
+                if driver_path is None:
+                    warning(" => No geckodriver found. Put one on the PATH, or run once with network access to pin one in the drivers cache.")
+
+        _geckodriver_path = driver_path
+        _geckodriver_resolved = True
+
+        return driver_path
+
+def build_firefox_options(fp_profile_path: str, lean: bool = None) -> Options:
+    """
+    Builds the Firefox options shared by all bots.
+
+    Args:
+        fp_profile_path (str): Path to the Firefox profile
+        lean (bool): Use the lean browser mode, defaults to `lean_browser` from the config
+
+    Returns:
+        options (Options): The Firefox options
+    """
+    options = Options()
+
+    # Set headless state of browser
+    if get_headless():
+        options.add_argument("--headless")
+
+    # Set the profile path
+    options.add_argument("-profile")
+    options.add_argument(fp_profile_path)
+
+    if lean is None:
+        lean = get_lean_browser()
+
+    # Skip everything the bots never look at
+    if lean:
+        for name, value in LEAN_FIREFOX_PREFERENCES.items():
+            options.set_preference(name, value)
+
+    return options
+
+def launch_browser(fp_profile_path: str, lean: bool = None) -> webdriver.Firefox:
+    """
+    Starts Firefox with the given profile.
+
+    Args:
+        fp_profile_path (str): Path to the Firefox profile
+        lean (bool): Use the lean browser mode, defaults to `lean_browser` from the config
+
+    Returns:
+        browser (webdriver.Firefox): The browser
+    """
+    if get_verbose():
+        info(f" => Starting Firefox with profile: {fp_profile_path}")
+
+    driver_path = resolve_geckodriver()
+
+    # Without a driver, let Selenium Manager find one
+    service = Service(driver_path) if driver_path else Service()
+
+    return webdriver.Firefox(service=service, options=build_firefox_options(fp_profile_path, lean))
+
+def is_browser_alive(browser: webdriver.Firefox) -> bool:
+    """
+    Checks if a browser session still responds.
+
+    Args:
+        browser (webdriver.Firefox): The browser
+
+    Returns:
+        alive (bool): True if the session responds
+    """
+    try:
+        browser.current_url
+        return True
+    except WebDriverException:
+        return False
+
+def quit_browser(browser: webdriver.Firefox) -> None:
+    """
+    Quits a browser, ignoring sessions that already crashed.
+
+    Args:
+        browser (webdriver.Firefox): The browser
+
+    Returns:
+        None
+    """
+    try:
+        browser.quit()
+    except WebDriverException:
+        pass
+
+class BrowserPool:
+    """
+    Keeps one Firefox session per Firefox profile alive and hands it out to the bots.
+
+    Browsers are started on first use and reused across jobs. A session is
+    recycled, once it has been used `browser_max_uses` times or stops responding.
+    Only one thread at a time can use a profile (Firefox locks it anyway), but the
+    same thread may acquire it again, e.g. AffiliateMarketing sharing its pitch on Twitter.
+    """
+    def __init__(self) -> None:
+        """
+        Initializes the BrowserPool.
+
+        Returns:
+            None
+        """
+        self._lock = threading.Lock()
+        self._sessions = {}
+
+    def _get_session(self, fp_profile_path: str) -> dict:
+        """
+        Gets (or creates) the session entry of a profile.
+
+        Args:
+            fp_profile_path (str): Path to the Firefox profile
+
+        Returns:
+            session (dict): The session entry
+        """
+        with self._lock:
+            if fp_profile_path not in self._sessions:
+                self._sessions[fp_profile_path] = {
+                    "lock": threading.RLock(),
+                    "browser": None,
+                    "uses": 0,
+                    "depth": 0
+                }
+
+            return self._sessions[fp_profile_path]
+
+    def _evict_idle(self, fp_profile_path: str) -> None:
+        """
+        Quits idle browsers of other profiles, until there is room for
+        one more browser within the `browsers` limit.
+
+        Args:
+            fp_profile_path (str): Path to the Firefox profile, that needs a browser
+
+        Returns:
+            None
+        """
+        capacity = get_limit("browsers").capacity
+
+        with self._lock:
+            others = [s for path, s in self._sessions.items() if path != fp_profile_path]
+
+        live = len([s for s in others if s["browser"] is not None])
+
+        for session in others:
+            if live < capacity:
+                break
+
+            # Skip sessions, that are in use
+            if session["browser"] is None or not session["lock"].acquire(blocking=False):
+                continue
+
+            try:
+                if session["depth"] == 0 and session["browser"] is not None:
+                    quit_browser(session["browser"])
+                    session["browser"] = None
+                    live -= 1
+            finally:
+                session["lock"].release()
+
+    def acquire(self, fp_profile_path: str) -> webdriver.Firefox:
+        """
+        Leases the browser of a profile, starting it if needed.
+        Blocks while another thread uses the profile, or while
+        the `browsers` limit is reached.
+
+        Args:
+            fp_profile_path (str): Path to the Firefox profile
+
+        Returns:
+            browser (webdriver.Firefox): The browser
+        """
+        session = self._get_session(fp_profile_path)
+        session["lock"].acquire()
+
+        try:
+            if session["depth"] == 0:
+                get_limit("browsers").acquire()
+
+            try:
+                browser = self._lease(session, fp_profile_path)
+            except Exception:
+                if session["depth"] == 0:
+                    get_limit("browsers").release()
+                raise
+
+            session["depth"] += 1
+
+            return browser
+        except Exception:
+            session["lock"].release()
+            raise
+
+    def _lease(self, session: dict, fp_profile_path: str) -> webdriver.Firefox:
+        """
+        Gets the browser of a session, (re)starting it if needed.
+
+        Args:
+            session (dict): The session entry
+            fp_profile_path (str): Path to the Firefox profile
+
+        Returns:
+            browser (webdriver.Firefox): The browser
+        """
+        if session["depth"] == 0:
+            browser = session["browser"]
+
+            if browser is not None and (session["uses"] >= get_browser_max_uses() or not is_browser_alive(browser)):
+                if get_verbose():
+                    info(f" => Recycling Firefox with profile: {fp_profile_path}")
+                quit_browser(browser)
+                session["browser"] = None
+
+            if session["browser"] is None:
+                self._evict_idle(fp_profile_path)
+                session["browser"] = launch_browser(fp_profile_path)
+                session["uses"] = 0
+
+            session["uses"] += 1
+
+        return session["browser"]
+
+    def release(self, fp_profile_path: str) -> None:
+        """
+        Returns a leased browser to the pool. The browser keeps running.
+
+        Args:
+            fp_profile_path (str): Path to the Firefox profile
+
+        Returns:
+            None
+        """
+        session = self._get_session(fp_profile_path)
+        session["depth"] -= 1
+
+        if session["depth"] == 0:
+            get_limit("browsers").release()
+
+        session["lock"].release()
+
+    def quit(self, fp_profile_path: str) -> None:
+        """
+        Quits the browser of a profile.
+
+        Args:
+            fp_profile_path (str): Path to the Firefox profile
+
+        Returns:
+            None
+        """
+        session = self._get_session(fp_profile_path)
+
+        with session["lock"]:
+            if session["browser"] is not None:
+                quit_browser(session["browser"])
+                session["browser"] = None
+
+    def quit_all(self) -> None:
+        """
+        Quits every browser in the pool.
+
+        Returns:
+            None
+        """
+        for session in list(self._sessions.values()):
+            # Don't hang on exit, if a thread still holds a session
+            if session["lock"].acquire(timeout=5):
+                try:
+                    if session["browser"] is not None:
+                        quit_browser(session["browser"])
+                        session["browser"] = None
+                finally:
+                    session["lock"].release()
+
+_browser_pool = BrowserPool()
+atexit.register(_browser_pool.quit_all)
+
+def get_browser_pool() -> BrowserPool:
+    """
+    Gets the BrowserPool of this process.
+
+    Returns:
+        pool (BrowserPool): The browser pool
+    """
+    return _browser_pool
+
+class PooledBrowser:
+    """
+    Gives a bot a lazily started `browser` property, leased from the BrowserPool
+    by the Firefox profile in `_fp_profile_path`. The browser is only started
+    (or taken from the pool) once it's needed, so bots set `_browser` to None.
+    """
+    _fp_profile_path: str = None
+    _browser: webdriver.Firefox = None
+
+    @property
+    def browser(self) -> webdriver.Firefox:
+        """
+        Getter Method for the browser. Starts (or reuses) Firefox on first use.
+
+        Returns:
+            browser (webdriver.Firefox): The browser
+        """
+        if self._browser is None:
+            self._browser = get_browser_pool().acquire(self._fp_profile_path)
+
+        return self._browser
+
+    def release_browser(self) -> None:
+        """
+        Returns the browser to the BrowserPool, so other jobs can reuse it.
+
+        Returns:
+            None
+        """
+        if self._browser is not None:
+            self._browser = None
+            get_browser_pool().release(self._fp_profile_path)
@@ -0,0 +1,213 @@
+# Compares page-ready times and memory of the default and the lean browser mode.
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+
+from status import *
+from config import *
+from typing import List
+from browser import launch_browser, quit_browser
+
+# Pages the bots work with
+DEFAULT_URLS = [
+    "https://studio.youtube.com",
+    "https://x.com/home",
+    "https://www.amazon.com"
+]
+
+# Navigation timing of the current page, relative to the start of the navigation
+NAVIGATION_TIMING_SCRIPT = """
+const entry = performance.getEntriesByType("navigation")[0];
+if (!entry) return null;
+return {
+    dom_content_loaded: entry.domContentLoadedEventEnd,
+    load: entry.loadEventEnd,
+    transfer_size: entry.transferSize
+};
+"""
+
+def get_process_tree_rss(pid: int) -> float:
+    """
+    Gets the resident set size of a process and all of its descendants, in MB.
+    Firefox runs every content process as a child of the main process.
+
+    Args:
+        pid (int): The process ID
+
+    Returns:
+        rss (float): The RSS in MB, or None if /proc is not available
+    """
+    if not os.path.isdir("/proc"):
+        return None
+
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+
+        try:
+            with open(f"/proc/{entry}/stat", "r") as file:
+                # The process name may contain spaces, the PPID follows the last ")"
+                ppid = int(file.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+
+        children.setdefault(ppid, []).append(int(entry))
+
+    total_kb = 0
+    pending = [pid]
+
+    while pending:
+        current = pending.pop()
+        pending.extend(children.get(current, []))
+
+        try:
+            with open(f"/proc/{current}/status", "r") as file:
+                for line in file:
+                    if line.startswith("VmRSS:"):
+                        total_kb += int(line.split()[1])
+        except OSError:
+            continue
+
+    return round(total_kb / 1024, 1)
+
+def measure_page(browser, url: str) -> dict:
+    """
+    Opens a page and measures how long it takes to become ready.
+
+    Args:
+        browser (webdriver.Firefox): The browser
+        url (str): The page to open
+
+    Returns:
+        result (dict): Wall time of the navigation and the navigation timing of the page
+    """
+    start = time.perf_counter()
+    browser.get(url)
+    wall_time = time.perf_counter() - start
+
+    timing = browser.execute_script(NAVIGATION_TIMING_SCRIPT) or {}
+
+    return {
+        "url": url,
+        "wall_time": round(wall_time, 3),
+        "dom_content_loaded_ms": round(timing.get("dom_content_loaded", 0), 1),
+        "load_ms": round(timing.get("load", 0), 1),
+        "transfer_size_bytes": timing.get("transfer_size"),
+    }
+
+def benchmark_session(fp_profile_path: str, lean: bool, urls: List[str]) -> dict:
+    """
+    Starts a browser, opens every page and measures the memory of the session afterwards.
+
+    Args:
+        fp_profile_path (str): Path to the Firefox profile
+        lean (bool): Use the lean browser mode
+        urls (List[str]): The pages to open
+
+    Returns:
+        result (dict): Startup time, page results and peak RSS of the session
+    """
+    start = time.perf_counter()
+    browser = launch_browser(fp_profile_path, lean=lean)
+    startup_time = time.perf_counter() - start
+
+    try:
+        pages = [measure_page(browser, url) for url in urls]
+        pid = browser.capabilities.get("moz:processID")
+
+        return {
+            "lean": lean,
+            "startup_time": round(startup_time, 3),
+            "pages": pages,
+            "rss_mb": get_process_tree_rss(pid) if pid else None,
+        }
+    finally:
+        quit_browser(browser)
+
+def summarize(sessions: List[dict]) -> dict:
+    """
+    Averages the sessions of one browser mode.
+
+    Args:
+        sessions (List[dict]): The sessions
+
+    Returns:
+        summary (dict): Average startup time, page wall time and RSS
+    """
+    average = lambda values: round(sum(values) / len(values), 3) if values else None
+
+    return {
+        "startup_time": average([s["startup_time"] for s in sessions]),
+        "page_wall_time": average([p["wall_time"] for s in sessions for p in s["pages"]]),
+        "page_load_ms": average([p["load_ms"] for s in sessions for p in s["pages"]]),
+        "rss_mb": average([s["rss_mb"] for s in sessions if s["rss_mb"] is not None]),
+    }
+
+def benchmark(fp_profile_path: str, urls: List[str], runs: int) -> dict:
+    """
+    Benchmarks the default and the lean browser mode, alternating between both.
+
+    Args:
+        fp_profile_path (str): Path to the Firefox profile
+        urls (List[str]): The pages to open
+        runs (int): Sessions per mode
+
+    Returns:
+        report (dict): The benchmark report
+    """
+    sessions = {"default": [], "lean": []}
+
+    for run in range(runs):
+        # Alternate, so network/cache effects hit both modes alike
+        for mode in ["default", "lean"]:
+            info(f" => Run {run + 1}/{runs}: {mode} browser...")
+            sessions[mode].append(benchmark_session(fp_profile_path, mode == "lean", urls))
+
+    summary = {mode: summarize(results) for mode, results in sessions.items()}
+
+    success(f" => Default: {summary['default']['page_wall_time']}s per page, {summary['default']['rss_mb']} MB")
+    success(f" => Lean: {summary['lean']['page_wall_time']}s per page, {summary['lean']['rss_mb']} MB")
+
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "machine": {
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "cpu_count": os.cpu_count(),
+            "headless": get_headless(),
+        },
+        "inputs": {
+            "urls": urls,
+            "runs": runs,
+        },
+        "summary": summary,
+        "sessions": sessions,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the default and the lean browser mode.")
+    parser.add_argument("--profile", default=None, help="Firefox profile to use, defaults to firefox_profile from the config")
+    parser.add_argument("--urls", default=",".join(DEFAULT_URLS), help="Comma separated pages to open")
+    parser.add_argument("--runs", type=int, default=3, help="Sessions per mode")
+    parser.add_argument("--output", help="File to write the JSON report to")
+    args = parser.parse_args()
+
+    fp_profile_path = args.profile or get_firefox_profile_path()
+    if not fp_profile_path:
+        error("No Firefox profile given. Pass --profile or set firefox_profile in the config.")
+        sys.exit(1)
+
+    report = benchmark(fp_profile_path, args.urls.split(","), args.runs)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=4)
+
+    print(json.dumps(report, indent=4))
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,14 @@
 import os
 import json
+import sqlite3
+import threading
 
 from typing import List
 from config import ROOT_DIR
 
+# SQLite connections of every thread, by database path
+_db_connections = threading.local()
+
 def get_cache_path() -> str:
     """
     Gets the path to the cache file.
@@ -175,6 +180,51 @@ def add_product(product: dict) -> None:
             "products": products
         }, file, indent=4)
     
+def get_drivers_cache_path() -> str:
+    """
+    Gets the path to the folder, that the resolved browser drivers are pinned in.
+
+    Returns:
+        path (str): The path to the drivers cache folder
+    """
+    return os.path.join(get_cache_path(), 'drivers')
+
+def get_render_queue_path() -> str:
+    """
+    Gets the path to the render queue file.
+
+    Returns:
+        path (str): The path to the render queue file
+    """
+    return os.path.join(get_cache_path(), 'render_queue.json')
+
+def get_upload_queue_path() -> str:
+    """
+    Gets the path to the upload queue file.
+
+    Returns:
+        path (str): The path to the upload queue file
+    """
+    return os.path.join(get_cache_path(), 'upload_queue.json')
+
+def get_jobs_path() -> str:
+    """
+    Gets the path to the folder, that the YouTube job records and their artifacts are stored in.
+
+    Returns:
+        path (str): The path to the jobs folder
+    """
+    return os.path.join(get_cache_path(), 'jobs')
+
+def get_rate_limit_db_path() -> str:
+    """
+    Gets the path to the database, that the rate limit buckets of all processes are stored in.
+
+    Returns:
+        path (str): The path to the rate limit database
+    """
+    return os.path.join(get_cache_path(), 'ratelimit.db')
+
 def get_results_cache_path() -> str:
     """
     Gets the path to the results cache file.
@@ -183,3 +233,107 @@ def get_results_cache_path() -> str:
         path (str): The path to the results cache folder
     """
     return os.path.join(get_cache_path(), 'scraper_results.csv')
+
+def get_schedule_path() -> str:
+    """
+    Gets the path to the file, that the scheduled jobs are stored in.
+
+    Returns:
+        path (str): The path to the schedule file
+    """
+    return os.path.join(get_cache_path(), 'schedule.json')
+
+def get_scheduled_jobs() -> List[dict]:
+    """
+    Gets the scheduled jobs from the cache.
+
+    Returns:
+        jobs (List[dict]): The scheduled jobs
+    """
+    if not os.path.exists(get_schedule_path()):
+        return []
+
+    with open(get_schedule_path(), 'r') as file:
+        return json.load(file)["jobs"]
+
+def set_scheduled_job(job: dict) -> None:
+    """
+    Schedules a job. Replaces the previous job of the same account and purpose.
+
+    Args:
+        job (dict): The job (`id`, `purpose`, `account_id` and `times`)
+
+    Returns:
+        None
+    """
+    jobs = [
+        j for j in get_scheduled_jobs()
+        if not (j["purpose"] == job["purpose"] and j["account_id"] == job["account_id"])
+    ]
+    jobs.append(job)
+
+    # Write atomically, the scheduler may read the file at any time
+    tmp_path = get_schedule_path() + ".tmp"
+    with open(tmp_path, 'w') as file:
+        json.dump({
+            "jobs": jobs
+        }, file, indent=4)
+    os.replace(tmp_path, get_schedule_path())
+
+def get_enriched_results_path() -> str:
+    """
+    Gets the path to the scraper results, enriched with the emails found on the websites.
+
+    Returns:
+        path (str): The path to the enriched results file
+    """
+    return os.path.join(get_cache_path(), 'scraper_results_enriched.csv')
+
+def get_crawl_cache_path() -> str:
+    """
+    Gets the path to the database, that the crawl results of business websites are cached in.
+
+    Returns:
+        path (str): The path to the crawl cache database
+    """
+    return os.path.join(get_cache_path(), 'crawl_cache.db')
+
+def get_scraper_cache_path() -> str:
+    """
+    Gets the path to the folder, that the Google Maps scraper builds are cached in.
+
+    Returns:
+        path (str): The path to the scraper build cache
+    """
+    return os.path.join(get_cache_path(), 'scraper')
+
+def get_outreach_db_path() -> str:
+    """
+    Gets the path to the database, that records which businesses were emailed.
+
+    Returns:
+        path (str): The path to the outreach database
+    """
+    return os.path.join(get_cache_path(), 'outreach.db')
+
+def get_db_connection(path: str) -> sqlite3.Connection:
+    """
+    Gets the connection of the current thread to a SQLite database, in WAL mode,
+    so that threads and processes can read while another one writes.
+
+    Args:
+        path (str): Path to the database
+
+    Returns:
+        connection (sqlite3.Connection): The connection
+    """
+    if not hasattr(_db_connections, "by_path"):
+        _db_connections.by_path = {}
+
+    if path not in _db_connections.by_path:
+        # isolation_level=None: every statement commits on its own
+        connection = sqlite3.connect(path, timeout=30, isolation_level=None)
+        connection.execute("PRAGMA journal_mode=WAL")
+        _db_connections.by_path[path] = connection
+
+    return _db_connections.by_path[path]
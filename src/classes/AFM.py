@@ -2,16 +2,16 @@ import g4f
 
 from status import *
 from config import *
+from browser import *
+from limits import limit
+from ratelimit import acquire_rate_limit
 from constants import *
 from .Twitter import Twitter
 from selenium_firefox import *
 from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.firefox.service import Service
-from selenium.webdriver.firefox.options import Options
-from webdriver_manager.firefox import GeckoDriverManager
 
-class AffiliateMarketing:
+class AffiliateMarketing(PooledBrowser):
     """
     This class will be used to handle all the affiliate marketing related operations.    
     """
@@ -31,22 +31,7 @@ class AffiliateMarketing:
         """
         self._fp_profile_path: str = fp_profile_path
 
-        # Initialize the Firefox profile
-        self.options: Options = Options()
-
-        # Set headless state of browser
-        if get_headless():
-            self.options.add_argument("--headless")
-
-        # Set the profile path
-        self.options.add_argument("-profile")
-        self.options.add_argument(fp_profile_path)
-        
-        # Set the service
-        self.service: Service = Service(GeckoDriverManager().install())
-
-        # Initialize the browser
-        self.browser: webdriver.Firefox = webdriver.Firefox(service=self.service, options=self.options)
+        self._browser = None
 
         # Set the affiliate link
         self.affiliate_link: str = affiliate_link
@@ -68,14 +53,18 @@ class AffiliateMarketing:
         This method will be used to scrape the product
         information from the affiliate link.
         """
-        # Open the affiliate link
-        self.browser.get(self.affiliate_link)
+        try:
+            # Open the affiliate link
+            self.browser.get(self.affiliate_link)
+
+            # Get the product name
+            product_title: str = wait_for_element(self.browser, By.ID, AMAZON_PRODUCT_TITLE_ID).text
 
-        # Get the product name
-        product_title: str = self.browser.find_element(By.ID, AMAZON_PRODUCT_TITLE_ID).text
-        
-        # Get the features of the product
-        features: any = self.browser.find_elements(By.ID, AMAZON_FEATURE_BULLETS_ID)
+            # Get the features of the product
+            features: any = [feature.text for feature in self.browser.find_elements(By.ID, AMAZON_FEATURE_BULLETS_ID)]
+        finally:
+            # Hand the browser back to the pool, Twitter reuses it to share the pitch
+            self.release_browser()
 
         if get_verbose():
             info(f"Product Title: {product_title}")
@@ -100,15 +89,18 @@ class AffiliateMarketing:
             response (str): The response for the user.
         """
         # Generate the response
-        response: str = g4f.ChatCompletion.create(
-            model=parse_model(get_model()),
-            messages=[
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ]
-        )
+        acquire_rate_limit("llm")
+
+        with limit("llm"):
+            response: str = g4f.ChatCompletion.create(
+                model=parse_model(get_model()),
+                messages=[
+                    {
+                        "role": "user",
+                        "content": prompt
+                    }
+                ]
+            )
 
         # Return the response
         return response
@@ -144,7 +136,7 @@ class AffiliateMarketing:
 
     def quit(self) -> None:
         """
-        This method will be used to quit the browser.
+        This method will be used to hand the browser back to the pool.
         """
-        # Quit the browser
-        self.browser.quit()
+        # Release the browser
+        self.release_browser()
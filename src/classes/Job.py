@@ -0,0 +1,286 @@
+import os
+import json
+import shutil
+
+from cache import *
+from typing import List
+from uuid import uuid4
+from datetime import datetime
+
+class Job:
+    """
+    Persisted record of one YouTube Short, from the topic to the upload.
+
+    The output of every stage is stored in `.mp/jobs/<id>.json` as soon as
+    the stage has finished, the artifacts (images, TTS, subtitles, video)
+    live in `.mp/jobs/<id>/`. A failed job can be resumed from its first
+    incomplete stage, instead of generating everything again.
+    """
+    # Stages of a YouTube Short, in order
+    STAGES = ["topic", "script", "metadata", "prompts", "images", "tts", "combine", "upload"]
+
+    # States of jobs, that are not resumed: uploaded, or deliberately not uploaded
+    FINAL_STATES = ["done", "rendered"]
+
+    def __init__(self, record: dict) -> None:
+        """
+        Initializes the Job. Use `Job.create` or `Job.load` instead.
+
+        Args:
+            record (dict): The job record
+
+        Returns:
+            None
+        """
+        self.record = record
+
+    @classmethod
+    def create(cls, account_id: str, profile: str = None) -> "Job":
+        """
+        Creates a new job and its artifact folder.
+
+        Args:
+            account_id (str): The YouTube account UUID
+            profile (str): The render profile
+
+        Returns:
+            job (Job): The job
+        """
+        job = cls({
+            "id": str(uuid4()),
+            "account_id": account_id,
+            "profile": profile,
+            "state": "running",
+            "created": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "stages": {},
+            "error": None
+        })
+
+        os.makedirs(job.work_dir, exist_ok=True)
+        job.save()
+
+        return job
+
+    @classmethod
+    def load(cls, job_id: str) -> "Job":
+        """
+        Loads a job.
+
+        Args:
+            job_id (str): The job ID
+
+        Returns:
+            job (Job): The job
+        """
+        with open(os.path.join(get_jobs_path(), f"{job_id}.json"), "r") as file:
+            return cls(json.load(file))
+
+    @property
+    def id(self) -> str:
+        """
+        Getter Method for the job ID.
+
+        Returns:
+            id (str): The job ID
+        """
+        return self.record["id"]
+
+    @property
+    def work_dir(self) -> str:
+        """
+        Getter Method for the folder, that the artifacts of the job are stored in.
+
+        Returns:
+            path (str): The artifact folder
+        """
+        return os.path.join(get_jobs_path(), self.id)
+
+    def save(self) -> None:
+        """
+        Writes the job record to disk (atomically).
+
+        Returns:
+            None
+        """
+        os.makedirs(get_jobs_path(), exist_ok=True)
+
+        path = os.path.join(get_jobs_path(), f"{self.id}.json")
+        tmp_path = path + ".tmp"
+
+        with open(tmp_path, "w") as file:
+            json.dump(self.record, file, indent=4)
+
+        os.replace(tmp_path, path)
+
+    def is_done(self, stage: str) -> bool:
+        """
+        Checks if a stage has finished.
+
+        Args:
+            stage (str): The stage
+
+        Returns:
+            done (bool): True if the stage has finished
+        """
+        return self.record["stages"].get(stage, {}).get("done", False)
+
+    def get_output(self, stage: str) -> any:
+        """
+        Gets the (possibly partial) output of a stage.
+
+        Args:
+            stage (str): The stage
+
+        Returns:
+            output (any): The output, or None if the stage hasn't started
+        """
+        return self.record["stages"].get(stage, {}).get("output")
+
+    def checkpoint(self, stage: str, output: any) -> None:
+        """
+        Stores the partial output of a running stage, e.g. the images generated so far.
+
+        Args:
+            stage (str): The stage
+            output (any): The partial output
+
+        Returns:
+            None
+        """
+        self.record["stages"].setdefault(stage, {})["output"] = output
+        self.save()
+
+    def complete(self, stage: str, output: any, duration: float) -> None:
+        """
+        Marks a stage as finished and stores its output.
+
+        Args:
+            stage (str): The stage
+            output (any): The output of the stage
+            duration (float): Seconds the stage took
+
+        Returns:
+            None
+        """
+        self.record["stages"][stage] = {
+            "done": True,
+            "output": output,
+            "duration": round(duration, 3),
+            "finished": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        }
+        self.record["state"] = "done" if self.get_next_stage() is None else "running"
+        self.record["error"] = None
+        self.save()
+
+    def reset(self, stage: str) -> None:
+        """
+        Marks a stage as not finished, so it runs again on resume (e.g. a re-render).
+
+        Args:
+            stage (str): The stage
+
+        Returns:
+            None
+        """
+        self.record["stages"].pop(stage, None)
+        self.record["state"] = "running"
+        self.save()
+
+    def skip_upload(self) -> None:
+        """
+        Marks a rendered job as deliberately not uploaded, so it isn't resumed
+        (and published) later. It can still be resumed explicitly by its ID.
+
+        Returns:
+            None
+        """
+        self.record["state"] = "rendered"
+        self.save()
+
+    def fail(self, stage: str, reason: str) -> None:
+        """
+        Marks the job as failed in a stage.
+
+        Args:
+            stage (str): The stage
+            reason (str): Why the stage failed
+
+        Returns:
+            None
+        """
+        self.record["state"] = "failed"
+        self.record["error"] = {"stage": stage, "reason": reason}
+        self.save()
+
+    def get_next_stage(self) -> str:
+        """
+        Gets the first stage, that hasn't finished yet.
+
+        Returns:
+            stage (str): The stage, or None if the job is done
+        """
+        return next((stage for stage in self.STAGES if not self.is_done(stage)), None)
+
+    def get_timings(self) -> dict:
+        """
+        Gets the duration of every finished stage.
+
+        Returns:
+            timings (dict): Seconds by stage
+        """
+        return {
+            stage: self.record["stages"][stage]["duration"]
+            for stage in self.STAGES if self.is_done(stage)
+        }
+
+    def remove_artifacts(self) -> None:
+        """
+        Deletes the artifact folder. The job record is kept.
+
+        Returns:
+            None
+        """
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def remove(self) -> None:
+        """
+        Deletes the job record and its artifacts, e.g. for a rejected draft.
+
+        Returns:
+            None
+        """
+        self.remove_artifacts()
+
+        path = os.path.join(get_jobs_path(), f"{self.id}.json")
+        if os.path.exists(path):
+            os.remove(path)
+
+def get_jobs(account_id: str = None, unfinished: bool = False) -> List[Job]:
+    """
+    Gets the stored jobs, oldest first.
+
+    Args:
+        account_id (str): Only jobs of this account
+        unfinished (bool): Only jobs, that can be resumed (not uploaded or deliberately not uploaded)
+
+    Returns:
+        jobs (List[Job]): The jobs
+    """
+    if not os.path.isdir(get_jobs_path()):
+        return []
+
+    jobs = []
+    for file in os.listdir(get_jobs_path()):
+        if not file.endswith(".json"):
+            continue
+
+        job = Job.load(file[:-len(".json")])
+
+        if account_id and job.record["account_id"] != account_id:
+            continue
+        if unfinished and job.record["state"] in Job.FINAL_STATES:
+            continue
+
+        jobs.append(job)
+
+    return sorted(jobs, key=lambda job: job.record["created"])
@@ -3,14 +3,23 @@ import io
 import re
 import csv
 import time
+import shutil
+import signal
+import smtplib
+import hashlib
+import itertools
 import zipfile
-import yagmail
 import requests
 import subprocess
 
 from cache import *
 from status import *
 from config import *
+from mailer import Mailer
+from leads import LeadIndex, FINAL_LEAD_STATES
+from crawler import Crawler, CrawlCache, GONE_STATUSES
+from typing import Iterable, Iterator, List, Tuple
+from concurrent.futures import ThreadPoolExecutor
 
 class Outreach:
     """
@@ -23,14 +32,26 @@ class Outreach:
         Returns:
             None
         """
-        # Check if go is installed
-        self.go_installed = os.system("go version") == 0
-
         # Set niche
         self.niche = get_google_maps_scraper_niche()
 
-        # Set email credentials
-        self.email_creds = get_email_credentials()
+        # Columns of the scraper results by name, known once the header has been read
+        self.columns = {}
+
+    def get_go_version(self) -> str:
+        """
+        Gets the version of the installed Go toolchain.
+
+        Returns:
+            version (str): The version, e.g. `go1.22.1`, or an empty string if go is not installed
+        """
+        if not hasattr(self, "_go_version"):
+            try:
+                self._go_version = subprocess.run(["go", "env", "GOVERSION"], capture_output=True, text=True, check=True).stdout.strip()
+            except (OSError, subprocess.CalledProcessError):
+                self._go_version = ""
+
+        return self._go_version
 
     def is_go_installed(self) -> bool:
         """
@@ -39,120 +60,405 @@ class Outreach:
         Returns:
             bool: True if go is installed, False otherwise.
         """
-        # Check if go is installed
-        try:
-            subprocess.call("go version", shell=True)
-            return True
-        except Exception as e:
-            return False
+        return self.get_go_version() != ""
+
+    def get_scraper_version(self) -> str:
+        """
+        Gets the version of the scraper, from its URL in the config.
+
+        Returns:
+            version (str): The version, e.g. `v0.9.7`
+        """
+        url = get_google_maps_scraper_zip_url()
+        match = re.search(r"v?\d+(\.\d+)+", url.rsplit("/", 1)[-1])
+
+        # Unversioned URLs are identified by their hash
+        return match.group(0) if match else hashlib.sha1(url.encode()).hexdigest()[:12]
+
+    def get_build_path(self) -> str:
+        """
+        Gets the folder of the scraper build, for the configured scraper version
+        and the installed Go toolchain. Another version of either means another build.
+
+        Returns:
+            path (str): The build folder
+        """
+        key = re.sub(r"[^A-Za-z0-9._-]", "_", f"{self.get_scraper_version()}-{self.get_go_version()}")
+
+        return os.path.join(get_scraper_cache_path(), key)
+
+    def get_source_path(self) -> str:
+        """
+        Gets the folder, that the source of the scraper is unzipped to.
+
+        Returns:
+            path (str): The source folder
+        """
+        return os.path.join(get_scraper_cache_path(), f"src-{self.get_scraper_version()}")
 
-    def unzip_file(self, zip_link: str) -> None:
+    def get_scraper_binary(self) -> str:
         """
-        Unzip the file.
+        Gets the absolute path to the built scraper.
+
+        Returns:
+            path (str): The path to the scraper binary
+        """
+        return os.path.join(self.get_build_path(), "google-maps-scraper.exe" if os.name == "nt" else "google-maps-scraper")
+
+    def is_scraper_built(self) -> bool:
+        """
+        Checks if the cached build of the scraper can be used.
+
+        Returns:
+            built (bool): True if the binary exists and is executable
+        """
+        binary = self.get_scraper_binary()
+
+        return os.path.isfile(binary) and os.path.getsize(binary) > 0 and os.access(binary, os.X_OK)
+
+    def unzip_file(self, zip_link: str) -> str:
+        """
+        Downloads the source of the scraper and unzips it, without holding the zip in memory.
 
         Args:
             zip_link (str): The link to the zip file.
 
         Returns:
-            None
+            path (str): The folder of the source (containing `go.mod`)
         """
-        # Check if the scraper is already unzipped, if not, unzip it
-        if os.path.exists("google-maps-scraper-0.9.7"):
+        source_path = self.get_source_path()
+        zip_path = source_path + ".zip"
+
+        if not os.path.isdir(source_path):
+            os.makedirs(get_scraper_cache_path(), exist_ok=True)
+
+            with requests.get(zip_link, stream=True, timeout=60) as r:
+                r.raise_for_status()
+                with open(zip_path, "wb") as file:
+                    for chunk in r.iter_content(1024 * 1024):
+                        file.write(chunk)
+
+            # Extract next to the final folder, so an interrupted run leaves no partial source
+            tmp_path = source_path + ".tmp"
+            shutil.rmtree(tmp_path, ignore_errors=True)
+
+            with zipfile.ZipFile(zip_path) as z:
+                z.extractall(tmp_path)
+
+            os.replace(tmp_path, source_path)
+            os.remove(zip_path)
+        else:
             info("=> Scraper already unzipped. Skipping unzip.")
-            return
 
-        r = requests.get(zip_link)
-        z = zipfile.ZipFile(io.BytesIO(r.content))
-        z.extractall()
+        # GitHub archives contain a single top-level folder
+        entries = os.listdir(source_path)
+        if len(entries) == 1 and os.path.isdir(os.path.join(source_path, entries[0])):
+            return os.path.join(source_path, entries[0])
+
+        return source_path
 
     def build_scraper(self) -> None:
         """
-        Build the scraper.
+        Build the scraper, unless the build cache has a binary for the
+        configured scraper version and the installed Go toolchain.
 
         Returns:
             None
         """
-        # Check if the scraper is already built, if not, build it
-        if os.path.exists("google-maps-scraper.exe"):
-            print(colored("=> Scraper already built. Skipping build.", "blue"))
+        binary = self.get_scraper_binary()
+
+        if self.is_scraper_built():
+            info("=> Scraper already built. Skipping build.")
             return
 
-        os.chdir("google-maps-scraper-0.9.7")
-        os.system("go mod download")
-        os.system("go build")
-        os.system("mv google-maps-scraper ../google-maps-scraper")
-        os.chdir("..")
+        source_path = self.unzip_file(get_google_maps_scraper_zip_url())
 
-    def run_scraper_with_args_for_30_seconds(self, args: str, timeout = 300) -> None:
+        info(" => Building scraper...")
+        os.makedirs(self.get_build_path(), exist_ok=True)
+
+        # Build next to the final binary, so a failed build is never used
+        tmp_binary = binary + ".tmp"
+        subprocess.run(["go", "build", "-o", tmp_binary, "."], cwd=source_path, check=True)
+        os.replace(tmp_binary, binary)
+
+        # The source is only needed to build
+        shutil.rmtree(self.get_source_path(), ignore_errors=True)
+
+        success("=> Scraper built.")
+
+    def run_scraper(self, args: List[str]) -> subprocess.Popen:
         """
-        Run the scraper with the specified arguments for 30 seconds.
+        Starts the scraper in its own process group, so it can be stopped with
+        everything it has started (e.g. its browser).
 
         Args:
-            args (str): The arguments to run the scraper with.
-            timeout (int): The time to run the scraper for.
+            args (List[str]): The arguments to run the scraper with.
 
         Returns:
-            None
+            process (subprocess.Popen): The scraper process
         """
-        # Run the scraper with the specified arguments
         info(" => Running scraper...")
-        command = "google-maps-scraper " + args
+
+        if os.name == "nt":
+            return subprocess.Popen([self.get_scraper_binary()] + args, creationflags=subprocess.CREATE_NEW_PROCESS_GROUP)
+
+        return subprocess.Popen([self.get_scraper_binary()] + args, start_new_session=True)
+
+    def stop_scraper(self, process: subprocess.Popen, grace: float = 5) -> None:
+        """
+        Stops the process group of the scraper, forcefully if it doesn't exit in time.
+
+        Args:
+            process (subprocess.Popen): The scraper process
+            grace (float): Seconds to wait, before the scraper is killed
+
+        Returns:
+            None
+        """
+        if process.poll() is not None:
+            return
+
         try:
-            scraper_process = subprocess.call(command.split(" "), shell=True, timeout=float(timeout))
+            if os.name == "nt":
+                process.send_signal(signal.CTRL_BREAK_EVENT)
+            else:
+                os.killpg(process.pid, signal.SIGTERM)
 
-            if scraper_process == 0:
-                subprocess.call("taskkill /f /im google-maps-scraper.exe", shell=True)
-                print(colored("=> Scraper finished successfully.", "green"))
+            process.wait(timeout=grace)
+        except subprocess.TimeoutExpired:
+            if os.name == "nt":
+                process.kill()
             else:
-                subprocess.call("taskkill /f /im google-maps-scraper.exe", shell=True)
-                print(colored("=> Scraper finished with an error.", "red"))
-            
-        except Exception as e:
-            subprocess.call("taskkill /f /im google-maps-scraper.exe", shell=True)
-            print(colored("An error occurred while running the scraper:", "red"))
-            print(str(e))
+                os.killpg(process.pid, signal.SIGKILL)
+
+            process.wait()
+        except ProcessLookupError:
+            pass
+
+    def tail_results(self, results_path: str, process: subprocess.Popen, timeout: float, interval: float = 0.5) -> Iterator[List[str]]:
+        """
+        Yields the CSV rows of the results file as the scraper writes them,
+        until the scraper exits. The scraper is stopped after `timeout` seconds.
+
+        Args:
+            results_path (str): The results file of the scraper
+            process (subprocess.Popen): The scraper process
+            timeout (float): Seconds the scraper may run
+            interval (float): Seconds between two checks for new rows
+
+        Returns:
+            rows (Iterator[List[str]]): The rows, starting with the header
+        """
+        deadline = time.time() + timeout
+        pending = ""
+
+        try:
+            while not os.path.exists(results_path):
+                if process.poll() is not None:
+                    return
+                if time.time() > deadline:
+                    warning(" => Scraper timed out before writing any results.")
+                    return
+                time.sleep(interval)
+
+            with open(results_path, "r", newline="", errors="ignore") as file:
+                while True:
+                    # Check before reading, so rows written right before the exit are read
+                    exited = process.poll() is not None
+                    chunk = file.read()
+
+                    if chunk:
+                        pending += chunk
+
+                        # Only parse complete lines, with no quoted field left open
+                        complete = pending[:pending.rfind("\n") + 1]
+                        if complete and complete.count('"') % 2 == 0:
+                            pending = pending[len(complete):]
+                            yield from csv.reader(io.StringIO(complete))
+                    elif exited:
+                        break
+                    elif time.time() > deadline:
+                        warning(" => Scraper timed out, stopping it...")
+                        self.stop_scraper(process)
+                    else:
+                        time.sleep(interval)
+        finally:
+            self.stop_scraper(process)
 
-    def get_items_from_file(self, file_name: str) -> list:
+        if process.returncode == 0:
+            success("=> Scraper finished successfully.")
+        else:
+            warning(f"=> Scraper exited with code {process.returncode}.")
+
+    def get_website(self, row: List[str]) -> str:
+        """
+        Gets the website of a scraped business.
+
+        Args:
+            row (List[str]): The CSV row of the business
+
+        Returns:
+            website (str): The website, or an empty string if it has none
+        """
+        if "website" in self.columns:
+            return row[self.columns["website"]] if len(row) > self.columns["website"] else ""
+
+        website = [field for field in row if field.startswith("http")]
+
+        return website[0] if len(website) > 0 else ""
+
+    def get_column(self, row: List[str], *names: str) -> str:
+        """
+        Gets the first non-empty of the given columns of a scraped business, by header name.
+
+        Args:
+            row (List[str]): The CSV row of the business
+            names (str): The column names, in order of preference
+
+        Returns:
+            value (str): The value, or an empty string if none of the columns has one
+        """
+        for name in names:
+            if name in self.columns and len(row) > self.columns[name] and row[self.columns[name]]:
+                return row[self.columns[name]]
+
+        return ""
+
+    def get_company_name(self, row: List[str]) -> str:
+        """
+        Gets the name of a scraped business.
+
+        Args:
+            row (List[str]): The CSV row of the business
+
+        Returns:
+            name (str): The `title` (or `name`) column, or the first column without a header
+        """
+        return self.get_column(row, "title", "name") or (row[0] if not self.columns and row else "")
+
+    def get_lead_key(self, leads: LeadIndex, row: List[str]) -> dict:
+        """
+        Gets the key of a scraped business in the lead index.
+
+        Args:
+            leads (LeadIndex): The lead index
+            row (List[str]): The CSV row of the business
+
+        Returns:
+            key (dict): The key of the business
         """
-        Read and return items from a file.
+        return leads.get_key(self.get_company_name(row), self.get_website(row), self.get_column(row, "place_id", "data_id", "cid"))
+
+    def filter_leads(self, rows: Iterable[List[str]], leads: LeadIndex) -> Iterator[List[str]]:
+        """
+        Removes the businesses, that an earlier run has finished (emailed,
+        rejected or bounced), before any website is crawled. New businesses
+        are added to the lead index.
 
         Args:
-            file_name (str): The name of the file to read from.
-
-        Returns:
-            list: The items from the file.
-        """
-        # Read and return items from a file
-        with open(file_name, "r", errors="ignore") as f:
-            items = f.readlines()
-            items = [item.strip() for item in items[1:]]
-            return items
-        
-    def set_email_for_website(self, index: int, website: str, output_file: str):
-        # Extract and set an email for a website
-        email = ""
-
-        r = requests.get(website)
-        if r.status_code == 200:
-            # Define a regular expression pattern to match email addresses
-            email_pattern = r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,7}\b"
-
-            # Find all email addresses in the HTML string
-            email_addresses = re.findall(email_pattern, r.text)
-
-            email = email_addresses[0] if len(email_addresses) > 0 else ""
-
-        if email:
-            print(f"=> Setting email {email} for website {website}")
-            with open(output_file, "r", newline="", errors="ignore") as csvfile:
-                csvreader = csv.reader(csvfile)
-                items = list(csvreader)
-                items[index].append(email)
-
-            with open(output_file, "w", newline="", errors="ignore") as csvfile:
-                csvwriter = csv.writer(csvfile)
-                csvwriter.writerows(items)
-        
+            rows (Iterable[List[str]]): The CSV rows of the scraper, starting with the header
+            leads (LeadIndex): The lead index
+
+        Returns:
+            rows (Iterator[List[str]]): The header and the rows, that still need work
+        """
+        rows = iter(rows)
+
+        header = next(rows, None)
+        if header is None:
+            return
+
+        self.columns = {name.strip().lower(): idx for idx, name in enumerate(header)}
+        yield header
+
+        skipped = 0
+        for row in rows:
+            key = self.get_lead_key(leads, row)
+            lead = leads.find(key)
+
+            if lead is not None and lead["state"] in FINAL_LEAD_STATES:
+                skipped += 1
+                continue
+
+            # Businesses without any identifier can't be found again, so they aren't tracked
+            if lead is None and leads.get_column(key):
+                leads.add(key)
+
+            yield row
+
+        if skipped:
+            info(f" => Skipped {skipped} businesses, that earlier runs have finished.")
+
+    def enrich_results(self, rows: Iterable[List[str]], enriched_path: str) -> Iterator[Tuple[List[str], dict]]:
+        """
+        Streams the scraped businesses, crawls their websites and writes every row
+        with an added `email` column to the enriched file, in one pass. Only a
+        window of rows is held in memory, regardless of the amount of businesses.
+
+        Args:
+            rows (Iterable[List[str]]): The CSV rows of the scraper, starting with the header
+            enriched_path (str): The file to write the enriched results to
+
+        Returns:
+            rows (Iterator[Tuple[List[str], dict]]): Every row with its crawl result
+        """
+        crawler = Crawler(cache=CrawlCache())
+        tmp_path = enriched_path + ".tmp"
+
+        with open(tmp_path, "w", newline="", errors="ignore") as dst:
+            reader = iter(rows)
+            writer = csv.writer(dst)
+
+            header = next(reader, None)
+            if header is not None:
+                writer.writerow(header + ["email"])
+
+            # One copy of the rows feeds the crawler, that runs a window ahead
+            rows, crawl_rows = itertools.tee(reader)
+            results = crawler.crawl(self.get_website(row) for row in crawl_rows)
+
+            for row, result in zip(rows, results):
+                email = result["emails"][0] if result["status"] == 200 and result["emails"] else ""
+                writer.writerow(row + [email])
+
+                yield row, result
+
+        os.replace(tmp_path, enriched_path)
+
+    def send_email(self, mailer: Mailer, leads: LeadIndex, lead_id: int, receiver_email: str, company_name: str) -> bool:
+        """
+        Sends the outreach email to a business and records it in the lead index.
+
+        Args:
+            mailer (Mailer): The mailer of the campaign
+            leads (LeadIndex): The lead index
+            lead_id (int): The ID of the lead
+            receiver_email (str): The email address of the business
+            company_name (str): The name of the business
+
+        Returns:
+            sent (bool): True if the email was sent
+        """
+        try:
+            info(f" => Sending email to {receiver_email}...")
+
+            sent = mailer.send(receiver_email, company_name)
+            leads.set_state(lead_id, "emailed", receiver_email)
+
+            if not sent:
+                info(f" => {receiver_email} was already emailed in campaign {mailer.campaign}. Skipping...")
+                return False
+
+            success(f" => Sent email to {receiver_email}")
+            return True
+        except smtplib.SMTPRecipientsRefused as err:
+            leads.set_state(lead_id, "bounced", receiver_email)
+            error(f" => {receiver_email} was refused: {err}...")
+            return False
+        except Exception as err:
+            error(f" => Error: {err}...")
+            return False
+
     def start(self) -> None:
         """
         Start the outreach process.
@@ -165,68 +471,77 @@ class Outreach:
             error("Go is not installed. Please install go and try again.")
             return
 
-        # Unzip the scraper
-        self.unzip_file(get_google_maps_scraper_zip_url())
-
-        # Build the scraper
+        # Build the scraper (or use the cached build)
         self.build_scraper()
 
+        # Templates are loaded once, SMTP connections are opened on demand and reused
+        mailer = Mailer()
+        leads = LeadIndex()
+
         # Write the niche to a file
         with open("niche.txt", "w") as f:
             f.write(self.niche)
 
         output_path = get_results_cache_path()
-        message_subject = get_outreach_message_subject()
-        message_body = get_outreach_message_body_file()
-
-        # Run
-        self.run_scraper_with_args_for_30_seconds(f"-input niche.txt -results \"{output_path}\"", timeout=get_scraper_timeout())
-
-        # Get the items from the file
-        items = self.get_items_from_file(output_path)
-        success(f" => Scraped {len(items)} items.")
 
-        # Remove the niche file
-        os.remove("niche.txt")
+        # Don't read the rows of an earlier run
+        if os.path.exists(output_path):
+            os.remove(output_path)
 
-        time.sleep(2)
+        process = None
+        scraped = 0
+        sends = []
 
-        # Create a yagmail SMTP client outside the loop
-        yag = yagmail.SMTP(user=self.email_creds["username"], password=self.email_creds["password"], host=self.email_creds["smtp_server"], port=self.email_creds["smtp_port"])
-
-        # Get the email for each business
-        for item in items:
-            try:
-                # Check if the item"s website is valid
-                website = item.split(",")
-                website = [w for w in website if w.startswith("http")]
-                website = website[0] if len(website) > 0 else ""
-                if website != "":
-                    test_r = requests.get(website)
-                    if test_r.status_code == 200:
-                        self.set_email_for_website(items.index(item), website, output_path)
-                        
-                        # Send emails using the existing SMTP connection
-                        receiver_email = item.split(",")[-1]
-
-                        if "@" not in receiver_email:
-                            warning(f" => No email provided. Skipping...")
-                            continue
-
-                        subject = message_subject.replace("{{COMPANY_NAME}}", item[0])
-                        body = open(message_body, "r").read().replace("{{COMPANY_NAME}}", item[0])
-
-                        info(f" => Sending email to {receiver_email}...")
-                        
-                        yag.send(
-                            to=receiver_email,
-                            subject=subject,
-                            contents=body,
-                        )
-
-                        success(f" => Sent email to {receiver_email}")
-                    else:
-                        warning(f" => Website {website} is invalid. Skipping...")
-            except Exception as err:
-                error(f" => Error: {err}...")
-                continue
\ No newline at end of file
+        try:
+            process = self.run_scraper(["-input", "niche.txt", "-results", output_path])
+            rows = self.filter_leads(self.tail_results(output_path, process, get_scraper_timeout()), leads)
+
+            # Crawl every website once and send emails, while the scraper is still running
+            with ThreadPoolExecutor(max_workers=mailer.connections) as executor:
+                for row, result in self.enrich_results(rows, get_enriched_results_path()):
+                    scraped += 1
+                    # Businesses without any identifier aren't tracked (set_state does nothing)
+                    lead = leads.find(self.get_lead_key(leads, row))
+                    lead_id = lead["id"] if lead is not None else None
+
+                    if not result["url"]:
+                        leads.set_state(lead_id, "no-email")
+                        continue
+
+                    if result["error"]:
+                        # e.g. a timeout, the next run tries again
+                        warning(f" => Website {result['url']} could not be reached. Skipping...")
+                        continue
+
+                    if result["status"] in GONE_STATUSES:
+                        leads.set_state(lead_id, "no-email")
+                        warning(f" => Website {result['url']} doesn't exist anymore. Skipping...")
+                        continue
+
+                    if result["status"] != 200:
+                        # e.g. blocked or a server error, the next run tries again
+                        warning(f" => Website {result['url']} returned status {result['status']}. Skipping...")
+                        continue
+
+                    if not result["emails"]:
+                        leads.set_state(lead_id, "no-email")
+                        warning(f" => No email provided. Skipping...")
+                        continue
+
+                    leads.set_state(lead_id, "crawled", result["emails"][0])
+                    sends.append(executor.submit(self.send_email, mailer, leads, lead_id, result["emails"][0], self.get_company_name(row)))
+        finally:
+            # Also if the run fails or is interrupted
+            if process is not None:
+                self.stop_scraper(process)
+
+            mailer.close()
+
+            # Remove the niche file
+            if os.path.exists("niche.txt"):
+                os.remove("niche.txt")
+
+        if get_verbose():
+            info(f" => Leads by state: {leads.get_counts()}")
+
+        success(f" => Processed {scraped} scraped items, sent {len([send for send in sends if send.result()])} emails.")
@@ -0,0 +1,260 @@
+import os
+import threading
+import numpy as np
+
+from config import *
+from typing import List
+from functools import lru_cache
+from collections import OrderedDict
+from moviepy.editor import ImageClip
+from PIL import Image, ImageDraw, ImageFont
+from moviepy.video.tools.subtitles import file_to_subtitles
+
+# Measured widths and wrapped layouts, that a rasterizer keeps at most
+MAX_CACHED_LAYOUTS = 4096
+
+def remember(cache: OrderedDict, key: str, value: any, maxsize: int = MAX_CACHED_LAYOUTS) -> any:
+    """
+    Stores a value in a LRU cache, dropping the least recently used entry when it is full.
+
+    Args:
+        cache (OrderedDict): The cache
+        key (str): The key
+        value (any): The value
+        maxsize (int): Maximum amount of entries
+
+    Returns:
+        value (any): The stored value
+    """
+    cache[key] = value
+    if len(cache) > maxsize:
+        cache.popitem(last=False)
+
+    return value
+
+@lru_cache(maxsize=None)
+def load_font(font_path: str, fontsize: int) -> ImageFont.FreeTypeFont:
+    """
+    Loads a TrueType font. Every font/size combination is only read from disk once.
+
+    Args:
+        font_path (str): Path to the .ttf file
+        fontsize (int): Size of the font
+
+    Returns:
+        font (ImageFont.FreeTypeFont): The loaded font
+    """
+    return ImageFont.truetype(font_path, fontsize)
+
+class SubtitleRasterizer:
+    """
+    Renders subtitles into tightly cropped RGBA images using Pillow,
+    instead of one full-frame ImageMagick TextClip per caption.
+
+    Styled like the previous captions: yellow text with a black stroke,
+    wrapped to the width of the video and centered.
+    """
+    def __init__(self, font_path: str, fontsize: int = 100, color: str = "#FFFF00", stroke_color: str = "black", stroke_width: int = 5, max_width: int = 1080) -> None:
+        """
+        Initializes the SubtitleRasterizer.
+
+        Args:
+            font_path (str): Path to the .ttf file
+            fontsize (int): Size of the font
+            color (str): Color of the text
+            stroke_color (str): Color of the stroke
+            stroke_width (int): Width of the stroke
+            max_width (int): Maximum width of a line, longer lines are wrapped
+
+        Returns:
+            None
+        """
+        self._font = load_font(font_path, fontsize)
+        self._color = color
+        self._stroke_color = stroke_color
+        self._stroke_width = stroke_width
+        self._max_width = max_width
+
+        ascent, descent = self._font.getmetrics()
+        self._line_height = ascent + descent + 2 * stroke_width
+
+        # Bounded, the rasterizer lives as long as the process and is shared by threads
+        self._widths = OrderedDict()
+        self._layouts = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _recall(self, cache: OrderedDict, key: str) -> any:
+        """
+        Gets a value from one of the LRU caches and marks it as recently used.
+
+        Args:
+            cache (OrderedDict): The cache
+            key (str): The key
+
+        Returns:
+            value (any): The value, or None if it isn't cached
+        """
+        with self._lock:
+            value = cache.get(key)
+            if value is not None:
+                cache.move_to_end(key)
+
+            return value
+
+    def _remember(self, cache: OrderedDict, key: str, value: any) -> any:
+        """
+        Stores a value in one of the LRU caches.
+
+        Args:
+            cache (OrderedDict): The cache
+            key (str): The key
+            value (any): The value
+
+        Returns:
+            value (any): The stored value
+        """
+        with self._lock:
+            return remember(cache, key, value)
+
+    def measure(self, text: str) -> int:
+        """
+        Measures the width of a piece of text, including the stroke.
+
+        Args:
+            text (str): The text to measure
+
+        Returns:
+            width (int): The width in pixels
+        """
+        width = self._recall(self._widths, text)
+        if width is not None:
+            return width
+
+        left, _, right, _ = self._font.getbbox(text, stroke_width=self._stroke_width)
+
+        return self._remember(self._widths, text, right - left)
+
+    def layout(self, text: str) -> List[str]:
+        """
+        Wraps a caption into lines, that fit into the maximum width.
+
+        Args:
+            text (str): The caption
+
+        Returns:
+            lines (List[str]): The wrapped lines
+        """
+        lines = self._recall(self._layouts, text)
+        if lines is not None:
+            return lines
+
+        lines = []
+        for paragraph in text.splitlines():
+            line = ""
+            for word in paragraph.split():
+                candidate = f"{line} {word}" if line else word
+                if line and self.measure(candidate) > self._max_width:
+                    lines.append(line)
+                    line = word
+                else:
+                    line = candidate
+            if line:
+                lines.append(line)
+
+        return self._remember(self._layouts, text, lines)
+
+    def render(self, text: str) -> Image.Image:
+        """
+        Renders a caption into an RGBA image, that is just big enough to fit the text.
+
+        Args:
+            text (str): The caption
+
+        Returns:
+            image (Image.Image): The rendered caption
+        """
+        lines = self.layout(text) or [" "]
+        width = max(self.measure(line) for line in lines)
+        height = self._line_height * len(lines)
+
+        image = Image.new("RGBA", (max(width, 1), max(height, 1)), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(image)
+
+        for i, line in enumerate(lines):
+            left, _, _, _ = self._font.getbbox(line, stroke_width=self._stroke_width)
+            x = (width - self.measure(line)) / 2 - left
+            y = i * self._line_height + self._stroke_width
+            draw.text(
+                (x, y),
+                line,
+                font=self._font,
+                fill=self._color,
+                stroke_width=self._stroke_width,
+                stroke_fill=self._stroke_color
+            )
+
+        return image
+
+    def make_clip(self, text: str, images: dict = None) -> ImageClip:
+        """
+        Renders a caption into a MoviePy ImageClip with a transparency mask.
+
+        Args:
+            text (str): The caption
+            images (dict): Captions rendered before, by text, that are reused
+
+        Returns:
+            clip (ImageClip): The caption clip
+        """
+        if images is None:
+            return ImageClip(np.array(self.render(text)), transparent=True)
+
+        if text not in images:
+            images[text] = np.array(self.render(text))
+
+        return ImageClip(images[text], transparent=True)
+
+    def make_clips(self, subtitles_path: str) -> List[ImageClip]:
+        """
+        Turns a SRT file into centered caption clips, each one starting and ending with its subtitle.
+
+        Args:
+            subtitles_path (str): Path to the SRT file
+
+        Returns:
+            clips (List[ImageClip]): The caption clips
+        """
+        clips = []
+
+        # Repeated captions are rendered once, but only for this video
+        images = {}
+
+        for (start, end), text in file_to_subtitles(subtitles_path):
+            clip = self.make_clip(text, images) \
+                .set_start(start) \
+                .set_end(end) \
+                .set_position(("center", "center"))
+            clips.append(clip)
+
+        return clips
+
+@lru_cache(maxsize=None)
+def get_subtitle_rasterizer(width: int = 1080) -> SubtitleRasterizer:
+    """
+    Gets the SubtitleRasterizer for the configured font, so that
+    measured and wrapped captions are shared between videos.
+
+    Args:
+        width (int): Width of the video, captions are scaled relative to 1080
+
+    Returns:
+        rasterizer (SubtitleRasterizer): The rasterizer
+    """
+    scale = width / 1080
+
+    return SubtitleRasterizer(
+        os.path.join(get_fonts_dir(), get_font()),
+        fontsize=round(100 * scale),
+        stroke_width=max(1, round(5 * scale)),
+        max_width=width
+    )
@@ -1,4 +1,5 @@
 import os
+import threading
 
 from config import ROOT_DIR
 from TTS.utils.manage import ModelManager
@@ -36,6 +37,9 @@ class TTS:
         voc_path, voc_config_path, _ = self._model_manager. \
             download_model("vocoder_models/en/ljspeech/univnet")
         
+        # The synthesizer can only be used by one thread at a time
+        self._lock = threading.Lock()
+
         # Initialize the Synthesizer
         self._synthesizer = Synthesizer(
             tts_checkpoint=self._model_path,
@@ -65,11 +69,12 @@ class TTS:
         Returns:
             str: The path to the output file.
         """
-        # Synthesize the text
-        outputs = self.synthesizer.tts(text)
+        with self._lock:
+            # Synthesize the text
+            outputs = self.synthesizer.tts(text)
 
-        # Save the synthesized speech to the output file
-        self.synthesizer.save_wav(outputs, output_file)
+            # Save the synthesized speech to the output file
+            self.synthesizer.save_wav(outputs, output_file)
 
         return output_file
     
@@ -1,10 +1,12 @@
 import re
 import g4f
-import sys
 import time
 
 from cache import *
 from config import *
+from browser import *
+from limits import limit
+from ratelimit import acquire_rate_limit
 from status import *
 from constants import *
 from typing import List
@@ -15,12 +17,9 @@ from selenium import webdriver
 from selenium.common import exceptions
 from selenium.webdriver.common import keys
 from selenium.webdriver.common.by import By
-from selenium.webdriver.firefox.service import Service
-from selenium.webdriver.firefox.options import Options
-from webdriver_manager.firefox import GeckoDriverManager
 
 
-class Twitter:
+class Twitter(PooledBrowser):
     """
     Class for the Bot, that grows a Twitter account.
     """
@@ -41,22 +40,8 @@ class Twitter:
         self.fp_profile_path: str = fp_profile_path
         self.topic: str = topic
 
-        # Initialize the Firefox profile
-        self.options: Options = Options()
-        
-        # Set headless state of browser
-        if get_headless():
-            self.options.add_argument("--headless")
-
-        # Set the profile path
-        self.options.add_argument("-profile")
-        self.options.add_argument(fp_profile_path)
-
-        # Set the service
-        self.service: Service = Service(GeckoDriverManager().install())
-
-        # Initialize the browser
-        self.browser: webdriver.Firefox = webdriver.Firefox(service=self.service, options=self.options)
+        self._fp_profile_path: str = fp_profile_path
+        self._browser = None
 
     def post(self, text: str = None) -> None:
         """
@@ -68,50 +53,111 @@ class Twitter:
         Returns:
             None
         """
-        bot: webdriver.Firefox = self.browser
-        verbose: bool = get_verbose()
+        try:
+            bot: webdriver.Firefox = self.browser
 
-        bot.get("https://twitter.com")
+            bot.get("https://twitter.com")
 
-        time.sleep(2)
+            self.send_post(text if text is not None else self.generate_post())
+        finally:
+            # Hand the browser back to the pool
+            self.release_browser()
 
-        post_content: str = self.generate_post()
-        now: datetime = datetime.now()
+        success("Posted to Twitter successfully!")
 
-        print(colored(f" => Posting to Twitter:", "blue"), post_content[:30] + "...")
+    def post_batch(self, texts: List[str] = None, count: int = None, spacing: float = None) -> dict:
+        """
+        Posts multiple tweets one after another in a single browser session.
+        A failed post doesn't stop the batch, unless the browser can't recover from it.
 
-        try:
-            bot.find_element(By.XPATH, "//a[@data-testid='SideNav_NewTweet_Button']").click()
-        except exceptions.NoSuchElementException:
-            time.sleep(3)
-            bot.find_element(By.XPATH, "//a[@data-testid='SideNav_NewTweet_Button']").click()
+        Args:
+            texts (List[str]): The texts to post
+            count (int): Amount of posts to generate, if no texts are given
+            spacing (float): Seconds between two posts, defaults to `twitter_post_spacing` from the config
+
+        Returns:
+            report (dict): The `posted` (`index`, `text`) and the `failed` (`index`, `text`, `error`) posts
+        """
+        if texts is None:
+            texts = [None] * (count or 1)
+        if spacing is None:
+            spacing = get_twitter_post_spacing()
 
-        time.sleep(2) 
-        body = post_content if text is None else text
+        report = {"posted": [], "failed": []}
 
         try:
-            bot.find_element(By.XPATH, "//div[@role='textbox']").send_keys(body)
-        except exceptions.NoSuchElementException:
-            time.sleep(2)
-            bot.find_element(By.XPATH, "//div[@role='textbox']").send_keys(body)
+            bot: webdriver.Firefox = self.browser
+
+            bot.get("https://twitter.com")
+
+            for idx, text in enumerate(texts):
+                if idx > 0:
+                    time.sleep(spacing)
+
+                try:
+                    body = text if text is not None else self.generate_post()
+                    self.send_post(body)
+                    report["posted"].append({"index": idx, "text": body})
+                except Exception as e:
+                    error(f" => Failed to post {idx + 1}/{len(texts)}: {str(e)}")
+                    report["failed"].append({"index": idx, "text": text, "error": str(e)})
+
+                    # Start over from a clean page, e.g. if the compose dialog is still open
+                    try:
+                        bot.get("https://twitter.com")
+                    except Exception as e:
+                        # The browser is gone, the remaining posts can't be posted either
+                        error(f" => Failed to recover the browser: {str(e)}")
+                        for rest_idx in range(idx + 1, len(texts)):
+                            report["failed"].append({"index": rest_idx, "text": texts[rest_idx], "error": str(e)})
+                        break
+        finally:
+            # Hand the browser back to the pool
+            self.release_browser()
+
+        if report["failed"]:
+            warning(f"Posted {len(report['posted'])}/{len(texts)} posts to Twitter, {len(report['failed'])} failed.")
+        else:
+            success(f"Posted {len(report['posted'])} posts to Twitter successfully!")
+
+        return report
+
+    def send_post(self, body: str) -> None:
+        """
+        Posts a text on the current Twitter page and adds it to the cache.
+
+        Args:
+            body (str): The text to post
+
+        Returns:
+            None
+        """
+        acquire_rate_limit("twitter_post", self.account_uuid)
+
+        bot: webdriver.Firefox = self.browser
+        now: datetime = datetime.now()
+
+        print(colored(f" => Posting to Twitter:", "blue"), body[:30] + "...")
+
+        click(bot, By.XPATH, TWITTER_NEW_TWEET_BUTTON_XPATH)
+
+        wait_for_clickable(bot, By.XPATH, TWITTER_TEXTBOX_XPATH).send_keys(body)
 
-        time.sleep(1)
         bot.find_element(By.CLASS_NAME, "notranslate").send_keys(keys.Keys.ENTER)
-        bot.find_element(By.XPATH, "//div[@data-testid='tweetButton']").click()
+        click(bot, By.XPATH, TWITTER_TWEET_BUTTON_XPATH)
 
-        if verbose:
+        if get_verbose():
             print(colored(" => Pressed [ENTER] Button on Twitter..", "blue"))
-        time.sleep(4)
+
+        # The compose dialog closes, once the post has been sent
+        wait_for_invisible(bot, By.XPATH, TWITTER_TEXTBOX_XPATH)
 
         # Add the post to the cache
         self.add_post({
-            "content": post_content,
+            "content": body,
             "date": now.strftime("%m/%d/%Y, %H:%M:%S")
         })
 
-        success("Posted to Twitter successfully!")
-
-
     def get_posts(self) -> List[dict]:
         """
         Gets the posts from the cache.
@@ -175,22 +221,24 @@ class Twitter:
         Returns:
             post (str): The post
         """
-        completion = g4f.ChatCompletion.create(
-            model=parse_model(get_model()),
-            messages=[
-                {
-                    "role": "user",
-                    "content": f"Generate a Twitter post about: {self.topic} in {get_twitter_language()}. The Limit is 2 sentences. Choose a specific sub-topic of the provided topic."
-                }
-            ]
-        )
+        acquire_rate_limit("llm", self.account_uuid)
+
+        with limit("llm"):
+            completion = g4f.ChatCompletion.create(
+                model=parse_model(get_model()),
+                messages=[
+                    {
+                        "role": "user",
+                        "content": f"Generate a Twitter post about: {self.topic} in {get_twitter_language()}. The Limit is 2 sentences. Choose a specific sub-topic of the provided topic."
+                    }
+                ]
+            )
 
         if get_verbose():
             info("Generating a post...")
 
         if completion is None:
-            error("Failed to generate a post. Please try again.")
-            sys.exit(1)
+            raise RuntimeError("Failed to generate a post. Please try again.")
 
         # Apply Regex to remove all *
         completion = re.sub(r"\*", "", completion).replace("\"", "")
@@ -7,7 +7,13 @@ import assemblyai as aai
 
 from utils import *
 from cache import *
+from render import *
+from browser import *
+from limits import limit
+from ratelimit import acquire_rate_limit
 from .Tts import TTS
+from .Job import Job
+from .Subtitles import get_subtitle_rasterizer
 from config import *
 from status import *
 from uuid import uuid4
@@ -18,18 +24,10 @@ from termcolor import colored
 from selenium_firefox import *
 from selenium import webdriver
 from moviepy.video.fx.all import crop
-from moviepy.config import change_settings
 from selenium.webdriver.common.by import By
-from selenium.webdriver.firefox.service import Service
-from selenium.webdriver.firefox.options import Options
-from moviepy.video.tools.subtitles import SubtitlesClip
-from webdriver_manager.firefox import GeckoDriverManager
 from datetime import datetime
 
-# Set ImageMagick Path
-change_settings({"IMAGEMAGICK_BINARY": get_imagemagick_path()})
-
-class YouTube:
+class YouTube(PooledBrowser):
     """
     Class for YouTube Automation.
 
@@ -64,23 +62,14 @@ class YouTube:
         self._language: str = language
 
         self.images = []
+        self.song_path = None
+        self.subtitles_path = None
 
-        # Initialize the Firefox profile
-        self.options: Options = Options()
-        
-        # Set headless state of browser
-        if get_headless():
-            self.options.add_argument("--headless")
-
-        # Set the profile path
-        self.options.add_argument("-profile")
-        self.options.add_argument(fp_profile_path)
+        # Job record of the current video (see generate_video)
+        self.job = None
+        self.work_dir = None
 
-        # Set the service
-        self.service: Service = Service(GeckoDriverManager().install())
-
-        # Initialize the browser
-        self.browser: webdriver.Firefox = webdriver.Firefox(service=self.service, options=self.options)
+        self._browser = None
 
     @property
     def niche(self) -> str:
@@ -102,6 +91,20 @@ class YouTube:
         """
         return self._language
     
+    def get_artifact_path(self, extension: str) -> str:
+        """
+        Gets a new path for a generated file, in the folder of the current job.
+
+        Args:
+            extension (str): The file extension, e.g. `.png`
+
+        Returns:
+            path (str): The path
+        """
+        work_dir = getattr(self, "work_dir", None) or os.path.join(ROOT_DIR, ".mp")
+
+        return os.path.join(work_dir, str(uuid4()) + extension)
+
     def generate_response(self, prompt: str, model: any = None) -> str:
         """
         Generates an LLM Response based on a prompt and the user-provided model.
@@ -112,19 +115,11 @@ class YouTube:
         Returns:
             response (str): The generated AI Repsonse.
         """
-        if not model:
-            return g4f.ChatCompletion.create(
-                model=parse_model(get_model()),
-                messages=[
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ]
-            )
-        else:
+        acquire_rate_limit("llm", self._account_uuid)
+
+        with limit("llm"):
             return g4f.ChatCompletion.create(
-                model=model,
+                model=model or parse_model(get_model()),
                 messages=[
                     {
                         "role": "user",
@@ -304,8 +299,11 @@ class YouTube:
         while ok == False:
             url = f"https://hercai.onrender.com/{get_image_model()}/text2image?prompt={prompt}"
 
-            r = requests.get(url)
-            parsed = r.json()
+            acquire_rate_limit("images", self._account_uuid)
+
+            with limit("images"):
+                r = requests.get(url)
+                parsed = r.json()
 
             if "url" not in parsed or not parsed.get("url"):
                 # Retry
@@ -319,7 +317,7 @@ class YouTube:
                 if get_verbose():
                     info(f" => Generated Image: {image_url}")
 
-                image_path = os.path.join(ROOT_DIR, ".mp", str(uuid4()) + ".png")
+                image_path = self.get_artifact_path(".png")
                 
                 with open(image_path, "wb") as image_file:
                     # Write bytes to file
@@ -344,7 +342,7 @@ class YouTube:
         Returns:
             path_to_wav (str): Path to generated audio (WAV Format).
         """
-        path = os.path.join(ROOT_DIR, ".mp", str(uuid4()) + ".wav")
+        path = self.get_artifact_path(".wav")
 
         # Clean script, remove every character that is not a word character, a space, a period, a question mark, or an exclamation mark.
         self.script = re.sub(r'[^\w\s.?!]', '', self.script)
@@ -403,37 +401,101 @@ class YouTube:
         transcript = transcriber.transcribe(audio_path)
         subtitles = transcript.export_subtitles_srt()
 
-        srt_path = os.path.join(ROOT_DIR, ".mp", str(uuid4()) + ".srt")
+        srt_path = self.get_artifact_path(".srt")
 
         with open(srt_path, "w") as file:
             file.write(subtitles)
 
         return srt_path
 
-    def combine(self) -> str:
+    def combine(self, profile: str = None, backend: str = None) -> str:
         """
         Combines everything into the final video.
 
+        The song and subtitles are kept, so that the same video
+        can be rendered again with another profile.
+
+        Args:
+            profile (str): The render profile to use, defaults to the configured profile.
+            backend (str): The render backend to use, defaults to the configured backend.
+
         Returns:
             path (str): The path to the generated MP4 File.
         """
-        combined_image_path = os.path.join(ROOT_DIR, ".mp", str(uuid4()) + ".mp4")
+        combined_image_path = self.get_artifact_path(".mp4")
         threads = get_threads()
+
+        # Only opened for the duration, closing it stops its ffmpeg reader
+        with AudioFileClip(self.tts_path) as tts_clip:
+            max_duration = tts_clip.duration
+
+        render_profile = get_render_profile_settings(profile)
+
+        if not self.song_path:
+            self.song_path = choose_random_song()
+
+        if not self.subtitles_path:
+            self.subtitles_path = self.generate_subtitles(self.tts_path)
+
+            # Equalize srt file
+            equalize_subtitles(self.subtitles_path, 10)
+
+        random_song = self.song_path
+        subtitles_path = self.subtitles_path
+
+        self.render_profile = render_profile["name"]
+
+        if get_verbose():
+            info(f" => Rendering with profile: {self.render_profile}")
+
+        backend = backend or get_render_backend()
+
+        if backend in RENDER_BACKENDS:
+            try:
+                with limit("renders"):
+                    RENDER_BACKENDS[backend](self.images, self.tts_path, random_song, subtitles_path, max_duration, combined_image_path, threads, render_profile)
+
+                self.render_backend = backend
+                self.video_path = os.path.abspath(combined_image_path)
+
+                success(f"Wrote Video to \"{combined_image_path}\"")
+
+                return combined_image_path
+            except Exception as e:
+                warning(f"{backend} backend failed, falling back to MoviePy: {str(e)}")
+
+        self.render_backend = "moviepy"
+
         tts_clip = AudioFileClip(self.tts_path)
+
+        try:
+            with limit("renders"):
+                path = self.combine_with_moviepy(tts_clip, random_song, subtitles_path, combined_image_path, threads, render_profile)
+        finally:
+            tts_clip.close()
+
+        self.video_path = os.path.abspath(path)
+
+        return path
+
+    def combine_with_moviepy(self, tts_clip: AudioFileClip, random_song: str, subtitles_path: str, combined_image_path: str, threads: int, render_profile: dict) -> str:
+        """
+        Combines everything into the final video, composing every frame with MoviePy.
+
+        Args:
+            tts_clip (AudioFileClip): The TTS
+            random_song (str): Path to the background song
+            subtitles_path (str): Path to the SRT file
+            combined_image_path (str): Path to write the MP4 to
+            threads (int): Amount of threads to write the file with
+            render_profile (dict): The render profile
+
+        Returns:
+            path (str): The path to the generated MP4 File.
+        """
         max_duration = tts_clip.duration
         req_dur = max_duration / len(self.images)
-
-        # Make a generator that returns a TextClip when called with consecutive
-        generator = lambda txt: TextClip(
-            txt,
-            font=os.path.join(get_fonts_dir(), get_font()),
-            fontsize=100,
-            color="#FFFF00",
-            stroke_color="black",
-            stroke_width=5,
-            size=(1080, 1920),
-            method="caption",
-        )
+        size = (render_profile["width"], render_profile["height"])
 
         print(colored("[+] Combining images...", "blue"))
 
@@ -450,17 +512,17 @@ class YouTube:
                 # so we need to resize them
                 if round((clip.w/clip.h), 4) < 0.5625:
                     if get_verbose():
-                        info(f" => Resizing Image: {image_path} to 1080x1920")
+                        info(f" => Resizing Image: {image_path} to {size[0]}x{size[1]}")
                     clip = crop(clip, width=clip.w, height=round(clip.w/0.5625), \
                                 x_center=clip.w / 2, \
                                 y_center=clip.h / 2)
                 else:
                     if get_verbose():
-                        info(f" => Resizing Image: {image_path} to 1920x1080")
+                        info(f" => Resizing Image: {image_path} to {size[0]}x{size[1]}")
                     clip = crop(clip, width=round(0.5625*clip.h), height=clip.h, \
                                 x_center=clip.w / 2, \
                                 y_center=clip.h / 2)
-                clip = clip.resize((1080, 1920))
+                clip = clip.resize(size)
 
                 # FX (Fade In)
                 #clip = clip.fadein(2)
@@ -470,17 +532,10 @@ class YouTube:
 
         final_clip = concatenate_videoclips(clips)
         final_clip = final_clip.set_fps(30)
-        random_song = choose_random_song()
-        
-        subtitles_path = self.generate_subtitles(self.tts_path)
 
-        # Equalize srt file
-        equalize_subtitles(subtitles_path, 10)
-        
-        # Burn the subtitles into the video
-        subtitles = SubtitlesClip(subtitles_path, generator)
+        # Render the subtitles into centered captions
+        subtitles = get_subtitle_rasterizer(size[0]).make_clips(subtitles_path)
 
-        subtitles.set_pos(("center", "center"))
         random_song_clip = AudioFileClip(random_song).set_fps(44100)
 
         # Turn down volume
@@ -493,54 +548,222 @@ class YouTube:
         final_clip = final_clip.set_audio(comp_audio)
         final_clip = final_clip.set_duration(tts_clip.duration)
 
-        # Add subtitles
+        # Burn the subtitles into the video
         final_clip = CompositeVideoClip([
             final_clip,
-            subtitles
+            *subtitles
         ])
 
-        final_clip.write_videofile(combined_image_path, threads=threads)
+        final_clip.write_videofile(combined_image_path, threads=threads, **build_moviepy_args(render_profile))
 
         success(f"Wrote Video to \"{combined_image_path}\"")
 
         return combined_image_path
 
-    def generate_video(self, tts_instance: TTS) -> str:
+    def generate_video(self, tts_instance: TTS, profile: str = None, job_id: str = None) -> str:
         """
         Generates a YouTube Short based on the provided niche and language.
 
+        Every stage is checkpointed in a job record, so a failed run can be
+        continued with `job_id` from its first incomplete stage.
+
         Args:
             tts_instance (TTS): Instance of TTS Class.
+            profile (str): The render profile to use, defaults to the configured profile.
+            job_id (str): ID of a job to resume, starts a new job if None.
 
         Returns:
             path (str): The path to the generated MP4 File.
         """
-        # Generate the Topic
-        self.generate_topic()
+        # Start with a clean slate
+        self.images = []
+        self.song_path = None
+        self.subtitles_path = None
+
+        if job_id:
+            self.load_job(job_id)
+            profile = profile or self.job.record["profile"]
+        else:
+            self.job = Job.create(self._account_uuid, profile)
+            self.work_dir = self.job.work_dir
+
+        stages = [
+            # Generate the Topic
+            ("topic", self.generate_topic),
+            # Generate the Script
+            ("script", self.generate_script),
+            # Generate the Metadata
+            ("metadata", self.generate_metadata),
+            # Generate the Image Prompts
+            ("prompts", self.generate_prompts),
+            # Generate the Images
+            ("images", self.generate_images),
+            # Generate the TTS
+            ("tts", lambda: self.generate_script_to_speech(tts_instance)),
+            # Combine everything
+            ("combine", lambda: self.combine(profile))
+        ]
+
+        for stage, run in stages:
+            self.run_stage(stage, run)
+
+        path = self.video_path
+
+        if get_verbose():
+            info(f" => Generated Video: {path}")
+            info(f" => Stage timings: {self.job.get_timings()}")
+
+        return path
+
+    def load_job(self, job_id: str) -> Job:
+        """
+        Loads a job and restores the output of its finished stages.
+
+        Args:
+            job_id (str): The job ID
+
+        Returns:
+            job (Job): The job
+        """
+        self.job = Job.load(job_id)
+        self.work_dir = self.job.work_dir
+        os.makedirs(self.work_dir, exist_ok=True)
 
-        # Generate the Script
-        self.generate_script()
+        for stage in Job.STAGES:
+            if self.job.is_done(stage):
+                self.restore_stage(stage, self.job.get_output(stage))
 
-        # Generate the Metadata
-        self.generate_metadata()
+        return self.job
 
-        # Generate the Image Prompts
-        self.generate_prompts()
+    def run_stage(self, stage: str, run: callable) -> None:
+        """
+        Runs a stage of the current job, or restores its output if it has already finished.
 
-        # Generate the Images
-        for prompt in self.image_prompts:
+        Args:
+            stage (str): The stage
+            run (callable): Runs the stage
+
+        Returns:
+            None
+        """
+        if self.job.is_done(stage):
+            self.restore_stage(stage, self.job.get_output(stage))
+
+            if get_verbose():
+                info(f" => Skipping finished stage: {stage}")
+            return
+
+        start = time.perf_counter()
+
+        try:
+            run()
+        except (Exception, SystemExit) as e:
+            self.job.fail(stage, str(e))
+            raise
+
+        self.job.complete(stage, self.get_stage_output(stage), time.perf_counter() - start)
+
+    def get_stage_output(self, stage: str) -> any:
+        """
+        Gets the output of a stage, that is stored in the job record.
+
+        Args:
+            stage (str): The stage
+
+        Returns:
+            output (any): The output
+        """
+        if stage == "topic":
+            return self.subject
+        elif stage == "script":
+            return self.script
+        elif stage == "metadata":
+            return self.metadata
+        elif stage == "prompts":
+            return self.image_prompts
+        elif stage == "images":
+            return self.images
+        elif stage == "tts":
+            return {"tts_path": self.tts_path, "script": self.script}
+        elif stage == "combine":
+            return {
+                "video_path": self.video_path,
+                "song_path": self.song_path,
+                "subtitles_path": self.subtitles_path,
+                "render_profile": self.render_profile,
+                "render_backend": self.render_backend
+            }
+        elif stage == "upload":
+            return {"url": self.uploaded_video_url}
+
+    def restore_stage(self, stage: str, output: any) -> None:
+        """
+        Restores the state of a finished stage from the job record.
+
+        Args:
+            stage (str): The stage
+            output (any): The stored output
+
+        Returns:
+            None
+        """
+        if stage == "topic":
+            self.subject = output
+        elif stage == "script":
+            self.script = output
+        elif stage == "metadata":
+            self.metadata = output
+        elif stage == "prompts":
+            self.image_prompts = output
+        elif stage == "images":
+            self.images = output
+        elif stage == "tts":
+            self.tts_path = output["tts_path"]
+            self.script = output["script"]
+        elif stage == "combine":
+            self.video_path = output["video_path"]
+            self.song_path = output["song_path"]
+            self.subtitles_path = output["subtitles_path"]
+            self.render_profile = output["render_profile"]
+            self.render_backend = output["render_backend"]
+        elif stage == "upload":
+            self.uploaded_video_url = output["url"]
+
+    def generate_images(self) -> List[str]:
+        """
+        Generates an image for every image prompt. Every image is checkpointed,
+        so a resumed job only generates the missing ones.
+
+        Returns:
+            paths (List[str]): The paths to the generated images.
+        """
+        self.images = [path for path in (self.job.get_output("images") or []) if os.path.exists(path)]
+
+        for prompt in self.image_prompts[len(self.images):]:
             self.generate_image(prompt)
+            self.job.checkpoint("images", self.images)
 
-        # Generate the TTS
-        self.generate_script_to_speech(tts_instance)
+        return self.images
 
-        # Combine everything
-        path = self.combine()
+    def promote_draft(self, profile: str = "publish") -> str:
+        """
+        Renders the last generated video again with another profile
+        (e.g. after a draft has been approved). Reuses the images, TTS,
+        subtitles and song, so nothing has to be generated again.
 
-        if get_verbose():
-            info(f" => Generated Video: {path}")
+        Args:
+            profile (str): The render profile to promote to.
 
-        self.video_path = os.path.abspath(path)
+        Returns:
+            path (str): The path to the generated MP4 File.
+        """
+        self.job.reset("combine")
+        self.run_stage("combine", lambda: self.combine(profile))
+
+        path = self.video_path
+
+        if get_verbose():
+            info(f" => Promoted Video to {profile}: {path}")
 
         return path
     
@@ -548,14 +771,25 @@ class YouTube:
         """
         Gets the Channel ID of the YouTube Account.
 
+        The browser is handed back to the pool afterwards, unless the
+        caller already held it (e.g. `upload_video`).
+
         Returns:
             channel_id (str): The Channel ID.
         """
-        driver = self.browser
-        driver.get("https://studio.youtube.com")
-        time.sleep(2)
-        channel_id = driver.current_url.split("/")[-1]
-        self.channel_id = channel_id
+        leased = self._browser is None
+
+        try:
+            driver = self.browser
+            driver.get("https://studio.youtube.com")
+
+            # Studio redirects to /channel/<id>
+            wait_for_url_contains(driver, "/channel/")
+            channel_id = driver.current_url.split("/channel/")[-1].split("/")[0]
+            self.channel_id = channel_id
+        finally:
+            if leased:
+                self.release_browser()
 
         return channel_id
 
@@ -566,27 +800,26 @@ class YouTube:
         Returns:
             success (bool): Whether the upload was successful or not.
         """
+        start = time.perf_counter()
+
         try:
-            self.get_channel_id()
+            acquire_rate_limit("youtube_upload", self._account_uuid)
 
+            # Hold the browser, so it's kept for the upload after getting the channel ID
             driver = self.browser
             verbose = get_verbose()
 
+            self.get_channel_id()
+
             # Go to youtube.com/upload
             driver.get("https://www.youtube.com/upload")
 
             # Set video file
-            FILE_PICKER_TAG = "ytcp-uploads-file-picker"
-            file_picker = driver.find_element(By.TAG_NAME, FILE_PICKER_TAG)
-            INPUT_TAG = "input"
-            file_input = file_picker.find_element(By.TAG_NAME, INPUT_TAG)
+            file_input = wait_for_element(driver, By.XPATH, YOUTUBE_FILE_PICKER_INPUT_XPATH)
             file_input.send_keys(self.video_path)
 
-            # Wait for upload to finish
-            time.sleep(5)
-
-            # Set title
-            textboxes = driver.find_elements(By.ID, YOUTUBE_TEXTBOX_ID)
+            # Wait for the details dialog
+            textboxes = wait_for_elements(driver, By.ID, YOUTUBE_TEXTBOX_ID, min_count=2)
 
             title_el = textboxes[0]
             description_el = textboxes[-1]
@@ -594,8 +827,7 @@ class YouTube:
             if verbose:
                 info("\t=> Setting title...")
 
-            title_el.click()
-            time.sleep(1)
+            click_element(driver, title_el, "title textbox")
             title_el.clear()
             title_el.send_keys(self.metadata["title"])
 
@@ -603,66 +835,46 @@ class YouTube:
                 info("\t=> Setting description...")
 
             # Set description
-            time.sleep(10)
-            description_el.click()
-            time.sleep(0.5)
+            click_element(driver, description_el, "description textbox")
             description_el.clear()
             description_el.send_keys(self.metadata["description"])
 
-            time.sleep(0.5)
-
             # Set `made for kids` option
             if verbose:
                 info("\t=> Setting `made for kids` option...")
 
-            is_for_kids_checkbox = driver.find_element(By.NAME, YOUTUBE_MADE_FOR_KIDS_NAME)
-            is_not_for_kids_checkbox = driver.find_element(By.NAME, YOUTUBE_NOT_MADE_FOR_KIDS_NAME)
-
             if not get_is_for_kids():
-                is_not_for_kids_checkbox.click()
+                click(driver, By.NAME, YOUTUBE_NOT_MADE_FOR_KIDS_NAME)
             else:
-                is_for_kids_checkbox.click()
+                click(driver, By.NAME, YOUTUBE_MADE_FOR_KIDS_NAME)
 
-            time.sleep(0.5)
+            # Click next (Details -> Video elements -> Checks -> Visibility),
+            # the button stays the same, so wait for each step to be shown
+            for step in YOUTUBE_WIZARD_STEP_TAGS:
+                if verbose:
+                    info("\t=> Clicking next...")
+                click(driver, By.ID, YOUTUBE_NEXT_BUTTON_ID)
+                wait_for_visible(driver, By.TAG_NAME, step)
 
-            # Click next
+            # Set as unlisted
             if verbose:
-                info("\t=> Clicking next...")
+                info("\t=> Setting as unlisted...")
 
-            next_button = driver.find_element(By.ID, YOUTUBE_NEXT_BUTTON_ID)
-            next_button.click()
+            radio_button = wait_for_elements(driver, By.XPATH, YOUTUBE_RADIO_BUTTON_XPATH, min_count=3)
+            click_element(driver, radio_button[2], "unlisted radio button")
 
-            # Click next again
+            # Wait for upload to finish
             if verbose:
-                info("\t=> Clicking next again...")
-            next_button = driver.find_element(By.ID, YOUTUBE_NEXT_BUTTON_ID)
-            next_button.click()
-
-            # Wait for 2 seconds
-            time.sleep(2)
+                info("\t=> Waiting for upload to finish...")
 
-            # Click next again
-            if verbose:
-                info("\t=> Clicking next again...")
-            next_button = driver.find_element(By.ID, YOUTUBE_NEXT_BUTTON_ID)
-            next_button.click()
-
-            # Set as unlisted
-            if verbose:
-                info("\t=> Setting as unlisted...")
-            
-            radio_button = driver.find_elements(By.XPATH, YOUTUBE_RADIO_BUTTON_XPATH)
-            radio_button[2].click()
+            wait_for_upload(driver, By.XPATH, YOUTUBE_UPLOAD_PROGRESS_XPATH)
 
             if verbose:
                 info("\t=> Clicking done button...")
 
             # Click done button
-            done_button = driver.find_element(By.ID, YOUTUBE_DONE_BUTTON_ID)
-            done_button.click()
-
-            # Wait for 2 seconds
-            time.sleep(2)
+            click(driver, By.ID, YOUTUBE_DONE_BUTTON_ID)
+            wait_for_invisible(driver, By.ID, YOUTUBE_DONE_BUTTON_ID)
 
             # Get latest video
             if verbose:
@@ -670,8 +882,7 @@ class YouTube:
 
             # Get the latest uploaded video URL
             driver.get(f"https://studio.youtube.com/channel/{self.channel_id}/videos/short")
-            time.sleep(2)
-            videos = driver.find_elements(By.TAG_NAME, "ytcp-video-row")
+            videos = wait_for_elements(driver, By.TAG_NAME, YOUTUBE_VIDEO_ROW_TAG)
             first_video = videos[0]
             anchor_tag = first_video.find_element(By.TAG_NAME, "a")
             href = anchor_tag.get_attribute("href")
@@ -695,14 +906,56 @@ class YouTube:
                 "date": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             })
 
-            # Close the browser
-            driver.quit()
+            # Hand the browser back to the pool
+            self.release_browser()
+
+            # The job is done, its artifacts are not needed anymore
+            if self.job:
+                self.job.complete("upload", self.get_stage_output("upload"), time.perf_counter() - start)
+                self.job.remove_artifacts()
 
             return True
-        except:
-            self.browser.quit()
+        except Exception as e:
+            error(f"Failed to upload video: {str(e)}")
+            self.release_browser()
+
+            if self.job:
+                self.job.fail("upload", str(e))
+                info(f" => Resume with: python src/resume.py {self.job.id}")
+
             return False
 
+    def resume(self, tts_instance: TTS, job_id: str, promote: bool = False) -> bool:
+        """
+        Continues a job from its first incomplete stage, up to the upload.
+        Drafts are only uploaded, if they are promoted.
+
+        Args:
+            tts_instance (TTS): Instance of TTS Class.
+            job_id (str): The job ID
+            promote (bool): Whether to render a draft again for publishing and upload it
+
+        Returns:
+            success (bool): Whether the upload was successful or not.
+        """
+        if self.load_job(job_id).get_next_stage() is None:
+            warning(f"Job {job_id} has already been uploaded.")
+            return True
+
+        self.generate_video(tts_instance, job_id=job_id)
+
+        if self.render_profile == "draft":
+            if not promote:
+                # A draft is only published, after it has been approved
+                warning(f"Job {job_id} is a draft, that hasn't been approved. Not uploading it.")
+                self.job.fail("upload", "Draft not approved")
+                info(f" => Approve and upload it with: python src/resume.py --promote {job_id}")
+                return False
+
+            self.promote_draft()
+
+        return self.upload_video()
+
 
     def get_videos(self) -> List[dict]:
         """
@@ -69,6 +69,17 @@ def get_headless() -> bool:
     with open(os.path.join(ROOT_DIR, "config.json"), "r") as file:
         return json.load(file)["headless"]
 
+def get_lean_browser() -> bool:
+    """
+    Gets the lean browser flag from the config file. In lean mode, Firefox
+    doesn't load images, autoplay media, extensions or telemetry.
+
+    Returns:
+        lean (bool): The lean browser flag
+    """
+    with open(os.path.join(ROOT_DIR, "config.json"), "r") as file:
+        return json.load(file).get("lean_browser", False)
+
 def get_model() -> str:
     """
     Gets the model from the config file.
@@ -89,6 +100,16 @@ def get_twitter_language() -> str:
     with open(os.path.join(ROOT_DIR, "config.json"), "r") as file:
         return json.load(file)["twitter_language"]
 
+def get_twitter_post_spacing() -> float:
+    """
+    Gets the seconds between two posts of a Twitter batch.
+
+    Returns:
+        spacing (float): Seconds between two posts
+    """
+    with open(os.path.join(ROOT_DIR, "config.json"), "r") as file:
+        return json.load(file).get("twitter_post_spacing", 60)
+
 def get_image_model() -> str:
     """
     Gets the Image MOdel from the config file.
@@ -240,3 +261,213 @@ def get_imagemagick_path() -> str:
     """
     with open(os.path.join(ROOT_DIR, "config.json"), "r") as file:
         return json.load(file)["imagemagick_path"]
+
+def get_render_backend() -> str:
+    """
+    Gets the backend used to render YouTube Shorts.
+
+    Returns:
+        backend (str): The render backend (`moviepy` or `ffmpeg`)
+    """
+    with open(os.path.join(ROOT_DIR, "config.json"), "r") as file:
+        return json.load(file).get("render_backend") or "moviepy"
+
+def get_render_profile() -> str:
+    """
+    Gets the render profile used for YouTube Shorts.
+
+    Returns:
+        profile (str): The render profile (`draft`, `publish` or `archive`)
+    """
+    with open(os.path.join(ROOT_DIR, "config.json"), "r") as file:
+        return json.load(file).get("render_profile") or "publish"
+
+def get_browser_timeout() -> int:
+    """
+    Gets the amount of seconds to wait for an element in the browser.
+
+    Returns:
+        timeout (int): The browser timeout
+    """
+    with open(os.path.join(ROOT_DIR, "config.json"), "r") as file:
+        return json.load(file).get("browser_timeout") or 30
+
+def get_upload_timeout() -> int:
+    """
+    Gets the amount of seconds to wait for a video upload to finish.
+
+    Returns:
+        timeout (int): The upload timeout
+    """
+    with open(os.path.join(ROOT_DIR, "config.json"), "r") as file:
+        return json.load(file).get("upload_timeout") or 900
+
+def get_browser_max_uses() -> int:
+    """
+    Gets the amount of jobs a browser session is reused for, before it is restarted.
+
+    Returns:
+        max_uses (int): The maximum uses of a browser session
+    """
+    with open(os.path.join(ROOT_DIR, "config.json"), "r") as file:
+        return json.load(file).get("browser_max_uses") or 20
+
+def get_geckodriver_version() -> str:
+    """
+    Gets the geckodriver version to pin, if any.
+
+    Returns:
+        version (str): The geckodriver version, or None for the latest version
+    """
+    with open(os.path.join(ROOT_DIR, "config.json"), "r") as file:
+        return json.load(file).get("geckodriver_version") or None
+
+def get_render_workers() -> int:
+    """
+    Gets the amount of Shorts the pipeline renders at the same time.
+
+    Returns:
+        workers (int): Amount of render workers
+    """
+    with open(os.path.join(ROOT_DIR, "config.json"), "r") as file:
+        return json.load(file).get("render_workers") or 1
+
+def get_upload_workers() -> int:
+    """
+    Gets the amount of Shorts the pipeline uploads at the same time (one browser each).
+
+    Returns:
+        workers (int): Amount of upload workers
+    """
+    with open(os.path.join(ROOT_DIR, "config.json"), "r") as file:
+        return json.load(file).get("upload_workers") or 1
+
+def get_max_pending_uploads() -> int:
+    """
+    Gets the amount of rendered Shorts, that may wait for an upload before rendering pauses.
+
+    Returns:
+        max_pending (int): Maximum length of the upload queue
+    """
+    with open(os.path.join(ROOT_DIR, "config.json"), "r") as file:
+        return json.load(file).get("max_pending_uploads") or 3
+
+def get_scheduler_workers() -> int:
+    """
+    Gets the amount of jobs, that the scheduler runs at the same time.
+
+    Returns:
+        workers (int): Amount of scheduler workers
+    """
+    with open(os.path.join(ROOT_DIR, "config.json"), "r") as file:
+        return json.load(file).get("scheduler_workers") or 2
+
+def get_limits() -> dict:
+    """
+    Gets the limits, that all jobs of a process share.
+
+    Returns:
+        limits (dict): Maximum concurrent `renders`, `browsers`, `llm` and `images` requests, and `jobs_per_account`
+    """
+    defaults = {
+        "renders": max(1, (os.cpu_count() or 2) // 2),
+        "browsers": 2,
+        "llm": 4,
+        "images": 4,
+        "jobs_per_account": 1
+    }
+
+    with open(os.path.join(ROOT_DIR, "config.json"), "r") as file:
+        return {**defaults, **(json.load(file).get("limits") or {})}
+
+def get_rate_limits() -> dict:
+    """
+    Gets the rate limits of the providers, that all processes share.
+
+    Returns:
+        rate_limits (dict): `per_minute`, `burst` and optionally `per_account` by provider
+    """
+    with open(os.path.join(ROOT_DIR, "config.json"), "r") as file:
+        return json.load(file).get("rate_limits") or {}
+
+def get_crawler_workers() -> int:
+    """
+    Gets the amount of websites, that the outreach crawler fetches at the same time.
+
+    Returns:
+        workers (int): Amount of crawler workers
+    """
+    with open(os.path.join(ROOT_DIR, "config.json"), "r") as file:
+        return json.load(file).get("crawler_workers") or 32
+
+def get_crawler_per_host() -> int:
+    """
+    Gets the amount of requests, that the outreach crawler sends to the same host at the same time.
+
+    Returns:
+        per_host (int): Requests per host
+    """
+    with open(os.path.join(ROOT_DIR, "config.json"), "r") as file:
+        return json.load(file).get("crawler_per_host") or 2
+
+def get_crawler_connect_timeout() -> float:
+    """
+    Gets the seconds, that the outreach crawler waits for a connection.
+
+    Returns:
+        timeout (float): The connect timeout
+    """
+    with open(os.path.join(ROOT_DIR, "config.json"), "r") as file:
+        return json.load(file).get("crawler_connect_timeout") or 5
+
+def get_crawler_read_timeout() -> float:
+    """
+    Gets the seconds, that the outreach crawler waits for data from a website.
+
+    Returns:
+        timeout (float): The read timeout
+    """
+    with open(os.path.join(ROOT_DIR, "config.json"), "r") as file:
+        return json.load(file).get("crawler_read_timeout") or 10
+
+def get_crawler_max_pages() -> int:
+    """
+    Gets the amount of pages, that the outreach crawler reads per website,
+    including the landing page.
+
+    Returns:
+        pages (int): The maximum amount of pages
+    """
+    with open(os.path.join(ROOT_DIR, "config.json"), "r") as file:
+        return json.load(file).get("crawler_max_pages") or 4
+
+def get_crawl_cache_ttl() -> float:
+    """
+    Gets the hours, that a cached crawl result is used without asking the website again.
+
+    Returns:
+        ttl (float): The time to live in hours
+    """
+    with open(os.path.join(ROOT_DIR, "config.json"), "r") as file:
+        return json.load(file).get("crawl_cache_ttl", 168)
+
+def get_outreach_campaign() -> str:
+    """
+    Gets the outreach campaign. A business is emailed once per campaign.
+
+    Returns:
+        campaign (str): The campaign, defaults to the Google Maps scraper niche
+    """
+    with open(os.path.join(ROOT_DIR, "config.json"), "r") as file:
+        config = json.load(file)
+        return config.get("outreach_campaign") or config["google_maps_scraper_niche"]
+
+def get_outreach_mail_connections() -> int:
+    """
+    Gets the amount of SMTP connections, that outreach emails are sent over at the same time.
+
+    Returns:
+        connections (int): The maximum amount of SMTP connections
+    """
+    with open(os.path.join(ROOT_DIR, "config.json"), "r") as file:
+        return json.load(file).get("outreach_mail_connections") or 2
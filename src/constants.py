@@ -5,6 +5,9 @@ import g4f
 
 TWITTER_TEXTAREA_CLASS = "public-DraftStyleDefault-block public-DraftStyleDefault-ltr"
 TWITTER_POST_BUTTON_XPATH = "/html/body/div[1]/div/div/div[2]/main/div/div/div/div[1]/div/div[3]/div/div[2]/div[1]/div/div/div/div[2]/div[2]/div[2]/div/div/div/div[3]"
+TWITTER_NEW_TWEET_BUTTON_XPATH = "//a[@data-testid='SideNav_NewTweet_Button']"
+TWITTER_TEXTBOX_XPATH = "//div[@role='dialog']//div[@role='textbox']"
+TWITTER_TWEET_BUTTON_XPATH = "//div[@data-testid='tweetButton']"
 
 OPTIONS = [
     "YouTube Shorts Automation",
@@ -42,13 +45,90 @@ YOUTUBE_CRON_OPTIONS = [
     "Quit"
 ]
 
+# Times of day, that the CRON options run at (same order as the CRON options)
+CRON_TIMES = [
+    ["10:00"],
+    ["10:00", "16:00"],
+    ["08:00", "12:00", "18:00"]
+]
+
 # YouTube Section
 YOUTUBE_TEXTBOX_ID = "textbox"
 YOUTUBE_MADE_FOR_KIDS_NAME = "VIDEO_MADE_FOR_KIDS_MFK"
 YOUTUBE_NOT_MADE_FOR_KIDS_NAME = "VIDEO_MADE_FOR_KIDS_NOT_MFK"
 YOUTUBE_NEXT_BUTTON_ID = "next-button"
+# Panels of the upload wizard, that become visible after each click on next
+YOUTUBE_WIZARD_STEP_TAGS = ["ytcp-uploads-video-elements", "ytcp-uploads-checks", "ytcp-uploads-review"]
 YOUTUBE_RADIO_BUTTON_XPATH = "//*[@id=\"radioLabel\"]"
 YOUTUBE_DONE_BUTTON_ID = "done-button"
+YOUTUBE_FILE_PICKER_INPUT_XPATH = "//ytcp-uploads-file-picker//input"
+YOUTUBE_UPLOAD_PROGRESS_XPATH = "//ytcp-video-upload-progress//span[contains(@class, 'progress-label')]"
+YOUTUBE_VIDEO_ROW_TAG = "ytcp-video-row"
+
+# Render Profiles
+RENDER_PROFILES = {
+    # Fast, low quality preview
+    "draft": {
+        "width": 540,
+        "height": 960,
+        "preset": "ultrafast",
+        "video_bitrate": "800k",
+        "crf": None,
+        "audio_bitrate": "96k"
+    },
+    # Quality of the uploaded Shorts
+    "publish": {
+        "width": 1080,
+        "height": 1920,
+        "preset": "medium",
+        "video_bitrate": None,
+        "crf": None,
+        "audio_bitrate": None
+    },
+    # High quality copy to keep
+    "archive": {
+        "width": 1080,
+        "height": 1920,
+        "preset": "slow",
+        "video_bitrate": None,
+        "crf": 16,
+        "audio_bitrate": "320k"
+    }
+}
+
+# Lean Browser Mode (Firefox preferences)
+LEAN_FIREFOX_PREFERENCES = {
+    # Don't load images, don't autoplay audio/video
+    "permissions.default.image": 2,
+    "media.autoplay.default": 5,
+    "media.autoplay.blocking_policy": 2,
+    "media.preload.default": 0,
+    "media.preload.auto": 0,
+    # No extensions (except the built-in ones), no extension updates
+    "extensions.enabledScopes": 0,
+    "extensions.autoDisableScopes": 15,
+    "extensions.update.enabled": False,
+    "extensions.pocket.enabled": False,
+    # No telemetry, studies or health reports
+    "toolkit.telemetry.enabled": False,
+    "toolkit.telemetry.unified": False,
+    "toolkit.telemetry.archive.enabled": False,
+    "datareporting.healthreport.uploadEnabled": False,
+    "datareporting.policy.dataSubmissionEnabled": False,
+    "app.shield.optoutstudies.enabled": False,
+    "app.normandy.enabled": False,
+    "browser.ping-centre.telemetry": False,
+    # Cap the content processes (no process per site)
+    "fission.autostart": False,
+    "dom.ipc.processCount": 2,
+    "dom.ipc.processCount.webIsolated": 1,
+    "dom.ipc.processPrelaunch.enabled": False,
+    # Nothing to show on startup/new tabs
+    "browser.startup.page": 0,
+    "browser.newtabpage.enabled": False,
+    "browser.newtabpage.activity-stream.feeds.topsites": False,
+    "browser.newtabpage.activity-stream.feeds.section.topstories": False
+}
 
 # Amazon Section (AFM)$
 AMAZON_PRODUCT_TITLE_ID = "productTitle"
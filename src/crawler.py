@@ -0,0 +1,534 @@
+# Crawls the websites of scraped businesses concurrently and extracts their email addresses.
+import re
+import sys
+import json
+import time
+import sqlite3
+import argparse
+import threading
+import requests
+
+from cache import *
+from status import *
+from config import *
+from html import unescape
+from collections import deque
+from urllib.parse import urlparse, urljoin, unquote
+from typing import Iterable, Iterator, List, Tuple
+from concurrent.futures import ThreadPoolExecutor
+
+# Matches email addresses in HTML
+EMAIL_PATTERN = re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,7}\b")
+
+# Matches the address of `mailto:` links, which may be URL-encoded
+MAILTO_PATTERN = re.compile(r"mailto:([^\"'>?\s]+)", re.IGNORECASE)
+
+# Matches addresses written as `name [at] example [dot] com`
+OBFUSCATED_PATTERN = re.compile(
+    r"\b([A-Za-z0-9._%+-]+)\s*[\[(]\s*at\s*[\])]\s*([A-Za-z0-9-]+(?:\s*[\[(]\s*dot\s*[\])]\s*[A-Za-z0-9-]+)+)",
+    re.IGNORECASE
+)
+DOT_PATTERN = re.compile(r"\s*[\[(]\s*dot\s*[\])]\s*", re.IGNORECASE)
+
+# Matches the targets of links
+LINK_PATTERN = re.compile(r"href\s*=\s*[\"']([^\"'#]+)", re.IGNORECASE)
+
+# Links to these pages usually lead to an address, most promising first
+CONTACT_KEYWORDS = ["contact", "kontakt", "impressum", "imprint", "about", "legal"]
+CONTACT_PATTERN = re.compile("|".join(CONTACT_KEYWORDS), re.IGNORECASE)
+
+# Matches addresses, that are never worth an email: images (`logo@2x.png`),
+# automatic senders, placeholders and the addresses of tracking scripts
+JUNK_EMAIL_PATTERN = re.compile(
+    r"\.(png|jpe?g|gif|svg|webp|ico|css|js)$"
+    r"|^(no-?reply|do-?not-?reply|mailer-daemon|postmaster|abuse)@"
+    r"|^(your|name|user|email|example|test)@"
+    r"|@(example\.(com|org|net)|domain\.com|email\.com|yourdomain\.com|sentry\.io|[a-z0-9.-]*wixpress\.com)$",
+    re.IGNORECASE
+)
+
+# Addresses, that are meant to be contacted
+ROLE_EMAIL_PATTERN = re.compile(r"^(info|contact|kontakt|hello|hallo|office|mail|sales|team)@", re.IGNORECASE)
+
+# Hosts, that many unrelated businesses have their "website" on (and their subdomains)
+SHARED_HOSTS = [
+    "facebook.com", "instagram.com", "linkedin.com", "twitter.com", "x.com", "tiktok.com", "youtube.com",
+    "linktr.ee", "sites.google.com", "business.site", "google.com", "yelp.com", "tripadvisor.com",
+    "wixsite.com", "wordpress.com", "blogspot.com", "weebly.com", "squarespace.com", "godaddysites.com", "carrd.co"
+]
+
+# Statuses of websites, that no longer exist. Other errors (e.g. 403, 500) may be temporary
+GONE_STATUSES = [404, 410]
+
+# Stop reading a page after this many bytes, emails are rarely further down
+MAX_PAGE_BYTES = 2 * 1024 * 1024
+
+# Stop following links of a website after this many bytes
+MAX_SITE_BYTES = 4 * 1024 * 1024
+
+USER_AGENT = "Mozilla/5.0 (compatible; MoneyPrinterV2 Outreach)"
+
+def extract_emails(html: str) -> List[str]:
+    """
+    Extracts the email addresses of a page, in the order they appear. Decodes
+    HTML entities, URL-encoded `mailto:` links and `[at]`/`[dot]` spellings.
+
+    Args:
+        html (str): The HTML of the page
+
+    Returns:
+        emails (List[str]): The email addresses (lowercase), without duplicates
+    """
+    html = unescape(html)
+
+    emails = [unquote(address) for address in MAILTO_PATTERN.findall(html)]
+    emails = [email for email in emails if EMAIL_PATTERN.fullmatch(email)]
+    # The rest of the page, without the (possibly encoded) mailto: addresses
+    html = MAILTO_PATTERN.sub(" ", html)
+    emails += EMAIL_PATTERN.findall(html)
+    emails += [f"{name}@{DOT_PATTERN.sub('.', domain)}" for name, domain in OBFUSCATED_PATTERN.findall(html)]
+
+    return list(dict.fromkeys(email.lower() for email in emails))
+
+def find_contact_links(html: str, url: str) -> List[str]:
+    """
+    Finds the links of a page to contact, about and impressum pages of the same website.
+
+    Args:
+        html (str): The HTML of the page
+        url (str): The URL of the page
+
+    Returns:
+        links (List[str]): The absolute URLs, most promising first
+    """
+    domain = normalize_domain(url)
+    links = {}
+
+    for href in LINK_PATTERN.findall(html):
+        link = urljoin(url, unescape(href.strip()))
+        path = urlparse(link).path
+
+        if not link.startswith("http") or normalize_domain(link) != domain or link.rstrip("/") == url.rstrip("/"):
+            continue
+
+        match = CONTACT_PATTERN.search(path)
+        if match and link not in links:
+            links[link] = CONTACT_KEYWORDS.index(match.group(0).lower())
+
+    return sorted(links, key=links.get)
+
+def is_domain_email(email: str, domain: str) -> bool:
+    """
+    Checks if an email address belongs to a website.
+
+    Args:
+        email (str): The email address
+        domain (str): The normalized domain of the website
+
+    Returns:
+        match (bool): True if the address is on the domain (or a subdomain)
+    """
+    host = email.rsplit("@", 1)[-1]
+    return host == domain or host.endswith(f".{domain}")
+
+def rank_emails(emails: List[str], domain: str) -> List[str]:
+    """
+    Removes junk addresses and sorts the rest, best first: addresses on the
+    domain of the website before others, role addresses (info@, contact@)
+    before personal ones, then in the order they were found.
+
+    Args:
+        emails (List[str]): The email addresses
+        domain (str): The normalized domain of the website
+
+    Returns:
+        emails (List[str]): The ranked email addresses
+    """
+    emails = [email for email in emails if not JUNK_EMAIL_PATTERN.search(email)]
+
+    return sorted(emails, key=lambda email: (not is_domain_email(email, domain), not ROLE_EMAIL_PATTERN.match(email)))
+
+def normalize_domain(url: str) -> str:
+    """
+    Normalizes the domain of a URL, so that e.g. `https://www.Example.com/about`
+    and `http://example.com` share a cache entry.
+
+    Args:
+        url (str): The URL
+
+    Returns:
+        domain (str): The normalized domain
+    """
+    host = urlparse(url if "//" in url else f"//{url}").hostname or ""
+    host = host.lower().rstrip(".")
+
+    return host[4:] if host.startswith("www.") else host
+
+def is_shared_host(domain: str) -> bool:
+    """
+    Checks if a domain is shared by unrelated businesses, e.g. `facebook.com`.
+
+    Args:
+        domain (str): The normalized domain
+
+    Returns:
+        shared (bool): True if the domain is (a subdomain of) a shared host
+    """
+    return any(domain == host or domain.endswith(f".{host}") for host in SHARED_HOSTS)
+
+def get_cache_key(url: str) -> str:
+    """
+    Gets the key of a website in the crawl cache: its normalized domain, or
+    for shared hosts the normalized URL, since the domain says nothing there.
+
+    Args:
+        url (str): The URL
+
+    Returns:
+        key (str): The cache key
+    """
+    domain = normalize_domain(url)
+    if not is_shared_host(domain):
+        return domain
+
+    parsed = urlparse(url if "//" in url else f"//{url}")
+    key = domain + parsed.path.rstrip("/")
+
+    return f"{key}?{parsed.query}" if parsed.query else key
+
+class CrawlCache:
+    """
+    Persistent cache of crawl results by domain (by URL for shared hosts),
+    stored in SQLite. Keeps the extracted emails, the status and the
+    validators (ETag, Last-Modified), so that stale entries can be
+    revalidated with a conditional GET.
+    """
+    def __init__(self, path: str = None, ttl: float = None) -> None:
+        """
+        Initializes the CrawlCache.
+
+        Args:
+            path (str): Path to the database, defaults to `.mp/crawl_cache.db`
+            ttl (float): Seconds, that an entry is fresh, defaults to `crawl_cache_ttl` (hours)
+
+        Returns:
+            None
+        """
+        self._path = path or get_crawl_cache_path()
+        self.ttl = ttl if ttl is not None else get_crawl_cache_ttl() * 3600
+
+        # `domain` holds the key of `get_cache_key`
+        self.connect().execute("""
+            CREATE TABLE IF NOT EXISTS crawls (
+                domain TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                status INTEGER,
+                emails TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched REAL NOT NULL
+            )
+        """)
+
+    def connect(self) -> sqlite3.Connection:
+        """
+        Gets the connection of the current thread.
+
+        Returns:
+            connection (sqlite3.Connection): The connection
+        """
+        return get_db_connection(self._path)
+
+    def get(self, url: str) -> dict:
+        """
+        Gets the cache entry of a URL.
+
+        Args:
+            url (str): The URL
+
+        Returns:
+            entry (dict): The entry (with `fresh`), or None if the website hasn't been crawled
+        """
+        row = self.connect().execute(
+            "SELECT status, emails, etag, last_modified, fetched FROM crawls WHERE domain = ?",
+            (get_cache_key(url),)
+        ).fetchone()
+
+        if row is None:
+            return None
+
+        return {
+            "status": row[0],
+            "emails": json.loads(row[1]),
+            "etag": row[2],
+            "last_modified": row[3],
+            "fresh": time.time() - row[4] < self.ttl
+        }
+
+    def put(self, url: str, status: int, emails: List[str], etag: str = None, last_modified: str = None) -> None:
+        """
+        Stores the crawl result of a URL.
+
+        Args:
+            url (str): The URL
+            status (int): The HTTP status
+            emails (List[str]): The extracted emails
+            etag (str): The ETag header
+            last_modified (str): The Last-Modified header
+
+        Returns:
+            None
+        """
+        self.connect().execute(
+            "INSERT OR REPLACE INTO crawls (domain, url, status, emails, etag, last_modified, fetched) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (get_cache_key(url), url, status, json.dumps(emails), etag, last_modified, time.time())
+        )
+
+    def touch(self, url: str) -> None:
+        """
+        Marks the entry of a URL as fresh again (after a 304).
+
+        Args:
+            url (str): The URL
+
+        Returns:
+            None
+        """
+        self.connect().execute("UPDATE crawls SET fetched = ? WHERE domain = ?", (time.time(), get_cache_key(url)))
+
+class Crawler:
+    """
+    Fetches websites with a thread pool. Every website is fetched once, with
+    connect/read timeouts, and at most `per_host` requests run against the
+    same host at a time. If the landing page has no address on the domain of
+    the website, a few contact, about and impressum pages are read as well.
+    Results are returned in the order of the input.
+    """
+    def __init__(self, workers: int = None, per_host: int = None, connect_timeout: float = None, read_timeout: float = None, cache: CrawlCache = None, max_pages: int = None) -> None:
+        """
+        Initializes the Crawler.
+
+        Args:
+            workers (int): Requests at the same time, defaults to `crawler_workers`
+            per_host (int): Requests to the same host at the same time, defaults to `crawler_per_host`
+            connect_timeout (float): Seconds to connect, defaults to `crawler_connect_timeout`
+            read_timeout (float): Seconds to wait for data, defaults to `crawler_read_timeout`
+            cache (CrawlCache): Cache of earlier crawls, every website is fetched if None
+            max_pages (int): Pages read per website, including the landing page, defaults to `crawler_max_pages`
+
+        Returns:
+            None
+        """
+        self.cache = cache
+        self.max_pages = max_pages or get_crawler_max_pages()
+        self.workers = workers or get_crawler_workers()
+        self.per_host = per_host or get_crawler_per_host()
+        self.timeout = (connect_timeout or get_crawler_connect_timeout(), read_timeout or get_crawler_read_timeout())
+
+        self._local = threading.local()
+        self._hosts_lock = threading.Lock()
+        self._hosts = {}
+
+    def get_session(self) -> requests.Session:
+        """
+        Gets the session of the current thread, so connections are reused.
+
+        Returns:
+            session (requests.Session): The session
+        """
+        if not hasattr(self._local, "session"):
+            session = requests.Session()
+            session.headers["User-Agent"] = USER_AGENT
+            self._local.session = session
+
+        return self._local.session
+
+    def get_host_slot(self, url: str) -> threading.Semaphore:
+        """
+        Gets the semaphore, that limits the requests to the host of a URL.
+
+        Args:
+            url (str): The URL
+
+        Returns:
+            slot (threading.Semaphore): The semaphore of the host
+        """
+        host = urlparse(url).netloc.lower()
+
+        with self._hosts_lock:
+            if host not in self._hosts:
+                self._hosts[host] = threading.Semaphore(self.per_host)
+
+            return self._hosts[host]
+
+    def read_page(self, url: str, headers: dict = None, limit: int = MAX_PAGE_BYTES) -> Tuple[requests.Response, str]:
+        """
+        Fetches a page and reads at most `limit` bytes of it.
+
+        Args:
+            url (str): The URL of the page
+            headers (dict): Additional request headers
+            limit (int): Maximum bytes to read
+
+        Returns:
+            response (requests.Response): The (closed) response
+            html (str): The HTML of the page, empty unless the status is 200
+        """
+        with self.get_host_slot(url):
+            with self.get_session().get(url, headers=headers or {}, timeout=self.timeout, stream=True) as r:
+                if r.status_code != 200:
+                    return r, ""
+
+                content = bytearray()
+                for chunk in r.iter_content(64 * 1024):
+                    content.extend(chunk)
+                    if len(content) >= limit:
+                        break
+
+                return r, content[:limit].decode(r.encoding or "utf-8", errors="ignore")
+
+    def discover(self, url: str, html: str) -> Tuple[List[str], int]:
+        """
+        Collects the email addresses of a website, starting at its landing page.
+
+        Contact pages are only read, until an address on the domain of the
+        website has been found, or the page or byte budget is used up.
+
+        Args:
+            url (str): The URL of the landing page
+            html (str): The HTML of the landing page
+
+        Returns:
+            emails (List[str]): The ranked email addresses
+            pages (int): Amount of pages read
+        """
+        domain = normalize_domain(url)
+        emails = extract_emails(html)
+        budget = MAX_SITE_BYTES - len(html)
+        pages = 1
+
+        # The contact pages of a shared host belong to the host, not the business
+        links = [] if is_shared_host(domain) else find_contact_links(html, url)
+
+        for link in links[:self.max_pages - 1]:
+            if budget <= 0 or any(is_domain_email(email, domain) for email in rank_emails(emails, domain)):
+                break
+
+            try:
+                _, page = self.read_page(link, limit=min(MAX_PAGE_BYTES, budget))
+            except Exception:
+                continue
+
+            pages += 1
+            budget -= len(page)
+            emails += [email for email in extract_emails(page) if email not in emails]
+
+        return rank_emails(emails, domain), pages
+
+    def fetch(self, url: str) -> dict:
+        """
+        Fetches a website and extracts its email addresses, best first.
+
+        Args:
+            url (str): The URL of the website
+
+        Returns:
+            result (dict): `url`, `status`, `emails`, `pages`, `error` and `cached`
+        """
+        result = {"url": url, "status": None, "emails": [], "pages": 0, "error": None, "cached": False}
+
+        if not url or not url.startswith("http"):
+            result["error"] = "No website"
+            return result
+
+        entry = self.cache.get(url) if self.cache else None
+
+        # Crawled recently, no request needed
+        if entry and entry["fresh"]:
+            result.update(status=entry["status"], emails=entry["emails"], cached=True)
+            return result
+
+        # Crawled before, only download the page if it has changed
+        headers = {}
+        if entry and entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+        try:
+            r, html = self.read_page(url, headers)
+            result["pages"] = 1
+
+            if r.status_code == 304 and entry:
+                result.update(status=entry["status"], emails=entry["emails"], cached=True)
+                self.cache.touch(url)
+                return result
+
+            result["status"] = r.status_code
+
+            if r.status_code == 200:
+                result["emails"], result["pages"] = self.discover(url, html)
+
+            # Errors like timeouts are not cached, HTTP errors (e.g. 404) are
+            if self.cache:
+                self.cache.put(url, r.status_code, result["emails"], r.headers.get("ETag"), r.headers.get("Last-Modified"))
+        except Exception as e:
+            result["error"] = str(e)
+
+        return result
+
+    def crawl(self, urls: Iterable[str]) -> Iterator[dict]:
+        """
+        Fetches websites concurrently and yields the results in input order.
+
+        Only a window of websites is in flight at a time, so the URLs can be
+        a generator and the results can be consumed while crawling. Finished
+        results are yielded before waiting for the next URL, so a slow source
+        (e.g. a running scraper) doesn't hold them back.
+
+        Args:
+            urls (Iterable[str]): The URLs of the websites
+
+        Returns:
+            results (Iterator[dict]): The results of `fetch`, in input order
+        """
+        window = self.workers * 4
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            pending = deque()
+
+            for url in urls:
+                pending.append(executor.submit(self.fetch, url))
+
+                while pending and pending[0].done():
+                    yield pending.popleft().result()
+
+                if len(pending) >= window:
+                    yield pending.popleft().result()
+
+            while pending:
+                yield pending.popleft().result()
+
+def main():
+    parser = argparse.ArgumentParser(description="Crawl websites and extract their email addresses.")
+    parser.add_argument("file", help="File with one URL per line")
+    parser.add_argument("--workers", type=int, default=None, help="Requests at the same time")
+    parser.add_argument("--per-host", type=int, default=None, help="Requests to the same host at the same time")
+    parser.add_argument("--max-pages", type=int, default=None, help="Pages read per website, including the landing page")
+    parser.add_argument("--no-cache", action="store_true", help="Don't use the crawl cache")
+    args = parser.parse_args()
+
+    with open(args.file, "r") as file:
+        urls = [line.strip() for line in file if line.strip()]
+
+    crawler = Crawler(workers=args.workers, per_host=args.per_host, cache=None if args.no_cache else CrawlCache(), max_pages=args.max_pages)
+
+    start = time.perf_counter()
+    for result in crawler.crawl(urls):
+        print(json.dumps(result))
+    duration = time.perf_counter() - start
+
+    print(f"Crawled {len(urls)} websites in {duration:.2f}s ({len(urls) / duration * 60:.0f} per minute)", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
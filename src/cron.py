@@ -2,64 +2,36 @@
 import sys
 
 from status import *
-from cache import get_accounts
-from config import get_verbose
-from classes.Tts import TTS
-from classes.Twitter import Twitter
-from classes.YouTube import YouTube
+from jobs import run_job
+
+USAGE = "Usage: python src/cron.py <twitter|youtube> <account UUID> [count]"
 
 def main():
+    if len(sys.argv) < 3 or len(sys.argv) > 4:
+        error(USAGE)
+        sys.exit(1)
+
     purpose = str(sys.argv[1])
     account_id = str(sys.argv[2])
 
-    verbose = get_verbose()
-
-    if purpose == "twitter":
-        accounts = get_accounts("twitter")
+    if not account_id:
+        error("Account UUID cannot be empty.")
+        sys.exit(1)
 
-        if not account_id:
-            error("Account UUID cannot be empty.")
+    if purpose not in ["twitter", "youtube"]:
+        error("Invalid Purpose, exiting...")
+        sys.exit(1)
 
-        for acc in accounts:
-            if acc["id"] == account_id:
-                if verbose:
-                    info("Initializing Twitter...")
-                twitter = Twitter(
-                    acc["id"],
-                    acc["nickname"],
-                    acc["firefox_profile"],
-                    acc["topic"]
-                )
-                twitter.post()
-                if verbose:
-                    success("Done posting.")
-                break
-    elif purpose == "youtube":
-        tts = TTS()
+    # Optional: amount of posts (Twitter), all in one browser session
+    count = sys.argv[3] if len(sys.argv) > 3 else "1"
 
-        accounts = get_accounts("youtube")
+    if not count.isdigit() or int(count) < 1:
+        error(f"Invalid count: {count}, must be a positive number. {USAGE}")
+        sys.exit(1)
 
-        if not account_id:
-            error("Account UUID cannot be empty.")
+    count = int(count)
 
-        for acc in accounts:
-            if acc["id"] == account_id:
-                if verbose:
-                    info("Initializing YouTube...")
-                youtube = YouTube(
-                    acc["id"],
-                    acc["nickname"],
-                    acc["firefox_profile"],
-                    acc["niche"],
-                    acc["language"]
-                )
-                youtube.generate_video(tts)
-                youtube.upload_video()
-                if verbose:
-                    success("Uploaded Short.")
-                break
-    else:
-        error("Invalid Purpose, exiting...")
+    if not run_job(purpose, account_id, count):
         sys.exit(1)
 
 if __name__ == "__main__":
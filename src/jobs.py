@@ -0,0 +1,177 @@
+# Jobs, that cron.py and the scheduler run for an account.
+import threading
+
+from status import *
+from limits import limit
+from cache import get_accounts
+from config import get_verbose
+from classes.Tts import TTS
+from classes.Twitter import Twitter
+from classes.Job import Job
+from classes.YouTube import YouTube
+
+# TTS of this process, loaded once and shared by all jobs
+_tts_lock = threading.Lock()
+_tts = None
+
+def get_tts() -> TTS:
+    """
+    Gets the TTS of this process, loading the models on first use.
+
+    Returns:
+        tts (TTS): The TTS
+    """
+    global _tts
+
+    with _tts_lock:
+        if _tts is None:
+            _tts = TTS()
+
+        return _tts
+
+def find_account(provider: str, account_id: str) -> dict:
+    """
+    Finds an account in the cache.
+
+    Args:
+        provider (str): The provider of the account
+        account_id (str): The account UUID
+
+    Returns:
+        account (dict): The account, or None if it doesn't exist
+    """
+    for account in get_accounts(provider):
+        if account["id"] == account_id:
+            return account
+
+    return None
+
+def run_twitter_job(account_id: str, count: int = 1) -> bool:
+    """
+    Posts to a Twitter account.
+
+    Args:
+        account_id (str): The account UUID
+        count (int): Amount of posts, all in one browser session
+
+    Returns:
+        success (bool): False if the account doesn't exist
+    """
+    acc = find_account("twitter", account_id)
+
+    if acc is None:
+        error(f"Twitter account {account_id} not found.")
+        return False
+
+    if get_verbose():
+        info("Initializing Twitter...")
+
+    twitter = Twitter(
+        acc["id"],
+        acc["nickname"],
+        acc["firefox_profile"],
+        acc["topic"]
+    )
+
+    if count > 1:
+        twitter.post_batch(count=count)
+    else:
+        twitter.post()
+
+    if get_verbose():
+        success("Done posting.")
+
+    return True
+
+def run_youtube_job(account_id: str) -> bool:
+    """
+    Generates and uploads a Short for a YouTube account.
+
+    Args:
+        account_id (str): The account UUID
+
+    Returns:
+        success (bool): False if the account doesn't exist or the upload failed
+    """
+    acc = find_account("youtube", account_id)
+
+    if acc is None:
+        error(f"YouTube account {account_id} not found.")
+        return False
+
+    if get_verbose():
+        info("Initializing YouTube...")
+
+    youtube = YouTube(
+        acc["id"],
+        acc["nickname"],
+        acc["firefox_profile"],
+        acc["niche"],
+        acc["language"]
+    )
+
+    # Nobody approves drafts here, so render for publishing right away
+    youtube.generate_video(get_tts(), profile="publish")
+    uploaded = youtube.upload_video()
+
+    if uploaded and get_verbose():
+        success("Uploaded Short.")
+
+    return bool(uploaded)
+
+def resume_youtube_job(job_id: str, promote: bool = False) -> bool:
+    """
+    Continues a YouTube job from its first incomplete stage, up to the upload.
+
+    Args:
+        job_id (str): The job ID
+        promote (bool): Whether to render a draft again for publishing and upload it
+
+    Returns:
+        success (bool): False if the account doesn't exist, the job is an unapproved draft or the upload failed
+    """
+    job = Job.load(job_id)
+    acc = find_account("youtube", job.record["account_id"])
+
+    if acc is None:
+        error(f"YouTube account {job.record['account_id']} not found.")
+        return False
+
+    youtube = YouTube(
+        acc["id"],
+        acc["nickname"],
+        acc["firefox_profile"],
+        acc["niche"],
+        acc["language"]
+    )
+
+    # Only load the TTS models, if the speech still has to be generated
+    next_stage = job.get_next_stage()
+    needs_tts = next_stage is not None and Job.STAGES.index(next_stage) <= Job.STAGES.index("tts")
+
+    info(f" => Resuming job {job_id} at stage: {next_stage}")
+
+    return youtube.resume(get_tts() if needs_tts else None, job_id, promote)
+
+def run_job(purpose: str, account_id: str, count: int = 1) -> bool:
+    """
+    Runs the job of a purpose for an account.
+
+    Args:
+        purpose (str): `twitter` or `youtube`
+        account_id (str): The account UUID
+        count (int): Amount of posts (Twitter only)
+
+    Returns:
+        success (bool): True if the job succeeded
+    """
+    if purpose not in ["twitter", "youtube"]:
+        error(f"Invalid Purpose: {purpose}")
+        return False
+
+    # Jobs of the same account wait for each other (jobs_per_account)
+    with limit(f"account:{account_id}"):
+        if purpose == "twitter":
+            return run_twitter_job(account_id, count)
+
+        return run_youtube_job(account_id)
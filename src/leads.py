@@ -0,0 +1,183 @@
+# Remembers every scraped business across outreach runs, so it is only processed once.
+import re
+import time
+import sqlite3
+
+from cache import *
+from crawler import normalize_domain, is_shared_host
+
+# States of a lead, in the order they are usually reached
+LEAD_STATES = ["new", "crawled", "no-email", "emailed", "bounced"]
+
+# Leads in these states are skipped by later runs
+FINAL_LEAD_STATES = ["no-email", "emailed", "bounced"]
+
+def normalize_name(name: str) -> str:
+    """
+    Normalizes the name of a business, e.g. `  Joe's  Pizza ` and `joe's pizza`.
+
+    Args:
+        name (str): The name
+
+    Returns:
+        name (str): The normalized name
+    """
+    return re.sub(r"\s+", " ", name).strip().lower()
+
+class LeadIndex:
+    """
+    Persistent index of scraped businesses and their outreach state, stored
+    in SQLite next to the send log. A business is identified by its place ID;
+    without one by the domain of its website (unless the website is on a
+    shared host like facebook.com), and without either by its name.
+    Every lookup is an indexed query, regardless of the amount of leads.
+    """
+    def __init__(self, path: str = None) -> None:
+        """
+        Initializes the LeadIndex.
+
+        Args:
+            path (str): Path to the database, defaults to `.mp/outreach.db`
+
+        Returns:
+            None
+        """
+        self._path = path or get_outreach_db_path()
+
+        connection = self.connect()
+        connection.execute("""
+            CREATE TABLE IF NOT EXISTS leads (
+                id INTEGER PRIMARY KEY,
+                place_id TEXT,
+                domain TEXT,
+                name TEXT,
+                state TEXT NOT NULL,
+                email TEXT,
+                updated REAL NOT NULL
+            )
+        """)
+        connection.execute("CREATE INDEX IF NOT EXISTS leads_place_id ON leads (place_id)")
+        connection.execute("CREATE INDEX IF NOT EXISTS leads_domain ON leads (domain)")
+        connection.execute("CREATE INDEX IF NOT EXISTS leads_name ON leads (name)")
+
+    def connect(self) -> sqlite3.Connection:
+        """
+        Gets the connection of the current thread.
+
+        Returns:
+            connection (sqlite3.Connection): The connection
+        """
+        return get_db_connection(self._path)
+
+    def get_key(self, name: str, website: str = "", place_id: str = "") -> dict:
+        """
+        Gets the normalized key of a business.
+
+        Args:
+            name (str): The name of the business
+            website (str): The website of the business
+            place_id (str): The Google Maps place ID of the business
+
+        Returns:
+            key (dict): `place_id`, `domain` and `name`
+        """
+        return {
+            "place_id": place_id.strip(),
+            "domain": normalize_domain(website) if website else "",
+            "name": normalize_name(name)
+        }
+
+    def get_column(self, key: dict) -> str:
+        """
+        Gets the column, that identifies a business with this key.
+
+        Args:
+            key (dict): The key of `get_key`
+
+        Returns:
+            column (str): `place_id`, `domain` or `name`, or None if the key has no identifier
+        """
+        # The place ID is authoritative, the other identifiers only count without it
+        if key["place_id"]:
+            return "place_id"
+        elif key["domain"] and not is_shared_host(key["domain"]):
+            return "domain"
+        elif key["name"]:
+            return "name"
+
+        return None
+
+    def find(self, key: dict) -> dict:
+        """
+        Finds a lead by its key.
+
+        Args:
+            key (dict): The key of `get_key`
+
+        Returns:
+            lead (dict): `id`, `state` and `email`, or None if the business is new
+        """
+        column = self.get_column(key)
+        if column is None:
+            return None
+
+        row = self.connect().execute(
+            f"SELECT id, state, email FROM leads WHERE {column} = ? LIMIT 1",
+            (key[column],)
+        ).fetchone()
+
+        if row is None:
+            return None
+
+        return {"id": row[0], "state": row[1], "email": row[2]}
+
+    def add(self, key: dict) -> int:
+        """
+        Adds a new lead.
+
+        Args:
+            key (dict): The key of `get_key`
+
+        Returns:
+            id (int): The ID of the lead, or None if the key has no identifier
+        """
+        if self.get_column(key) is None:
+            return None
+
+        cursor = self.connect().execute(
+            "INSERT INTO leads (place_id, domain, name, state, updated) VALUES (?, ?, ?, 'new', ?)",
+            (key["place_id"] or None, key["domain"] or None, key["name"] or None, time.time())
+        )
+
+        return cursor.lastrowid
+
+    def set_state(self, lead_id: int, state: str, email: str = None) -> None:
+        """
+        Sets the state of a lead.
+
+        Args:
+            lead_id (int): The ID of the lead
+            state (str): One of `LEAD_STATES`
+            email (str): The email address of the business, if known
+
+        Returns:
+            None
+        """
+        if state not in LEAD_STATES:
+            raise ValueError(f"Invalid lead state: {state}")
+
+        self.connect().execute(
+            "UPDATE leads SET state = ?, email = COALESCE(?, email), updated = ? WHERE id = ?",
+            (state, email, time.time(), lead_id)
+        )
+
+    def get_counts(self) -> dict:
+        """
+        Gets the amount of leads in every state.
+
+        Returns:
+            counts (dict): Amount of leads by state
+        """
+        rows = self.connect().execute("SELECT state, COUNT(*) FROM leads GROUP BY state").fetchall()
+
+        return {state: count for state, count in rows}
@@ -0,0 +1,111 @@
+# Limits, that all jobs of this process share (renders, browsers, LLM and image requests).
+import threading
+
+from config import *
+from typing import Dict
+from contextlib import contextmanager
+
+class Limit:
+    """
+    Counting semaphore, that knows how many slots are in use and how many threads wait for one.
+    """
+    def __init__(self, name: str, capacity: int) -> None:
+        """
+        Initializes the Limit.
+
+        Args:
+            name (str): Name of the limit
+            capacity (int): Maximum amount of holders at the same time
+
+        Returns:
+            None
+        """
+        self.name = name
+        self.capacity = max(1, capacity)
+        self.in_use = 0
+        self.waiting = 0
+        self._condition = threading.Condition()
+
+    def acquire(self) -> None:
+        """
+        Takes a slot, blocks until one is free.
+
+        Returns:
+            None
+        """
+        with self._condition:
+            self.waiting += 1
+            try:
+                self._condition.wait_for(lambda: self.in_use < self.capacity)
+            finally:
+                self.waiting -= 1
+
+            self.in_use += 1
+
+    def release(self) -> None:
+        """
+        Frees a slot.
+
+        Returns:
+            None
+        """
+        with self._condition:
+            self.in_use -= 1
+            self._condition.notify()
+
+# Limits of this process, created on first use
+_limits_lock = threading.Lock()
+_limits: Dict[str, Limit] = {}
+
+def get_limit(name: str) -> Limit:
+    """
+    Gets a limit by name. Global limits are configured in `limits`, every
+    `account:<uuid>` limit gets `jobs_per_account` slots.
+
+    Args:
+        name (str): Name of the limit, e.g. `renders` or `account:<uuid>`
+
+    Returns:
+        limit (Limit): The limit
+    """
+    with _limits_lock:
+        if name not in _limits:
+            limits = get_limits()
+            key = "jobs_per_account" if name.startswith("account:") else name
+            _limits[name] = Limit(name, limits.get(key, 1))
+
+        return _limits[name]
+
+@contextmanager
+def limit(name: str):
+    """
+    Holds a slot of a limit while the block runs.
+
+    Args:
+        name (str): Name of the limit
+
+    Returns:
+        None
+    """
+    slot = get_limit(name)
+    slot.acquire()
+
+    try:
+        yield
+    finally:
+        slot.release()
+
+def get_limit_usage() -> Dict[str, dict]:
+    """
+    Gets the usage of the global limits, e.g. for progress output.
+
+    Returns:
+        usage (Dict[str, dict]): `in_use`, `waiting` and `capacity` by limit name
+    """
+    with _limits_lock:
+        limits = [l for name, l in _limits.items() if not name.startswith("account:")]
+
+    return {
+        l.name: {"in_use": l.in_use, "waiting": l.waiting, "capacity": l.capacity}
+        for l in limits
+    }
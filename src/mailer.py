@@ -0,0 +1,213 @@
+# Sends the outreach emails of a campaign over a pool of SMTP connections, once per recipient.
+import time
+import queue
+import sqlite3
+import yagmail
+import threading
+
+from cache import *
+from status import *
+from config import *
+from ratelimit import acquire_rate_limit
+
+# Optional keys of the `email` config, that are passed on to yagmail
+SMTP_OPTIONS = ["smtp_ssl", "smtp_starttls", "smtp_skip_login"]
+
+# Seconds after which a claim, that was neither sent nor released, can be claimed again
+STALE_CLAIM_SECONDS = 15 * 60
+
+class SendLog:
+    """
+    Persistent log of the sent outreach emails, by recipient and campaign,
+    stored in SQLite. A recipient is claimed before the email is sent, so
+    two workers (or two runs) never email the same business twice. Claims
+    of a run, that died while sending, expire after `STALE_CLAIM_SECONDS`.
+    """
+    def __init__(self, path: str = None) -> None:
+        """
+        Initializes the SendLog.
+
+        Args:
+            path (str): Path to the database, defaults to `.mp/outreach.db`
+
+        Returns:
+            None
+        """
+        self._path = path or get_outreach_db_path()
+
+        self.connect().execute("""
+            CREATE TABLE IF NOT EXISTS sent (
+                recipient TEXT NOT NULL,
+                campaign TEXT NOT NULL,
+                state TEXT NOT NULL,
+                updated REAL NOT NULL,
+                PRIMARY KEY (recipient, campaign)
+            )
+        """)
+
+    def connect(self) -> sqlite3.Connection:
+        """
+        Gets the connection of the current thread.
+
+        Returns:
+            connection (sqlite3.Connection): The connection
+        """
+        return get_db_connection(self._path)
+
+    def claim(self, recipient: str, campaign: str) -> bool:
+        """
+        Claims a recipient for a campaign, before the email is sent.
+
+        Args:
+            recipient (str): The email address
+            campaign (str): The campaign
+
+        Returns:
+            claimed (bool): False if the recipient was already emailed (or is being emailed)
+        """
+        connection = self.connect()
+        now = time.time()
+
+        stale = connection.execute(
+            "DELETE FROM sent WHERE recipient = ? AND campaign = ? AND state = 'sending' AND updated < ?",
+            (recipient.lower(), campaign, now - STALE_CLAIM_SECONDS)
+        )
+        if stale.rowcount == 1:
+            warning(f" => Reclaiming the stale claim of {recipient}, it may have been emailed already.")
+
+        cursor = connection.execute(
+            "INSERT OR IGNORE INTO sent (recipient, campaign, state, updated) VALUES (?, ?, 'sending', ?)",
+            (recipient.lower(), campaign, now)
+        )
+
+        return cursor.rowcount == 1
+
+    def mark_sent(self, recipient: str, campaign: str) -> None:
+        """
+        Marks the email to a recipient as sent.
+
+        Args:
+            recipient (str): The email address
+            campaign (str): The campaign
+
+        Returns:
+            None
+        """
+        self.connect().execute(
+            "UPDATE sent SET state = 'sent', updated = ? WHERE recipient = ? AND campaign = ?",
+            (time.time(), recipient.lower(), campaign)
+        )
+
+    def release(self, recipient: str, campaign: str) -> None:
+        """
+        Releases the claim of a recipient, after sending failed, so a later run retries it.
+
+        Args:
+            recipient (str): The email address
+            campaign (str): The campaign
+
+        Returns:
+            None
+        """
+        self.connect().execute(
+            "DELETE FROM sent WHERE recipient = ? AND campaign = ? AND state = 'sending'",
+            (recipient.lower(), campaign)
+        )
+
+class Mailer:
+    """
+    Sends the emails of one campaign. The subject and body templates are
+    loaded once, up to `connections` SMTP connections are reused across
+    threads, and the `outreach_email` rate limit is shared with every other
+    process. Recipients, that the send log has for the campaign, are skipped.
+    """
+    def __init__(self, campaign: str = None, connections: int = None, send_log: SendLog = None) -> None:
+        """
+        Initializes the Mailer.
+
+        Args:
+            campaign (str): The campaign, defaults to `outreach_campaign`
+            connections (int): SMTP connections at most, defaults to `outreach_mail_connections`
+            send_log (SendLog): The send log, defaults to `.mp/outreach.db`
+
+        Returns:
+            None
+        """
+        self.campaign = campaign or get_outreach_campaign()
+        self.connections = connections or get_outreach_mail_connections()
+        self.send_log = send_log or SendLog()
+
+        self.subject_template = get_outreach_message_subject()
+        with open(get_outreach_message_body_file(), "r") as file:
+            self.body_template = file.read()
+
+        self._credentials = get_email_credentials()
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.connections)
+
+    def open_connection(self) -> yagmail.SMTP:
+        """
+        Opens an SMTP connection with the configured credentials.
+
+        Returns:
+            connection (yagmail.SMTP): The connection
+        """
+        creds = self._credentials
+        options = {key: creds[key] for key in SMTP_OPTIONS if key in creds}
+
+        return yagmail.SMTP(user=creds["username"], password=creds["password"], host=creds["smtp_server"], port=creds["smtp_port"], **options)
+
+    def send(self, recipient: str, company_name: str) -> bool:
+        """
+        Sends the campaign email to a business, unless it was already emailed.
+
+        Args:
+            recipient (str): The email address
+            company_name (str): The name of the business, replaces `{{COMPANY_NAME}}`
+
+        Returns:
+            sent (bool): True if the email was sent, False if the recipient was skipped
+        """
+        if not self.send_log.claim(recipient, self.campaign):
+            return False
+
+        subject = self.subject_template.replace("{{COMPANY_NAME}}", company_name)
+        body = self.body_template.replace("{{COMPANY_NAME}}", company_name)
+
+        try:
+            acquire_rate_limit("outreach_email")
+
+            with self._slots:
+                try:
+                    connection = self._idle.get_nowait()
+                except queue.Empty:
+                    connection = self.open_connection()
+
+                try:
+                    connection.send(to=recipient, subject=subject, contents=body)
+                except Exception:
+                    # The connection may be broken, the next email opens a new one
+                    connection.close()
+                    raise
+
+                self._idle.put(connection)
+        except Exception:
+            self.send_log.release(recipient, self.campaign)
+            raise
+
+        self.send_log.mark_sent(recipient, self.campaign)
+
+        return True
+
+    def close(self) -> None:
+        """
+        Closes every idle SMTP connection.
+
+        Returns:
+            None
+        """
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
@@ -1,6 +1,3 @@
-import schedule
-import subprocess
-
 from art import *
 from cache import *
 from utils import *
@@ -112,9 +109,20 @@ def main():
 
                     if user_input == 1:
                         youtube.generate_video(tts)
+
+                        if youtube.render_profile == "draft":
+                            info(f" => Draft: {youtube.video_path}")
+                            approve_draft = question("Do you approve this draft? It will be rendered for publishing. (Yes/No): ")
+                            if approve_draft.lower() != "yes":
+                                youtube.job.remove()
+                                continue
+                            youtube.promote_draft()
+
                         upload_to_yt = question("Do you want to upload this video to YouTube? (Yes/No): ")
                         if upload_to_yt.lower() == "yes":
                             youtube.upload_video()
+                        else:
+                            youtube.job.skip_upload()
                     elif user_input == 2:
                         videos = youtube.get_videos()
 
@@ -143,21 +151,14 @@ def main():
 
                         user_input = int(question("Select an Option: "))
 
-                        cron_script_path = os.path.join(ROOT_DIR, "src", "cron.py")
-                        command = f"python {cron_script_path} youtube {selected_account['id']}"
-
-                        def job():
-                            subprocess.run(command)
-
-                        if user_input == 1:
-                            # Upload Once
-                            schedule.every(1).day.do(job)
-                            success("Set up CRON Job.")
-                        elif user_input == 2:
-                            # Upload Twice a day
-                            schedule.every().day.at("10:00").do(job)
-                            schedule.every().day.at("16:00").do(job)
-                            success("Set up CRON Job.")
+                        if 1 <= user_input <= len(CRON_TIMES):
+                            set_scheduled_job({
+                                "id": str(uuid4()),
+                                "purpose": "youtube",
+                                "account_id": selected_account["id"],
+                                "times": CRON_TIMES[user_input - 1]
+                            })
+                            success("Set up CRON Job. Run `python src/scheduler.py` to run it.")
                         else:
                             break
                     elif user_input == 4:
@@ -224,7 +225,13 @@ def main():
                     user_input = int(question("Select an option: "))
 
                     if user_input == 1:
-                        twitter.post()
+                        count = question("How many posts? (Default: 1): ").strip()
+                        count = int(count) if count.isdigit() else 1
+
+                        if count > 1:
+                            twitter.post_batch(count=count)
+                        else:
+                            twitter.post()
                     elif user_input == 2:
                         posts = twitter.get_posts()
 
@@ -251,27 +258,14 @@ def main():
 
                         user_input = int(question("Select an Option: "))
 
-                        cron_script_path = os.path.join(ROOT_DIR, "src", "cron.py")
-                        command = f"python {cron_script_path} twitter {selected_account['id']}"
-
-                        def job():
-                            subprocess.run(command)
-
-                        if user_input == 1:
-                            # Post Once a day
-                            schedule.every(1).day.do(job)
-                            success("Set up CRON Job.")
-                        elif user_input == 2:
-                            # Post twice a day
-                            schedule.every().day.at("10:00").do(job)
-                            schedule.every().day.at("16:00").do(job)
-                            success("Set up CRON Job.")
-                        elif user_input == 3:
-                            # Post thrice a day
-                            schedule.every().day.at("08:00").do(job)
-                            schedule.every().day.at("12:00").do(job)
-                            schedule.every().day.at("18:00").do(job)
-                            success("Set up CRON Job.")
+                        if 1 <= user_input <= len(CRON_TIMES):
+                            set_scheduled_job({
+                                "id": str(uuid4()),
+                                "purpose": "twitter",
+                                "account_id": selected_account["id"],
+                                "times": CRON_TIMES[user_input - 1]
+                            })
+                            success("Set up CRON Job. Run `python src/scheduler.py` to run it.")
                         else:
                             break
 
@@ -0,0 +1,360 @@
+# Renders and uploads YouTube Shorts in two overlapping stages.
+import os
+import json
+import time
+import argparse
+import threading
+
+from cache import *
+from utils import *
+from status import *
+from config import *
+from uuid import uuid4
+from typing import List
+from datetime import datetime
+from jobs import get_tts
+from classes.Job import Job
+from classes.YouTube import YouTube
+
+class PersistentQueue:
+    """
+    FIFO queue, that is stored in a JSON file in the `.mp` folder.
+
+    Items are only removed once they are done, so nothing is lost if the
+    process dies. Items that were in progress at that time are queued again
+    when the queue is loaded.
+    """
+    def __init__(self, path: str) -> None:
+        """
+        Initializes the PersistentQueue.
+
+        Args:
+            path (str): Path to the JSON file
+
+        Returns:
+            None
+        """
+        self._path = path
+        self._condition = threading.Condition()
+        self._items = []
+
+        if os.path.exists(path):
+            with open(path, "r") as file:
+                self._items = json.load(file)["items"]
+
+        # Whatever was in progress, didn't finish
+        for item in self._items:
+            if item["state"] == "in_progress":
+                item["state"] = "pending"
+
+        self._save()
+
+    def _save(self) -> None:
+        """
+        Writes the queue to disk (atomically).
+
+        Returns:
+            None
+        """
+        tmp_path = self._path + ".tmp"
+
+        with open(tmp_path, "w") as file:
+            json.dump({"items": self._items}, file, indent=4)
+
+        os.replace(tmp_path, self._path)
+
+    def put(self, payload: dict) -> str:
+        """
+        Adds an item to the queue.
+
+        Args:
+            payload (dict): The item
+
+        Returns:
+            id (str): The ID of the item
+        """
+        with self._condition:
+            item_id = str(uuid4())
+            self._items.append({
+                "id": item_id,
+                "state": "pending",
+                "created": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "payload": payload
+            })
+            self._save()
+            self._condition.notify_all()
+
+            return item_id
+
+    def get(self, timeout: float = None) -> dict:
+        """
+        Takes the oldest pending item and marks it as in progress.
+
+        Args:
+            timeout (float): Seconds to wait for an item, waits forever if None
+
+        Returns:
+            item (dict): The item (`id` and `payload`), or None on timeout
+        """
+        with self._condition:
+            item = self._condition.wait_for(
+                lambda: next((i for i in self._items if i["state"] == "pending"), None),
+                timeout
+            )
+
+            if item is None:
+                return None
+
+            item["state"] = "in_progress"
+            self._save()
+
+            return item
+
+    def done(self, item_id: str) -> None:
+        """
+        Removes a finished item from the queue.
+
+        Args:
+            item_id (str): The ID of the item
+
+        Returns:
+            None
+        """
+        with self._condition:
+            self._items = [i for i in self._items if i["id"] != item_id]
+            self._save()
+            self._condition.notify_all()
+
+    def fail(self, item_id: str, reason: str) -> None:
+        """
+        Marks an item as failed. Failed items stay in the file, but are not retried.
+
+        Args:
+            item_id (str): The ID of the item
+            reason (str): Why the item failed
+
+        Returns:
+            None
+        """
+        with self._condition:
+            for item in self._items:
+                if item["id"] == item_id:
+                    item["state"] = "failed"
+                    item["error"] = reason
+            self._save()
+            self._condition.notify_all()
+
+    def update(self, item_id: str, payload: dict) -> None:
+        """
+        Adds keys to the payload of an item.
+
+        Args:
+            item_id (str): The ID of the item
+            payload (dict): The keys to add
+
+        Returns:
+            None
+        """
+        with self._condition:
+            for item in self._items:
+                if item["id"] == item_id:
+                    item["payload"].update(payload)
+            self._save()
+
+    def count(self, *states: str) -> int:
+        """
+        Counts the items in the given states.
+
+        Args:
+            states (str): The states, e.g. `pending`, `in_progress`
+
+        Returns:
+            count (int): The amount of items
+        """
+        with self._condition:
+            return len([i for i in self._items if i["state"] in states])
+
+    def wait_until_below(self, limit: int, *states: str) -> None:
+        """
+        Blocks until less than `limit` items are in the given states.
+
+        Args:
+            limit (int): The limit
+            states (str): The states
+
+        Returns:
+            None
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: len([i for i in self._items if i["state"] in states]) < limit)
+
+class Pipeline:
+    """
+    Two-stage pipeline for YouTube Shorts: render workers take jobs from the
+    render queue and put the finished videos on the upload queue, upload
+    workers (one browser session each) upload them. Rendering Short N+1
+    overlaps with uploading Short N. Rendering pauses while too many
+    videos are waiting for an upload.
+    """
+    def __init__(self) -> None:
+        """
+        Initializes the Pipeline.
+
+        Returns:
+            None
+        """
+        self.render_queue = PersistentQueue(get_render_queue_path())
+        self.upload_queue = PersistentQueue(get_upload_queue_path())
+
+        self._accounts = {account["id"]: account for account in get_accounts("youtube")}
+        self._rendering_finished = threading.Event()
+
+    def get_youtube(self, account_id: str) -> YouTube:
+        """
+        Creates the YouTube bot of an account.
+
+        Args:
+            account_id (str): The account UUID
+
+        Returns:
+            youtube (YouTube): The bot
+        """
+        account = self._accounts[account_id]
+
+        return YouTube(
+            account["id"],
+            account["nickname"],
+            account["firefox_profile"],
+            account["niche"],
+            account["language"]
+        )
+
+    def enqueue(self, account_ids: List[str], count: int) -> None:
+        """
+        Queues `count` Shorts for every account.
+
+        Args:
+            account_ids (List[str]): The account UUIDs
+            count (int): Shorts per account
+
+        Returns:
+            None
+        """
+        for _ in range(count):
+            for account_id in account_ids:
+                if account_id not in self._accounts:
+                    error(f"Account {account_id} not found, skipping...")
+                    continue
+
+                self.render_queue.put({"account_id": account_id})
+
+    def render_worker(self) -> None:
+        """
+        Renders queued Shorts until the render queue is empty.
+
+        Returns:
+            None
+        """
+        while True:
+            # Backpressure: don't render further ahead than the uploads can follow
+            self.upload_queue.wait_until_below(get_max_pending_uploads(), "pending")
+
+            item = self.render_queue.get(timeout=0)
+            if item is None:
+                return
+
+            account_id = item["payload"]["account_id"]
+            job_id = item["payload"].get("job_id")
+
+            try:
+                youtube = self.get_youtube(account_id)
+
+                if job_id is None:
+                    # Remember the job before rendering, so an interrupted render is resumed, not started again
+                    job_id = Job.create(account_id, "publish").id
+                    self.render_queue.update(item["id"], {"job_id": job_id})
+                    info(f" => Rendering Short for {account_id}...")
+                else:
+                    info(f" => Resuming job {job_id} for {account_id}...")
+
+                youtube.generate_video(get_tts(), profile="publish", job_id=job_id)
+
+                # The video stays in the job folder, until it has been uploaded
+                self.upload_queue.put({
+                    "account_id": account_id,
+                    "job_id": job_id
+                })
+                self.render_queue.done(item["id"])
+            except Exception as e:
+                error(f" => Failed to render Short for {account_id}: {str(e)}")
+                self.render_queue.fail(item["id"], str(e))
+
+    def upload_worker(self) -> None:
+        """
+        Uploads rendered Shorts until rendering has finished and the upload queue is empty.
+
+        Returns:
+            None
+        """
+        while True:
+            item = self.upload_queue.get(timeout=1)
+
+            if item is None:
+                if self._rendering_finished.is_set() and self.upload_queue.count("pending") == 0:
+                    return
+                continue
+
+            payload = item["payload"]
+
+            try:
+                info(f" => Uploading Short for {payload['account_id']}...")
+
+                youtube = self.get_youtube(payload["account_id"])
+                youtube.load_job(payload["job_id"])
+
+                if youtube.upload_video():
+                    self.upload_queue.done(item["id"])
+                else:
+                    self.upload_queue.fail(item["id"], "Upload failed")
+            except Exception as e:
+                error(f" => Failed to upload Short for {payload['account_id']}: {str(e)}")
+                self.upload_queue.fail(item["id"], str(e))
+
+    def run(self) -> None:
+        """
+        Runs the render and upload workers until both queues are drained.
+
+        Returns:
+            None
+        """
+        render_threads = [threading.Thread(target=self.render_worker) for _ in range(get_render_workers())]
+        upload_threads = [threading.Thread(target=self.upload_worker) for _ in range(get_upload_workers())]
+
+        for thread in render_threads + upload_threads:
+            thread.start()
+
+        for thread in render_threads:
+            thread.join()
+
+        self._rendering_finished.set()
+
+        for thread in upload_threads:
+            thread.join()
+
+        success(f" => Pipeline finished. Failed renders: {self.render_queue.count('failed')}, failed uploads: {self.upload_queue.count('failed')}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Render and upload YouTube Shorts in a pipeline.")
+    parser.add_argument("accounts", nargs="*", help="YouTube account UUIDs")
+    parser.add_argument("--count", type=int, default=1, help="Shorts per account, 0 to only finish queued jobs")
+    args = parser.parse_args()
+
+    assert_folder_structure()
+    fetch_songs()
+
+    pipeline = Pipeline()
+    pipeline.enqueue(args.accounts, args.count)
+    pipeline.run()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+# Token-bucket rate limits, that every process of this installation shares (stored in SQLite).
+import time
+import sqlite3
+
+from cache import *
+from status import *
+from config import *
+from typing import List, Tuple
+
+class RateLimitError(RuntimeError):
+    """
+    Raised, if a rate limit is exhausted and the caller doesn't want to wait.
+    """
+    def __init__(self, bucket: str, retry_after: float) -> None:
+        """
+        Initializes the RateLimitError.
+
+        Args:
+            bucket (str): The exhausted bucket
+            retry_after (float): Estimated seconds until a token is available
+
+        Returns:
+            None
+        """
+        super().__init__(f"Rate limit of {bucket} exhausted, retry in {retry_after:.1f}s")
+        self.bucket = bucket
+        self.retry_after = retry_after
+
+def connect() -> sqlite3.Connection:
+    """
+    Gets the connection of the current thread to the rate limit database
+    and creates the table, if needed.
+
+    Returns:
+        connection (sqlite3.Connection): The connection
+    """
+    # Transactions are started explicitly (BEGIN IMMEDIATE)
+    connection = get_db_connection(get_rate_limit_db_path())
+    connection.execute("""
+        CREATE TABLE IF NOT EXISTS buckets (
+            name TEXT PRIMARY KEY,
+            tokens REAL NOT NULL,
+            updated REAL NOT NULL
+        )
+    """)
+
+    return connection
+
+def get_buckets(provider: str, account_id: str = None) -> List[Tuple[str, float, float]]:
+    """
+    Gets the configured buckets, that a request to a provider takes a token from.
+
+    Args:
+        provider (str): The provider, e.g. `llm`, `images` or `youtube_upload`
+        account_id (str): The account, that makes the request
+
+    Returns:
+        buckets (List[Tuple[str, float, float]]): Name, tokens per second and burst of every bucket
+    """
+    config = get_rate_limits().get(provider)
+    if not config:
+        return []
+
+    buckets = []
+
+    if config.get("per_minute"):
+        buckets.append((provider, config["per_minute"] / 60, config.get("burst", 1)))
+
+    per_account = config.get("per_account")
+    if account_id and per_account and per_account.get("per_minute"):
+        buckets.append((f"{provider}:{account_id}", per_account["per_minute"] / 60, per_account.get("burst", 1)))
+
+    return buckets
+
+def try_acquire(buckets: List[Tuple[str, float, float]]) -> Tuple[float, str]:
+    """
+    Takes a token from every bucket, but only if all of them have one (atomically, across processes).
+
+    Args:
+        buckets (List[Tuple[str, float, float]]): The buckets
+
+    Returns:
+        wait (float): 0 if the tokens were taken, otherwise the seconds until all buckets have a token
+        bucket (str): The bucket, that has to be waited for (None if the tokens were taken)
+    """
+    connection = connect()
+
+    try:
+        # Locks the database for writing, until the transaction ends
+        connection.execute("BEGIN IMMEDIATE")
+
+        now = time.time()
+        states = []
+
+        for name, rate, burst in buckets:
+            row = connection.execute("SELECT tokens, updated FROM buckets WHERE name = ?", (name,)).fetchone()
+
+            # New buckets start full
+            tokens = burst if row is None else min(burst, row[0] + (now - row[1]) * rate)
+            states.append((name, tokens, rate))
+
+        wait, exhausted = max([((1 - tokens) / rate, name) for name, tokens, rate in states if tokens < 1], default=(0, None))
+
+        for name, tokens, _ in states:
+            if wait == 0:
+                tokens -= 1
+            connection.execute(
+                "INSERT OR REPLACE INTO buckets (name, tokens, updated) VALUES (?, ?, ?)",
+                (name, tokens, now)
+            )
+
+        connection.execute("COMMIT")
+
+        return wait, exhausted
+    except Exception:
+        connection.execute("ROLLBACK")
+        raise
+
+def acquire_rate_limit(provider: str, account_id: str = None, block: bool = True, timeout: float = None) -> float:
+    """
+    Takes a token from the buckets of a provider (and of the account), before making a request.
+
+    Args:
+        provider (str): The provider, e.g. `llm`, `images` or `youtube_upload`
+        account_id (str): The account, that makes the request
+        block (bool): Wait for a token, otherwise raise a RateLimitError right away
+        timeout (float): Maximum seconds to wait, waits as long as needed if None
+
+    Returns:
+        waited (float): Seconds waited for the token
+    """
+    buckets = get_buckets(provider, account_id)
+    if not buckets:
+        return 0
+
+    start = time.time()
+
+    while True:
+        wait, bucket = try_acquire(buckets)
+        if wait == 0:
+            return time.time() - start
+
+        waited = time.time() - start
+        if not block or (timeout is not None and waited + wait > timeout):
+            raise RateLimitError(bucket, wait)
+
+        if get_verbose():
+            info(f" => Rate limit of {bucket} reached, waiting {wait:.1f}s...")
+
+        time.sleep(wait)
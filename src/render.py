@@ -0,0 +1,583 @@
+import os
+import tempfile
+import subprocess
+import numpy as np
+
+from typing import List
+from status import *
+from config import *
+from constants import RENDER_PROFILES
+from PIL import Image, ImageFont
+from moviepy.config import get_setting
+from classes.Subtitles import get_subtitle_rasterizer
+from concurrent.futures import ProcessPoolExecutor
+from moviepy.video.tools.subtitles import file_to_subtitles
+
+# Output size of a YouTube Short
+VIDEO_WIDTH = 1080
+VIDEO_HEIGHT = 1920
+VIDEO_FPS = 30
+
+# libass renders SRT files on a 384x288 canvas and scales it to the video,
+# so style values have to be given relative to that canvas.
+LIBASS_PLAY_RES_Y = 288
+
+def get_render_profile_settings(name: str = None) -> dict:
+    """
+    Gets the settings of a render profile.
+
+    Args:
+        name (str): Name of the profile, defaults to the configured profile
+
+    Returns:
+        profile (dict): The render profile
+    """
+    name = name or get_render_profile()
+
+    if name not in RENDER_PROFILES:
+        warning(f"Unknown render profile \"{name}\", using \"publish\" instead.")
+        name = "publish"
+
+    return {"name": name, **RENDER_PROFILES[name]}
+
+def get_ffmpeg_binary() -> str:
+    """
+    Gets the ffmpeg binary MoviePy is configured with.
+
+    Returns:
+        path (str): The path to the ffmpeg binary
+    """
+    try:
+        return get_setting("FFMPEG_BINARY")
+    except Exception:
+        return "ffmpeg"
+
+def escape_filter_value(value: str) -> str:
+    """
+    Escapes a value (e.g. a path), so that it can be used as an option inside a filter graph.
+
+    Args:
+        value (str): The value to escape
+
+    Returns:
+        escaped (str): The quoted & escaped value
+    """
+    value = value.replace("\\", "/").replace(":", "\\:").replace("'", "\\'")
+
+    return f"'{value}'"
+
+def build_subtitles_filter(subtitles_path: str, height: int = VIDEO_HEIGHT) -> str:
+    """
+    Builds the `subtitles` filter, styled like the MoviePy captions
+    (yellow, black outline, centered).
+
+    Args:
+        subtitles_path (str): The path to the SRT file
+        height (int): The height of the output video
+
+    Returns:
+        filter (str): The subtitles filter
+    """
+    font_path = os.path.join(get_fonts_dir(), get_font())
+    font_name = ImageFont.truetype(font_path).getname()[0]
+
+    scale = LIBASS_PLAY_RES_Y / height
+    style = ",".join([
+        f"FontName={font_name}",
+        f"FontSize={round(100 * scale)}",
+        "PrimaryColour=&H0000FFFF",
+        "OutlineColour=&H00000000",
+        "BorderStyle=1",
+        f"Outline={round(5 * scale, 2)}",
+        "Shadow=0",
+        "Alignment=5",
+    ])
+
+    return f"subtitles=filename={escape_filter_value(subtitles_path)}" \
+           f":fontsdir={escape_filter_value(get_fonts_dir())}" \
+           f":force_style='{style}'"
+
+def build_audio_filter(tts_input: int, song_input: int) -> str:
+    """
+    Builds the part of the filter graph, that mixes the TTS with the (turned down) song.
+
+    Args:
+        tts_input (int): Input index of the TTS
+        song_input (int): Input index of the song
+
+    Returns:
+        graph (str): The audio filter chains, labeled [audio]
+    """
+    # `amix` divides every input by the amount of inputs,
+    # `volume=2` turns it back into a plain sum like MoviePy does.
+    return f"[{tts_input}:a]aresample=44100[tts];" \
+           f"[{song_input}:a]volume=0.1,aresample=44100[song];" \
+           f"[tts][song]amix=inputs=2:duration=first:dropout_transition=0,volume=2[audio]"
+
+def build_filter_graph(n_images: int, subtitles_path: str, width: int = VIDEO_WIDTH, height: int = VIDEO_HEIGHT) -> str:
+    """
+    Builds the `filter_complex` graph for the slideshow.
+
+    Inputs 0..n-1 are the images, n is the TTS and n+1 is the song.
+
+    Args:
+        n_images (int): Amount of images
+        subtitles_path (str): The path to the SRT file
+        width (int): Width of the video
+        height (int): Height of the video
+
+    Returns:
+        graph (str): The filter graph
+    """
+    chains = []
+
+    # Crop every image to 9:16 around its center, then scale it to the video size
+    for i in range(n_images):
+        chains.append(
+            f"[{i}:v]crop=w='min(iw,ih*9/16)':h='min(ih,iw*16/9)',"
+            f"scale={width}:{height},setsar=1,fps={VIDEO_FPS},format=yuv420p[v{i}]"
+        )
+
+    slides = "".join(f"[v{i}]" for i in range(n_images))
+    chains.append(f"{slides}concat=n={n_images}:v=1:a=0[slides]")
+
+    # Burn in the subtitles
+    chains.append(f"[slides]{build_subtitles_filter(subtitles_path, height)}[video]")
+
+    chains.append(build_audio_filter(n_images, n_images + 1))
+
+    return ";".join(chains)
+
+def build_video_encoder_args(profile: dict) -> List[str]:
+    """
+    Builds the video encoder arguments for a render profile.
+
+    Args:
+        profile (dict): The render profile
+
+    Returns:
+        args (List[str]): The video encoder arguments
+    """
+    args = ["-c:v", "libx264", "-preset", profile["preset"], "-pix_fmt", "yuv420p"]
+
+    if profile["video_bitrate"]:
+        args += ["-b:v", profile["video_bitrate"]]
+    if profile["crf"] is not None:
+        args += ["-crf", str(profile["crf"])]
+
+    return args
+
+def build_audio_encoder_args(profile: dict) -> List[str]:
+    """
+    Builds the audio encoder arguments for a render profile.
+
+    Args:
+        profile (dict): The render profile
+
+    Returns:
+        args (List[str]): The audio encoder arguments
+    """
+    args = ["-c:a", "aac"]
+
+    if profile["audio_bitrate"]:
+        args += ["-b:a", profile["audio_bitrate"]]
+
+    return args
+
+def build_encoder_args(threads: int, profile: dict) -> List[str]:
+    """
+    Builds the encoder arguments, that every ffmpeg based backend uses for its output.
+
+    Args:
+        threads (int): Amount of threads ffmpeg may use
+        profile (dict): The render profile
+
+    Returns:
+        args (List[str]): The encoder arguments
+    """
+    return [
+        *build_video_encoder_args(profile),
+        *build_audio_encoder_args(profile),
+        "-movflags", "+faststart",
+        "-threads", str(threads),
+    ]
+
+def build_ffmpeg_command(images: List[str], tts_path: str, song_path: str, subtitles_path: str, duration: float, output_path: str, threads: int, profile: dict) -> List[str]:
+    """
+    Builds the ffmpeg command, that renders the whole Short in one go.
+
+    Args:
+        images (List[str]): Paths to the images
+        tts_path (str): Path to the TTS
+        song_path (str): Path to the background song
+        subtitles_path (str): Path to the SRT file
+        duration (float): Duration of the video (duration of the TTS)
+        output_path (str): Path to write the MP4 to
+        threads (int): Amount of threads ffmpeg may use
+        profile (dict): The render profile
+
+    Returns:
+        command (List[str]): The command
+    """
+    slide_duration = duration / len(images)
+
+    command = [get_ffmpeg_binary(), "-y", "-hide_banner", "-loglevel", "error"]
+
+    for image_path in images:
+        command += ["-loop", "1", "-framerate", str(VIDEO_FPS), "-t", f"{slide_duration:.3f}", "-i", image_path]
+
+    command += ["-i", tts_path]
+    # Loop the song, in case it is shorter than the TTS
+    command += ["-stream_loop", "-1", "-i", song_path]
+
+    command += [
+        "-filter_complex", build_filter_graph(len(images), subtitles_path, profile["width"], profile["height"]),
+        "-map", "[video]",
+        "-map", "[audio]",
+        "-t", f"{duration:.3f}",
+        "-r", str(VIDEO_FPS),
+        *build_encoder_args(threads, profile),
+        output_path
+    ]
+
+    return command
+
+def render_with_ffmpeg(images: List[str], tts_path: str, song_path: str, subtitles_path: str, duration: float, output_path: str, threads: int, profile: dict) -> str:
+    """
+    Renders the Short with a single ffmpeg filter graph,
+    instead of generating every frame in Python.
+
+    Args:
+        images (List[str]): Paths to the images
+        tts_path (str): Path to the TTS
+        song_path (str): Path to the background song
+        subtitles_path (str): Path to the SRT file
+        duration (float): Duration of the video (duration of the TTS)
+        output_path (str): Path to write the MP4 to
+        threads (int): Amount of threads ffmpeg may use
+        profile (dict): The render profile
+
+    Returns:
+        path (str): The path to the generated MP4 File.
+    """
+    command = build_ffmpeg_command(images, tts_path, song_path, subtitles_path, duration, output_path, threads, profile)
+
+    if get_verbose():
+        info(f" => Rendering with ffmpeg: {len(images)} images, {duration:.2f}s")
+
+    run_ffmpeg(command)
+
+    return output_path
+
+def build_moviepy_args(profile: dict) -> dict:
+    """
+    Builds the keyword arguments for MoviePy's `write_videofile` for a render profile,
+    matching the arguments of the ffmpeg based backends.
+
+    Args:
+        profile (dict): The render profile
+
+    Returns:
+        args (dict): The keyword arguments
+    """
+    ffmpeg_params = ["-pix_fmt", "yuv420p"]
+
+    if profile["crf"] is not None:
+        ffmpeg_params += ["-crf", str(profile["crf"])]
+
+    return {
+        "codec": "libx264",
+        "preset": profile["preset"],
+        "bitrate": profile["video_bitrate"],
+        "audio_bitrate": profile["audio_bitrate"],
+        "ffmpeg_params": ffmpeg_params,
+    }
+
+def run_ffmpeg(command: List[str]) -> None:
+    """
+    Runs an ffmpeg command.
+
+    Args:
+        command (List[str]): The command
+
+    Raises:
+        RuntimeError: If ffmpeg fails
+
+    Returns:
+        None
+    """
+    result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+
+    if result.returncode != 0:
+        raise RuntimeError(f"ffmpeg exited with code {result.returncode}: {result.stderr.strip()[-500:]}")
+
+def fit_image(image_path: str, width: int = VIDEO_WIDTH, height: int = VIDEO_HEIGHT) -> Image.Image:
+    """
+    Crops an image to the aspect ratio of the video around its center and scales it to the video size.
+
+    Args:
+        image_path (str): Path to the image
+        width (int): Width of the video
+        height (int): Height of the video
+
+    Returns:
+        image (Image.Image): The fitted RGBA image
+    """
+    image = Image.open(image_path).convert("RGBA")
+    aspect = width / height
+
+    if image.width / image.height < aspect:
+        crop_w, crop_h = image.width, round(image.width / aspect)
+    else:
+        crop_w, crop_h = round(image.height * aspect), image.height
+
+    left = (image.width - crop_w) // 2
+    top = (image.height - crop_h) // 2
+    image = image.crop((left, top, left + crop_w, top + crop_h))
+
+    return image.resize((width, height), Image.LANCZOS)
+
+def build_still_timeline(n_images: int, subtitles: list, duration: float) -> List[tuple]:
+    """
+    Splits the video into intervals, in which nothing on screen changes.
+    A new interval only starts when the image or the caption changes.
+
+    Args:
+        n_images (int): Amount of images
+        subtitles (list): Subtitles as returned by `file_to_subtitles`
+        duration (float): Duration of the video
+
+    Returns:
+        timeline (List[tuple]): (start, end, image index, caption) for every interval
+    """
+    slide_duration = duration / n_images
+
+    # Snap every change to the frame grid, so that timestamps stay exact
+    snap = lambda t: round(min(max(t, 0), duration) * VIDEO_FPS) / VIDEO_FPS
+
+    changes = {0, snap(duration)}
+    changes.update(snap(i * slide_duration) for i in range(n_images))
+    for (start, end), _ in subtitles:
+        changes.update((snap(start), snap(end)))
+
+    changes = sorted(changes)
+    timeline = []
+
+    for start, end in zip(changes, changes[1:]):
+        middle = (start + end) / 2
+        image_index = min(int(middle / slide_duration), n_images - 1)
+        caption = next((text for (s, e), text in subtitles if s <= middle < e), None)
+
+        # Merge with the previous interval, if it looks the same
+        if timeline and timeline[-1][2:] == (image_index, caption):
+            timeline[-1] = (timeline[-1][0], end, image_index, caption)
+        else:
+            timeline.append((start, end, image_index, caption))
+
+    return timeline
+
+def render_stills(images: List[str], tts_path: str, song_path: str, subtitles_path: str, duration: float, output_path: str, threads: int, profile: dict) -> str:
+    """
+    Renders the Short as a variable frame rate video. Every interval in which
+    neither the image nor the caption changes is encoded as a single frame
+    with a duration (concat demuxer), instead of 30 identical frames per second.
+
+    Args:
+        images (List[str]): Paths to the images
+        tts_path (str): Path to the TTS
+        song_path (str): Path to the background song
+        subtitles_path (str): Path to the SRT file
+        duration (float): Duration of the video (duration of the TTS)
+        output_path (str): Path to write the MP4 to
+        threads (int): Amount of threads ffmpeg may use
+        profile (dict): The render profile
+
+    Returns:
+        path (str): The path to the generated MP4 File.
+    """
+    width, height = profile["width"], profile["height"]
+    rasterizer = get_subtitle_rasterizer(width)
+    timeline = build_still_timeline(len(images), file_to_subtitles(subtitles_path), duration)
+
+    if get_verbose():
+        info(f" => Rendering {len(timeline)} stills for {duration:.2f}s of video")
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        slides = {}
+        frames = {}
+        entries = []
+
+        for start, end, image_index, caption in timeline:
+            key = (image_index, caption)
+
+            if key not in frames:
+                if image_index not in slides:
+                    slides[image_index] = fit_image(images[image_index], width, height)
+
+                frame = slides[image_index]
+                if caption:
+                    overlay = rasterizer.render(caption)
+                    frame = frame.copy()
+                    frame.alpha_composite(overlay, ((width - overlay.width) // 2, (height - overlay.height) // 2))
+
+                frame_path = os.path.join(work_dir, f"{len(frames)}.png")
+                frame.convert("RGB").save(frame_path, compress_level=1)
+                frames[key] = frame_path
+
+            entries.append((frames[key], end - start))
+
+        # The concat demuxer ignores the duration of the last entry,
+        # unless the file is listed once more.
+        list_path = os.path.join(work_dir, "stills.txt")
+        with open(list_path, "w") as file:
+            for frame_path, frame_duration in entries:
+                file.write(f"file '{frame_path}'\nduration {frame_duration:.6f}\n")
+            file.write(f"file '{entries[-1][0]}'\n")
+
+        command = [
+            get_ffmpeg_binary(), "-y", "-hide_banner", "-loglevel", "error",
+            "-f", "concat", "-safe", "0", "-i", list_path,
+            "-i", tts_path,
+            "-stream_loop", "-1", "-i", song_path,
+            "-filter_complex", f"[0:v]format=yuv420p[video];{build_audio_filter(1, 2)}",
+            "-map", "[video]",
+            "-map", "[audio]",
+            "-t", f"{duration:.3f}",
+            "-vsync", "vfr",
+            *build_encoder_args(threads, profile),
+            output_path
+        ]
+
+        run_ffmpeg(command)
+
+    return output_path
+
+def render_segment(image_path: str, n_frames: int, captions: List[tuple], output_path: str, profile: dict) -> str:
+    """
+    Renders a single image (with its captions) into a video-only segment.
+    Runs inside a worker process of `render_parallel`.
+
+    Args:
+        image_path (str): Path to the image
+        n_frames (int): Length of the segment in frames
+        captions (List[tuple]): (start, end, text) of every caption, relative to the segment
+        output_path (str): Path to write the segment to
+        profile (dict): The render profile
+
+    Returns:
+        path (str): The path to the segment
+    """
+    from moviepy.editor import ImageClip, CompositeVideoClip
+
+    width, height = profile["width"], profile["height"]
+    rasterizer = get_subtitle_rasterizer(width)
+
+    # MoviePy writes int(duration * fps) frames, the half frame
+    # keeps floating point errors from dropping the last one.
+    duration = (n_frames + 0.5) / VIDEO_FPS
+
+    clips = [ImageClip(np.array(fit_image(image_path, width, height).convert("RGB"))).set_duration(duration)]
+    images = {}
+    for start, end, text in captions:
+        clips.append(
+            rasterizer.make_clip(text, images)
+                .set_start(start)
+                .set_end(end)
+                .set_position(("center", "center"))
+        )
+
+    segment = CompositeVideoClip(clips, size=(width, height)).set_duration(duration)
+
+    # Every segment has to be encoded with the exact same parameters,
+    # otherwise they can't be concatenated without re-encoding.
+    segment.write_videofile(
+        output_path,
+        fps=VIDEO_FPS,
+        audio=False,
+        threads=1,
+        logger=None,
+        **build_moviepy_args(profile)
+    )
+
+    return output_path
+
+def render_parallel(images: List[str], tts_path: str, song_path: str, subtitles_path: str, duration: float, output_path: str, threads: int, profile: dict) -> str:
+    """
+    Splits the Short into one segment per image, renders the segments
+    concurrently in a process pool, joins them with the concat demuxer
+    (without re-encoding) and muxes the audio once at the end.
+
+    Args:
+        images (List[str]): Paths to the images
+        tts_path (str): Path to the TTS
+        song_path (str): Path to the background song
+        subtitles_path (str): Path to the SRT file
+        duration (float): Duration of the video (duration of the TTS)
+        output_path (str): Path to write the MP4 to
+        threads (int): Amount of worker processes
+        profile (dict): The render profile
+
+    Returns:
+        path (str): The path to the generated MP4 File.
+    """
+    subtitles = file_to_subtitles(subtitles_path)
+    slide_duration = duration / len(images)
+
+    # Segment boundaries on the frame grid
+    boundaries = [round(i * slide_duration * VIDEO_FPS) for i in range(len(images))]
+    boundaries.append(round(duration * VIDEO_FPS))
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        jobs = []
+
+        for i, image_path in enumerate(images):
+            start, end = boundaries[i] / VIDEO_FPS, boundaries[i + 1] / VIDEO_FPS
+            if end <= start:
+                continue
+
+            # Captions overlapping this segment, relative to its start
+            captions = [
+                (max(s, start) - start, min(e, end) - start, text)
+                for (s, e), text in subtitles
+                if s < end and e > start
+            ]
+
+            segment_path = os.path.join(work_dir, f"segment_{i}.mp4")
+            jobs.append((image_path, boundaries[i + 1] - boundaries[i], captions, segment_path, profile))
+
+        if get_verbose():
+            info(f" => Rendering {len(jobs)} segments with {threads} workers")
+
+        with ProcessPoolExecutor(max_workers=max(1, min(threads, len(jobs)))) as executor:
+            segment_paths = list(executor.map(render_segment, *zip(*jobs)))
+
+        list_path = os.path.join(work_dir, "segments.txt")
+        with open(list_path, "w") as file:
+            for segment_path in segment_paths:
+                file.write(f"file '{segment_path}'\n")
+
+        command = [
+            get_ffmpeg_binary(), "-y", "-hide_banner", "-loglevel", "error",
+            "-f", "concat", "-safe", "0", "-i", list_path,
+            "-i", tts_path,
+            "-stream_loop", "-1", "-i", song_path,
+            "-filter_complex", build_audio_filter(1, 2),
+            "-map", "0:v",
+            "-map", "[audio]",
+            "-t", f"{duration:.3f}",
+            "-c:v", "copy",
+            *build_audio_encoder_args(profile),
+            "-movflags", "+faststart",
+            output_path
+        ]
+
+        run_ffmpeg(command)
+
+    return output_path
+
+# Backends, that can render a Short instead of MoviePy
+RENDER_BACKENDS = {
+    "ffmpeg": render_with_ffmpeg,
+    "vfr": render_stills,
+    "parallel": render_parallel,
+}
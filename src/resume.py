@@ -0,0 +1,68 @@
+# Lists and resumes YouTube jobs, that didn't finish.
+import sys
+import argparse
+
+from utils import *
+from status import *
+from config import *
+from classes.Job import get_jobs
+from termcolor import colored
+from prettytable import PrettyTable
+from jobs import resume_youtube_job
+
+def show_jobs() -> None:
+    """
+    Prints the unfinished jobs.
+
+    Returns:
+        None
+    """
+    jobs = get_jobs(unfinished=True)
+
+    if not jobs:
+        info(" => No unfinished jobs.")
+        return
+
+    table = PrettyTable()
+    table.field_names = ["ID", "Account", "Created", "State", "Next Stage", "Error"]
+
+    for job in jobs:
+        reason = (job.record["error"] or {}).get("reason", "")
+        table.add_row([
+            job.id,
+            job.record["account_id"],
+            colored(job.record["created"], "blue"),
+            job.record["state"],
+            colored(job.get_next_stage(), "cyan"),
+            colored(reason[:60], "red")
+        ])
+
+    print(table)
+
+def main():
+    parser = argparse.ArgumentParser(description="List and resume YouTube jobs, that didn't finish.")
+    parser.add_argument("jobs", nargs="*", help="IDs of the jobs to resume, lists the unfinished jobs if empty")
+    parser.add_argument("--all", action="store_true", help="Resume every failed job")
+    parser.add_argument("--promote", action="store_true", help="Render drafts again for publishing and upload them")
+    args = parser.parse_args()
+
+    # Running jobs may still be in progress in another process, only failed ones are safe to resume
+    job_ids = [job.id for job in get_jobs(unfinished=True) if job.record["state"] == "failed"] if args.all else args.jobs
+
+    if not job_ids:
+        show_jobs()
+        return
+
+    assert_folder_structure()
+    fetch_songs()
+
+    failed = [job_id for job_id in job_ids if not resume_youtube_job(job_id, args.promote)]
+
+    if failed:
+        error(f" => {len(failed)}/{len(job_ids)} jobs failed again: {', '.join(failed)}")
+        sys.exit(1)
+
+    success(f" => Resumed {len(job_ids)} jobs.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+# Runs the jobs of many YouTube and Twitter accounts concurrently, within the configured limits.
+import sys
+import argparse
+import threading
+
+from utils import *
+from status import *
+from config import *
+from jobs import run_job
+from typing import List
+from limits import get_limit_usage
+from termcolor import colored
+from prettytable import PrettyTable
+from concurrent.futures import ThreadPoolExecutor
+
+class Runner:
+    """
+    Fans the jobs of many accounts out over a thread pool.
+
+    The pool can be much larger than the machine could handle, the global
+    limits (`limits` in the config) decide how many renders, browsers,
+    LLM and image requests actually run at the same time.
+    """
+    def __init__(self, jobs: List[dict], workers: int) -> None:
+        """
+        Initializes the Runner.
+
+        Args:
+            jobs (List[dict]): The jobs (`purpose`, `account_id` and `count`)
+            workers (int): Maximum amount of jobs in progress
+
+        Returns:
+            None
+        """
+        self.jobs = jobs
+        self._workers = workers
+        self._lock = threading.Lock()
+        self._states = {idx: "queued" for idx in range(len(jobs))}
+        self._finished = threading.Event()
+
+    def _run(self, idx: int) -> None:
+        """
+        Runs a job in a worker.
+
+        Args:
+            idx (int): Index of the job
+
+        Returns:
+            None
+        """
+        job = self.jobs[idx]
+
+        with self._lock:
+            self._states[idx] = "running"
+
+        try:
+            ok = run_job(job["purpose"], job["account_id"], job.get("count", 1))
+        except (Exception, SystemExit) as e:
+            error(f" => {job['purpose']} job for {job['account_id']} failed: {str(e)}")
+            ok = False
+
+        with self._lock:
+            self._states[idx] = "done" if ok else "failed"
+
+    def get_summary(self) -> str:
+        """
+        Summarizes the jobs and the usage of the limits in one line.
+
+        Returns:
+            summary (str): The summary
+        """
+        with self._lock:
+            states = list(self._states.values())
+
+        summary = " | ".join(f"{state}: {states.count(state)}" for state in ["queued", "running", "done", "failed"])
+
+        for name, usage in get_limit_usage().items():
+            summary += f" | {name}: {usage['in_use']}/{usage['capacity']}"
+            if usage["waiting"]:
+                summary += f" ({usage['waiting']} waiting)"
+
+        return summary
+
+    def _report_progress(self, interval: float) -> None:
+        """
+        Prints the summary every `interval` seconds, until all jobs have finished.
+
+        Args:
+            interval (float): Seconds between two summaries
+
+        Returns:
+            None
+        """
+        while not self._finished.wait(interval):
+            info(f" => {self.get_summary()}", False)
+
+    def run(self, interval: float = 5) -> bool:
+        """
+        Runs all jobs and waits for them.
+
+        Args:
+            interval (float): Seconds between two progress summaries
+
+        Returns:
+            success (bool): True if every job succeeded
+        """
+        reporter = threading.Thread(target=self._report_progress, args=(interval,), daemon=True)
+        reporter.start()
+
+        with ThreadPoolExecutor(max_workers=self._workers) as executor:
+            list(executor.map(self._run, range(len(self.jobs))))
+
+        self._finished.set()
+        reporter.join()
+
+        table = PrettyTable()
+        table.field_names = ["Purpose", "Account", "State"]
+
+        for idx, job in enumerate(self.jobs):
+            state = self._states[idx]
+            table.add_row([job["purpose"], job["account_id"], colored(state, "green" if state == "done" else "red")])
+
+        print(table)
+        success(f" => {self.get_summary()}")
+
+        return all(state == "done" for state in self._states.values())
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the jobs of many accounts concurrently.")
+    parser.add_argument("--youtube", nargs="*", default=[], help="YouTube account UUIDs")
+    parser.add_argument("--twitter", nargs="*", default=[], help="Twitter account UUIDs")
+    parser.add_argument("--count", type=int, default=1, help="Posts per Twitter account")
+    parser.add_argument("--workers", type=int, default=32, help="Maximum amount of jobs in progress")
+    parser.add_argument("--interval", type=float, default=5, help="Seconds between two progress summaries")
+    args = parser.parse_args()
+
+    jobs = [{"purpose": "youtube", "account_id": account_id} for account_id in args.youtube]
+    jobs += [{"purpose": "twitter", "account_id": account_id, "count": args.count} for account_id in args.twitter]
+
+    if not jobs:
+        error("No accounts given. Pass --youtube and/or --twitter account UUIDs.")
+        sys.exit(1)
+
+    assert_folder_structure()
+
+    if args.youtube:
+        fetch_songs()
+
+    if not Runner(jobs, args.workers).run(args.interval):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
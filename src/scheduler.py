@@ -0,0 +1,133 @@
+# Runs the scheduled jobs of all accounts in one long-running process.
+import os
+import time
+import argparse
+import schedule
+import threading
+
+from cache import *
+from utils import *
+from status import *
+from config import *
+from jobs import run_job
+from concurrent.futures import ThreadPoolExecutor
+
+class Scheduler:
+    """
+    Runs the jobs from `.mp/schedule.json` in a worker pool, in this process.
+
+    TTS models and browser sessions stay loaded between jobs, instead of
+    starting a new Python process per job. Changes to the schedule file
+    (e.g. a CRON job set up in the menu) are picked up while running.
+    """
+    def __init__(self, workers: int) -> None:
+        """
+        Initializes the Scheduler.
+
+        Args:
+            workers (int): Amount of jobs, that may run at the same time
+
+        Returns:
+            None
+        """
+        self._scheduler = schedule.Scheduler()
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+        self._lock = threading.Lock()
+        self._running = set()
+        self._mtime = None
+
+    def reload(self) -> None:
+        """
+        Registers the scheduled jobs again, if the schedule file has changed.
+
+        Returns:
+            None
+        """
+        path = get_schedule_path()
+        mtime = os.path.getmtime(path) if os.path.exists(path) else None
+
+        if mtime == self._mtime:
+            return
+
+        self._mtime = mtime
+        self._scheduler.clear()
+
+        jobs = get_scheduled_jobs()
+        for job in jobs:
+            for at in job["times"]:
+                self._scheduler.every().day.at(at).do(self.submit, job)
+
+        info(f" => Loaded {len(jobs)} scheduled jobs.")
+
+    def submit(self, job: dict) -> None:
+        """
+        Hands a job to the worker pool, unless its previous run is still going.
+
+        Args:
+            job (dict): The scheduled job
+
+        Returns:
+            None
+        """
+        with self._lock:
+            if job["id"] in self._running:
+                warning(f" => {job['purpose']} job for {job['account_id']} is still running, skipping...")
+                return
+
+            self._running.add(job["id"])
+
+        self._executor.submit(self._run, job)
+
+    def _run(self, job: dict) -> None:
+        """
+        Runs a job in a worker.
+
+        Args:
+            job (dict): The scheduled job
+
+        Returns:
+            None
+        """
+        try:
+            info(f" => Running {job['purpose']} job for {job['account_id']}...")
+
+            if run_job(job["purpose"], job["account_id"], job.get("count", 1)):
+                success(f" => Finished {job['purpose']} job for {job['account_id']}.")
+            else:
+                error(f" => {job['purpose']} job for {job['account_id']} failed.")
+        except (Exception, SystemExit) as e:
+            # Keep the scheduler alive, whatever the job does
+            error(f" => {job['purpose']} job for {job['account_id']} failed: {str(e)}")
+        finally:
+            with self._lock:
+                self._running.discard(job["id"])
+
+    def run_forever(self) -> None:
+        """
+        Runs pending jobs until interrupted.
+
+        Returns:
+            None
+        """
+        try:
+            while True:
+                self.reload()
+                self._scheduler.run_pending()
+                time.sleep(1)
+        except KeyboardInterrupt:
+            info(" => Stopping scheduler, waiting for running jobs...")
+        finally:
+            self._executor.shutdown(wait=True)
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the scheduled jobs of all accounts.")
+    parser.add_argument("--workers", type=int, default=get_scheduler_workers(), help="Jobs, that may run at the same time")
+    args = parser.parse_args()
+
+    assert_folder_structure()
+    fetch_songs()
+
+    Scheduler(args.workers).run_forever()
+
+if __name__ == "__main__":
+    main()
@@ -53,8 +53,15 @@ def rem_temp_files() -> None:
     files = os.listdir(mp_dir)
 
     for file in files:
-        if not file.endswith(".json"):
-            os.remove(os.path.join(mp_dir, file))
+        path = os.path.join(mp_dir, file)
+
+        # Folders (e.g. pinned drivers) are not temporary
+        if os.path.isdir(path):
+            continue
+
+        # Keep the caches, queues and databases (e.g. rate limits)
+        if not file.endswith((".json", ".db", ".db-wal", ".db-shm")):
+            os.remove(path)
 
 def fetch_songs() -> None:
     """